@@ -0,0 +1,126 @@
+"""Agent definitions for the Agno Agents app.
+
+Used by `streamlit_agent.py` and by the agent service (`agno_shared.service`).
+Each builder imports its own tools, so yfinance, duckduckgo_search and
+youtube_transcript_api are only loaded once their agent is built.
+"""
+
+import os
+import sys
+
+from agno.agent import Agent
+
+# Shared helpers live in the repository root (agno_shared/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agno_shared.history import history_memory  # noqa: E402
+from agno_shared.storage import agent_storage  # noqa: E402
+from agno_shared.warmup import ollama_model  # noqa: E402
+
+# Configuration
+local_agent_storage_file: str = "tmp/local_agents.db"
+common_instructions = [
+    "If the user asks about you or your skills, tell them your name and role.",
+]
+
+# Display name of each agent, keyed by agent_id
+AGENT_NAMES = {
+    "web-agent": "Web Agent",
+    "finance-agent": "Finance Agent",
+    "youtube-agent": "YouTube Agent",
+}
+
+# Ollama model of each agent, keyed by agent_id
+AGENT_MODELS = {
+    "web-agent": "llama3.2",
+    "finance-agent": "llama3.2:3b",
+    "youtube-agent": "llama3.2:latest",
+}
+
+
+def build_web_agent():
+    from agno_shared.search_cache import CachedDuckDuckGoTools
+
+    model_name = AGENT_MODELS["web-agent"]
+    return Agent(
+        name="Web Agent",
+        role="Search the web for information",
+        agent_id="web-agent",
+        model=ollama_model(model_name),
+        tools=[CachedDuckDuckGoTools()],
+        instructions=["Always include sources."] + common_instructions,
+        storage=agent_storage("web_agent", local_agent_storage_file),
+        show_tool_calls=True,
+        memory=history_memory(model_name),
+        add_history_to_messages=True,
+        add_name_to_instructions=True,
+        add_datetime_to_instructions=True,
+        markdown=True,
+    )
+
+
+def build_finance_agent():
+    from agno_shared.finance_cache import BatchedFinanceTools
+
+    model_name = AGENT_MODELS["finance-agent"]
+    return Agent(
+        name="Finance Agent",
+        role="Get financial data",
+        agent_id="finance-agent",
+        model=ollama_model(model_name),
+        tools=[
+            BatchedFinanceTools(
+                stock_price=True,
+                analyst_recommendations=True,
+                company_info=True,
+                company_news=True,
+            )
+        ],
+        description="You are an investment analyst that researches stocks and helps users make informed decisions.",
+        instructions=[
+            "Always use tables to display data",
+            "Fetch data for several stocks with one tool call that lists all their symbols.",
+        ]
+        + common_instructions,
+        storage=agent_storage("finance_agent", local_agent_storage_file),
+        memory=history_memory(model_name),
+        add_history_to_messages=True,
+        add_name_to_instructions=True,
+        add_datetime_to_instructions=True,
+        markdown=True,
+    )
+
+
+def build_youtube_agent():
+    from agno_shared.youtube_cache import CachedYouTubeTools
+
+    model_name = AGENT_MODELS["youtube-agent"]
+    return Agent(
+        name="YouTube Agent",
+        role="Understand YouTube videos and answer questions",
+        agent_id="youtube-agent",
+        model=ollama_model(model_name),
+        tools=[CachedYouTubeTools()],
+        description="You are a YouTube agent that has the special skill of understanding YouTube videos and answering questions about them.",
+        instructions=[
+            "Using a video URL, get the video data using the `get_youtube_video_data` tool and captions using the `get_youtube_video_data` tool.",
+            "Using the data and captions, answer the user's question in an engaging and thoughtful manner. Focus on the most important details.",
+            "If you cannot find the answer in the video, say so and ask the user to provide more details.",
+            "Keep your answers concise and engaging.",
+        ]
+        + common_instructions,
+        memory=history_memory(model_name),
+        add_history_to_messages=True,
+        show_tool_calls=True,
+        add_name_to_instructions=True,
+        add_datetime_to_instructions=True,
+        storage=agent_storage("youtube_agent", local_agent_storage_file),
+        markdown=True,
+    )
+
+
+# Agent builders, keyed by agent_id
+AGENT_BUILDERS = {
+    "web-agent": build_web_agent,
+    "finance-agent": build_finance_agent,
+    "youtube-agent": build_youtube_agent,
+}
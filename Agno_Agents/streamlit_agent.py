@@ -3,164 +3,131 @@ Run `pip install ollama duckduckgo-search yfinance pypdf sqlalchemy streamlit yo
 """
 
 import os
+import sys
+from uuid import uuid4
+
 import streamlit as st
-from agno.agent import Agent
-from agno.models.ollama import Ollama
-from agno.storage.agent.sqlite import SqliteAgentStorage
-from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.tools.yfinance import YFinanceTools
-from agno.tools.youtube import YouTubeTools
 
-# Configuration
-local_agent_storage_file: str = "tmp/local_agents.db"
-common_instructions = [
-    "If the user asks about you or your skills, tell them your name and role.",
-]
+from agents import AGENT_BUILDERS, AGENT_MODELS, AGENT_NAMES, local_agent_storage_file
 
-# Create tmp directory if it doesn't exist
-os.makedirs("tmp", exist_ok=True)
+# Shared helpers live in the repository root (agno_shared/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agno_shared.agent_pool import SessionAgentPool  # noqa: E402
+from agno_shared.chat_history import ChatArchive, ChatHistory, render_chat_history  # noqa: E402
+from agno_shared.compaction import get_default_stats as get_compaction_stats  # noqa: E402
+from agno_shared.fast_path import get_default_latency, render_with_fast_path  # noqa: E402
+from agno_shared.service_client import AGENT_SERVICE_URL, RemoteAgent  # noqa: E402
+from agno_shared.streaming import render_performance_panel, traced_action  # noqa: E402
+from agno_shared.warmup import get_default_warmer, status_lines  # noqa: E402
 
 
-# Initialize agents
+# One lightweight copy of each agent per browser session. An agent is built,
+# and its tools imported, the first time any session asks it something.
 @st.cache_resource
-def initialize_agents():
-    web_agent = Agent(
-        name="Web Agent",
-        role="Search the web for information",
-        agent_id="web-agent",
-        model=Ollama(id="llama3.2"),
-        tools=[DuckDuckGoTools()],
-        instructions=["Always include sources."] + common_instructions,
-        storage=SqliteAgentStorage(
-            table_name="web_agent", db_file=local_agent_storage_file
-        ),
-        show_tool_calls=True,
-        add_history_to_messages=True,
-        num_history_responses=2,
-        add_name_to_instructions=True,
-        add_datetime_to_instructions=True,
-        markdown=True,
-    )
-
-    finance_agent = Agent(
-        name="Finance Agent",
-        role="Get financial data",
-        agent_id="finance-agent",
-        model=Ollama(id="llama3.2:3b"),
-        tools=[
-            YFinanceTools(
-                stock_price=True,
-                analyst_recommendations=True,
-                company_info=True,
-                company_news=True,
-            )
-        ],
-        description="You are an investment analyst that researches stocks and helps users make informed decisions.",
-        instructions=["Always use tables to display data"] + common_instructions,
-        storage=SqliteAgentStorage(
-            table_name="finance_agent", db_file=local_agent_storage_file
-        ),
-        add_history_to_messages=True,
-        num_history_responses=5,
-        add_name_to_instructions=True,
-        add_datetime_to_instructions=True,
-        markdown=True,
-    )
-
-    youtube_agent = Agent(
-        name="YouTube Agent",
-        role="Understand YouTube videos and answer questions",
-        agent_id="youtube-agent",
-        model=Ollama(id="llama3.2:latest"),
-        tools=[YouTubeTools()],
-        description="You are a YouTube agent that has the special skill of understanding YouTube videos and answering questions about them.",
-        instructions=[
-            "Using a video URL, get the video data using the `get_youtube_video_data` tool and captions using the `get_youtube_video_data` tool.",
-            "Using the data and captions, answer the user's question in an engaging and thoughtful manner. Focus on the most important details.",
-            "If you cannot find the answer in the video, say so and ask the user to provide more details.",
-            "Keep your answers concise and engaging.",
-        ]
-        + common_instructions,
-        add_history_to_messages=True,
-        num_history_responses=5,
-        show_tool_calls=True,
-        add_name_to_instructions=True,
-        add_datetime_to_instructions=True,
-        storage=SqliteAgentStorage(
-            table_name="youtube_agent", db_file=local_agent_storage_file
-        ),
-        markdown=True,
-    )
+def get_agent_pool():
+    # Create tmp directory if it doesn't exist
+    os.makedirs("tmp", exist_ok=True)
+    return SessionAgentPool(dict(AGENT_BUILDERS))
+
 
+# Connect to the agent service instead (thin client mode)
+@st.cache_resource
+def connect_agents():
     return {
-        "Web Agent": web_agent,
-        "Finance Agent": finance_agent,
-        "YouTube Agent": youtube_agent,
+        name: RemoteAgent.connect(AGENT_SERVICE_URL, agent_id)
+        for agent_id, name in AGENT_NAMES.items()
     }
 
 
+# Older turns of long conversations are moved out of session state into the
+# agents' storage file
+@st.cache_resource
+def get_chat_archive():
+    os.makedirs("tmp", exist_ok=True)
+    return ChatArchive(local_agent_storage_file)
+
+
+def get_session_agent(name):
+    """This session's copy of the agent called `name`."""
+    if AGENT_SERVICE_URL:
+        # The agent service keeps each Streamlit session in its own agent session
+        return connect_agents()[name].for_session(st.session_state.session_id)
+    # Sessions share the model client and tools, but not history or run state
+    agent_ids = {agent_name: agent_id for agent_id, agent_name in AGENT_NAMES.items()}
+    return get_agent_pool().get(agent_ids[name], st.session_state.session_id)
+
+
 # App title
 st.title("AI Agent Assistant")
 st.write("Ask questions to specialized AI agents")
 
 # Initialize session state for conversation history
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = ChatHistory(get_chat_archive())
 
 if "selected_agent" not in st.session_state:
     st.session_state.selected_agent = "Web Agent"
 
-# Initialize agents
-agents = initialize_agents()
+if "session_id" not in st.session_state:
+    st.session_state.session_id = str(uuid4())
+
+if not AGENT_SERVICE_URL:
+    # Load the models in the background so the first question doesn't wait for it
+    get_default_warmer().warm(sorted(set(AGENT_MODELS.values())))
 
 # Agent selection
+agent_names = list(AGENT_NAMES.values())
 selected_agent = st.sidebar.selectbox(
     "Select an agent:",
-    options=list(agents.keys()),
-    index=list(agents.keys()).index(st.session_state.selected_agent),
+    options=agent_names,
+    index=agent_names.index(st.session_state.selected_agent),
+)
+
+stream_responses = st.sidebar.checkbox(
+    "Stream responses",
+    value=True,
+    help="Show the answer token by token, along with tool calls as they happen",
+)
+
+fast_path = st.sidebar.checkbox(
+    "Call tools directly",
+    value=True,
+    help="When the tool is obvious (a YouTube URL, ticker symbols, a web search), call it "
+    "directly and ask the model once to write the answer",
 )
 
 if selected_agent != st.session_state.selected_agent:
-    st.session_state.messages = []
+    st.session_state.messages.clear()
     st.session_state.selected_agent = selected_agent
     st.rerun()
 
-# Display conversation history
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
+# Display conversation history: the last messages, earlier ones on request
+render_chat_history(st.session_state.messages, key="chat")
 
 # Chat input
 if prompt := st.chat_input("Ask your question..."):
     # Add user message to history
-    st.session_state.messages.append({"role": "user", "content": prompt})
+    st.session_state.messages.append("user", prompt)
 
     # Display user message
     with st.chat_message("user"):
         st.markdown(prompt)
 
     # Get response from selected agent
-    with st.chat_message("assistant"):
-        with st.spinner(f"{selected_agent} is thinking..."):
-            current_agent = agents[selected_agent]
-
-            # Use run method instead of chat
-            response = current_agent.run(prompt)
+    with st.chat_message("assistant"), traced_action("chat", agent=selected_agent):
+        current_agent = get_session_agent(selected_agent)
 
-            # Extract content based on response type
-            if hasattr(response, "content"):
-                response_content = response.content
-            else:
-                # If response is a string
-                response_content = str(response)
+        # Use run method instead of chat
+        response_content = render_with_fast_path(
+            current_agent,
+            prompt,
+            enabled=fast_path,
+            stream=stream_responses,
+            spinner_text=f"{selected_agent} is thinking...",
+        )
 
-            # Display response
-            st.markdown(response_content)
-
-            # Add assistant response to history
-            st.session_state.messages.append(
-                {"role": "assistant", "content": response_content}
-            )
+        # Add assistant response to history
+        st.session_state.messages.append("assistant", response_content)
 
 # Add information about the agents
 st.sidebar.markdown("### Agent Information")
@@ -176,3 +143,23 @@ st.sidebar.markdown("1. Select an agent from the dropdown")
 st.sidebar.markdown("2. Type your question in the chat box")
 st.sidebar.markdown("3. Wait for the agent to respond")
 st.sidebar.markdown("4. Continue the conversation or switch agents")
+
+if not AGENT_SERVICE_URL:
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 🔥 Models")
+    st.sidebar.markdown("  \n".join(status_lines(get_default_warmer())))
+
+latency_lines = get_default_latency().lines()
+if latency_lines:
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### ⏱️ Latency by path")
+    st.sidebar.markdown("  \n".join(latency_lines))
+
+compaction_lines = get_compaction_stats().lines()
+if compaction_lines:
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### ✂️ Tool output compaction")
+    st.sidebar.markdown("  \n".join(compaction_lines))
+
+with st.sidebar:
+    render_performance_panel()
@@ -0,0 +1,77 @@
+"""Agent definitions for the AI Health & Fitness Planner.
+
+Used by `fitness_coach.py` and by the agent service (`agno_shared.service`).
+Each builder imports its own tools, so they are loaded with the first agent
+that uses them.
+"""
+
+import os
+import sys
+
+from agno.agent import Agent
+
+# Shared helpers live in the repository root (agno_shared/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agno_shared.warmup import ollama_model  # noqa: E402
+
+DEFAULT_MODEL: str = "llama3.2:3b"
+
+
+# Smart agent with all tools
+def build_smart_agent(model_name):
+    from agno_shared.search_cache import CachedDuckDuckGoTools
+    from agno_shared.youtube_cache import CachedYouTubeTools
+
+    return Agent(
+        name="Smart Fitness Assistant",
+        role="Comprehensive health and fitness expert",
+        agent_id="smart-fitness-assistant",
+        model=ollama_model(model_name),
+        tools=[
+            CachedDuckDuckGoTools(search=True, news=True),
+            CachedYouTubeTools(),
+        ],
+        instructions=[
+            "You are a comprehensive health and fitness expert specializing in nutrition, exercise, and wellness optimization.",
+            "Always provide evidence-based recommendations and include sources when possible.",
+            "Intermittent fasting (12-16 hours) should be incorporated into dietary recommendations when appropriate.",
+            "Use the DuckDuckGo search tool for any fitness or nutrition information you need to verify.",
+            "Use the YouTube tool to find and recommend relevant fitness videos when appropriate.",
+            "Present information in a clear, structured format with tables when helpful.",
+            "Only respond to questions related to fitness, nutrition, and health. Politely decline other topics.",
+            "Always consider the user's specific profile and goals in your recommendations.",
+        ],
+        show_tool_calls=True,
+        markdown=True,
+    )
+
+
+# Dedicated YouTube analysis agent
+def build_youtube_agent(model_name):
+    from agno_shared.youtube_cache import CachedYouTubeTools
+
+    return Agent(
+        name="YouTube Fitness Analyst",
+        role="Analyze YouTube videos and answer questions about them",
+        agent_id="youtube-fitness-analyst",
+        model=ollama_model(model_name),
+        tools=[CachedYouTubeTools()],
+        instructions=[
+            "You are specialized in analyzing fitness and workout YouTube videos.",
+            "Using a video URL, get the video data and captions using the YouTube tools.",
+            "Extract key information such as workout techniques, nutritional advice, and training tips.",
+            "Provide timestamp references when discussing specific parts of videos.",
+            "Focus on practical, actionable takeaways from fitness videos.",
+            "If you cannot find the answer in the video, say so clearly.",
+            "Keep your answers concise, informative, and engaging.",
+        ],
+        show_tool_calls=True,
+        markdown=True,
+    )
+
+
+# Agent builders, keyed by agent_id. Each takes the selected model name.
+AGENT_BUILDERS = {
+    "smart-fitness-assistant": build_smart_agent,
+    "youtube-fitness-analyst": build_youtube_agent,
+}
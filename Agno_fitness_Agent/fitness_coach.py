@@ -1,9 +1,58 @@
+import functools
+import html
 import os
+import sys
+from uuid import uuid4
+
 import streamlit as st
-from agno.agent import Agent
-from agno.models.ollama import Ollama
-from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.tools.youtube import YouTubeTools
+
+from agents import AGENT_BUILDERS
+
+# Shared helpers live in the repository root (agno_shared/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agno_shared.agent_pool import SessionAgentPool  # noqa: E402
+from agno_shared.chat_history import (  # noqa: E402
+    ChatArchive,
+    ChatHistory,
+    latest_start,
+    render_chat_history,
+)
+from agno_shared.compaction import get_default_stats as get_compaction_stats  # noqa: E402
+from agno_shared.concurrency import (  # noqa: E402
+    DEFAULT_MAX_CONCURRENCY,
+    iter_parallel,
+)
+from agno_shared.fast_path import (  # noqa: E402
+    get_default_latency,
+    plan_tool_calls,
+    run_with_fast_path,
+)
+from agno_shared.jobs import FAILED, JobQueue, report_progress  # noqa: E402
+from agno_shared.plan_index import PlanIndex  # noqa: E402
+from agno_shared.research import render_research  # noqa: E402
+from agno_shared.response_cache import ResponseCache, cached_run  # noqa: E402
+from agno_shared.routing import SMALL_MODEL, ModelRouter  # noqa: E402
+from agno_shared.service_client import AGENT_SERVICE_URL, RemoteAgent  # noqa: E402
+from agno_shared.streaming import (  # noqa: E402
+    render_agent_response,
+    render_performance_panel,
+    traced_action,
+)
+from agno_shared.video_batch import (  # noqa: E402
+    MAX_BATCH_VIDEOS,
+    analyze_batch,
+    batch_report,
+    expand_playlists,
+    parse_video_urls,
+)
+from agno_shared.video_discovery import discover_videos  # noqa: E402
+from agno_shared.video_mapreduce import (  # noqa: E402
+    analyze_long_video,
+    format_notes,
+    needs_map_reduce,
+    video_transcript,
+)
+from agno_shared.warmup import get_default_warmer, status_lines  # noqa: E402
 
 # Create tmp directory if it doesn't exist
 os.makedirs("tmp", exist_ok=True)
@@ -73,55 +122,54 @@ st.markdown(
 )
 
 
-# Initialize smart agent with all tools and a dedicated YouTube agent
+# One lightweight copy of each agent per browser session. The smart agent and
+# the dedicated YouTube agent are each built the first time a session uses them.
 @st.cache_resource
-def initialize_agents(model_name):
-    smart_agent = Agent(
-        name="Smart Fitness Assistant",
-        role="Comprehensive health and fitness expert",
-        model=Ollama(id=model_name),
-        tools=[
-            DuckDuckGoTools(search=True, news=True),
-            YouTubeTools(),
-        ],
-        instructions=[
-            "You are a comprehensive health and fitness expert specializing in nutrition, exercise, and wellness optimization.",
-            "Always provide evidence-based recommendations and include sources when possible.",
-            "Intermittent fasting (12-16 hours) should be incorporated into dietary recommendations when appropriate.",
-            "Use the DuckDuckGo search tool for any fitness or nutrition information you need to verify.",
-            "Use the YouTube tool to find and recommend relevant fitness videos when appropriate.",
-            "Present information in a clear, structured format with tables when helpful.",
-            "Only respond to questions related to fitness, nutrition, and health. Politely decline other topics.",
-            "Always consider the user's specific profile and goals in your recommendations.",
-        ],
-        show_tool_calls=True,
-        markdown=True,
+def get_agent_pool(model_name):
+    return SessionAgentPool(
+        {
+            agent_id: functools.partial(build, model_name)
+            for agent_id, build in AGENT_BUILDERS.items()
+        }
     )
 
-    # Dedicated YouTube analysis agent
-    youtube_agent = Agent(
-        name="YouTube Fitness Analyst",
-        role="Analyze YouTube videos and answer questions about them",
-        model=Ollama(
-            id="llama3.2:3b"
-            if "llama" not in model_name and "qwen" not in model_name
-            else model_name
-        ),
-        tools=[YouTubeTools()],
-        instructions=[
-            "You are specialized in analyzing fitness and workout YouTube videos.",
-            "Using a video URL, get the video data and captions using the YouTube tools.",
-            "Extract key information such as workout techniques, nutritional advice, and training tips.",
-            "Provide timestamp references when discussing specific parts of videos.",
-            "Focus on practical, actionable takeaways from fitness videos.",
-            "If you cannot find the answer in the video, say so clearly.",
-            "Keep your answers concise, informative, and engaging.",
-        ],
-        show_tool_calls=True,
-        markdown=True,
+
+@st.cache_resource
+def connect_agents(model_name):
+    return tuple(
+        RemoteAgent.connect(AGENT_SERVICE_URL, agent_id, model=model_name)
+        for agent_id in AGENT_BUILDERS
     )
 
-    return smart_agent, youtube_agent
+
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache()
+
+
+# Older turns of long chats are moved out of session state into SQLite
+@st.cache_resource
+def get_chat_archive():
+    return ChatArchive()
+
+
+def get_session_agent(agent_id, model_name, session_id=None):
+    """This session's copy of `agent_id` running on `model_name`.
+
+    Background jobs pass the `session_id` they run for explicitly.
+    """
+    session_id = session_id or st.session_state.session_id
+    if AGENT_SERVICE_URL:
+        # Thin client: the agent service runs the agents for this session
+        remote_agents = dict(zip(AGENT_BUILDERS, connect_agents(model_name)))
+        return remote_agents[agent_id].for_session(session_id)
+    # Sessions share the model client and tools, but not memory or run state
+    return get_agent_pool(model_name).get(agent_id, session_id)
+
+
+def get_smart_agent(router, tab, step):
+    """This session's smart assistant, on the model `router` picks for the step."""
+    return get_session_agent("smart-fitness-assistant", router.model_for(tab, step))
 
 
 def display_dietary_plan(plan_content):
@@ -185,6 +233,428 @@ def display_fitness_plan(plan_content):
                     """,
                         unsafe_allow_html=True,
                     )
+            elif "video_resources" not in plan_content:
+                # The videos are added to the plan after the routine
+                st.caption("🎥 Finding videos for your routine...")
+
+
+def display_plans(plans):
+    """Whichever of the dietary and fitness plans are ready, with their warnings."""
+    for warning in plans.get("warnings", []):
+        st.warning(warning)
+    if plans.get("dietary_plan"):
+        display_dietary_plan(plans["dietary_plan"])
+    if plans.get("fitness_plan"):
+        display_fitness_plan(plans["fitness_plan"])
+
+
+def fetch_video_recommendations(
+    agent, fitness_goals, age, sex, cache=None, bypass_cache=False
+):
+    """Up to 3 YouTube videos (title, url, description, duration) for the user's goals.
+
+    Uses a video search first and asks `agent` (once) only if that finds
+    nothing. Safe to call from a worker thread.
+    """
+    search_term = (
+        f"best {fitness_goals.lower()} workout for {age} year old {sex.lower()}"
+    )
+    records = discover_videos(
+        search_term, agent, max_results=3, cache=cache, bypass_cache=bypass_cache
+    )
+    return [record.model_dump() for record in records]
+
+
+def fallback_video_resources(fitness_goals):
+    """General YouTube search links used when video discovery fails."""
+    return [
+        {
+            "title": f"{fitness_goals} Fundamentals",
+            "url": f"https://www.youtube.com/results?search_query={fitness_goals.replace(' ', '+')}+workout",
+            "description": "Basic training principles and demonstrations",
+        },
+        {
+            "title": "Form and Technique Guide",
+            "url": f"https://www.youtube.com/results?search_query=proper+form+{fitness_goals.replace(' ', '+')}",
+            "description": "Proper exercise form to prevent injury and maximize results",
+        },
+    ]
+
+
+def plan_prompts(profile):
+    """The dietary and fitness plan prompts for a profile from the Plan Generator form."""
+    fasting_enabled = profile["fasting_enabled"]
+    fasting_hours = profile["fasting_hours"]
+    fasting_start = profile["fasting_start"]
+    # The prompt text, indentation and whitespace-only lines included, is kept exactly
+    # as the model saw it before the plan calls moved out of main()
+    user_profile = f"""
+                    Age: {profile["age"]}
+                    Weight: {profile["weight"]}kg
+                    Height: {profile["height"]}cm
+                    Sex: {profile["sex"]}
+                    Activity Level: {profile["activity_level"]}
+                    Dietary Preferences: {profile["dietary_preferences"]}
+                    Fitness Goals: {profile["fitness_goals"]}
+                    Health Considerations: {", ".join(profile["health_conditions"])}
+                    Intermittent Fasting: {"Yes" if fasting_enabled else "No"}
+                    Fasting Hours: {fasting_hours if fasting_enabled else "N/A"}
+                    Fasting Start: {fasting_start if fasting_enabled else "N/A"}
+                    """
+
+    # Generate dietary plan using smart agent
+    dietary_prompt = f"""
+                    Create a comprehensive personalized dietary plan based on this user profile:
+                    {user_profile}
+                    
+                    Return a detailed meal plan that includes specific foods, portions, and timing.
+                    Include breakfast, lunch, dinner, and snacks.
+                    
+                    {"Incorporate intermittent fasting with a " + str(fasting_hours) + "-hour fasting window starting " + fasting_start + "." if fasting_enabled else "Do not include intermittent fasting in the plan."}
+                    
+                    Explain why this plan works well for the user's specific goals and profile.
+                    """
+
+    # Generate fitness plan using smart agent
+    fitness_prompt = f"""
+                    Create a comprehensive personalized fitness plan based on this user profile:
+                    {user_profile}
+                    
+                    Include:
+                    1. A weekly exercise schedule with specific workouts
+                    2. Detailed descriptions of key exercises
+                    3. Progression plan for 4-8 weeks
+                    4. Rest and recovery recommendations
+                    
+                    Suggest YouTube videos that would be helpful for demonstrating proper form or specific routines.
+                    Use the YouTube tool to find 2-3 relevant videos related to the user's specific fitness goals.
+                    """
+    return dietary_prompt, fitness_prompt
+
+
+def run_plan_job(params, session_id):
+    """Background job: both plans and the video picks for one profile.
+
+    Returns the `dietary_plan` and `fitness_plan` dicts for the session
+    (None for a plan whose call failed), plus any warnings to show with them.
+    """
+    profile = params["profile"]
+    fitness_goals = profile["fitness_goals"]
+    response_cache = get_response_cache()
+    agents = {
+        step: get_session_agent("smart-fitness-assistant", model_name, session_id)
+        for step, model_name in params["models"].items()
+    }
+    dietary_prompt, fitness_prompt = plan_prompts(profile)
+
+    # The dietary, fitness and video calls don't depend on each
+    # other, so run them side by side on private agent copies
+    plan_tasks = {
+        "dietary": lambda: cached_run(
+            agents["dietary"],
+            dietary_prompt,
+            response_cache,
+            bypass=params["bypass_cache"],
+            isolated=True,
+        ),
+        "fitness": lambda: cached_run(
+            agents["fitness"],
+            fitness_prompt,
+            response_cache,
+            bypass=params["bypass_cache"],
+            isolated=True,
+        ),
+        "videos": lambda: fetch_video_recommendations(
+            agents["videos"],
+            fitness_goals,
+            profile["age"],
+            profile["sex"],
+            cache=response_cache,
+            bypass_cache=params["bypass_cache"],
+        ),
+    }
+    # Each plan is published as soon as its call returns; the videos go into the
+    # fitness plan last. A failed step leaves the other plans in place.
+    plans = {"dietary_plan": None, "fitness_plan": None, "warnings": []}
+    video_resources = []
+    for name, future in iter_parallel(plan_tasks, params["max_parallel_calls"]):
+        try:
+            result = future.result()
+        except Exception as e:
+            if name != "videos":
+                plans["warnings"].append(f"The {name} plan could not be generated: {e}")
+            continue
+        if name == "dietary":
+            plans["dietary_plan"] = format_dietary_plan(profile, result.content)
+        elif name == "fitness":
+            plans["fitness_plan"] = format_fitness_plan(profile, result.content)
+        else:
+            video_resources = result
+            continue
+        report_progress(plans)
+
+    if plans["dietary_plan"] is None and plans["fitness_plan"] is None:
+        raise RuntimeError(" ".join(plans["warnings"]))
+    if plans["fitness_plan"] is not None:
+        if not video_resources:
+            plans["warnings"].append(
+                "Could not fetch specific videos. Using general recommendations instead."
+            )
+            video_resources = fallback_video_resources(fitness_goals)
+        plans["fitness_plan"]["video_resources"] = video_resources
+    return plans
+
+
+def format_dietary_plan(profile, meal_plan):
+    return {
+        "why_this_plan_works": "Personalized nutrition tailored to your goals, preferences, and lifestyle",
+        "meal_plan": meal_plan,
+        "fasting_schedule": f"{profile['fasting_hours']}-hour fasting window starting {profile['fasting_start']}"
+        if profile["fasting_enabled"]
+        else "No intermittent fasting included",
+        "important_considerations": """
+                        - Hydration: Drink plenty of water throughout the day, especially during fasting periods
+                        - Electrolytes: Monitor sodium, potassium, and magnesium levels
+                        - Fiber: Ensure adequate intake through vegetables and fruits
+                        - Listen to your body: Adjust portion sizes and fasting schedule as needed
+                        - Consistency: Follow the plan regularly to see results
+                        """,
+    }
+
+
+def format_fitness_plan(profile, routine):
+    """The fitness plan without `video_resources`, which are added once found."""
+    return {
+        "goals": f"Achieve {profile['fitness_goals']} while considering your {profile['activity_level']} lifestyle",
+        "routine": routine,
+        "tips": """
+                        - Track your progress regularly with measurements and photos
+                        - Allow proper rest between workouts to optimize recovery
+                        - Focus on proper form rather than lifting heavier weights
+                        - Stay consistent with your routine - consistency beats perfection
+                        - Adapt your workout intensity based on how you feel
+                        """,
+    }
+
+
+def video_analysis_prompt(video_url, analysis_options, specific_question, fast_path):
+    return f"""
+    Analyze this YouTube video: {video_url}
+
+    Focus on these aspects:
+    {", ".join(analysis_options)}
+
+    {"Also answer this specific question: " + specific_question if specific_question else ""}
+
+    {"" if fast_path else "First, get the video data and captions using the YouTube tools."}
+    Provide a structured analysis with timestamps when possible.
+    Include practical takeaways that someone could apply to their own fitness routine.
+    """
+
+
+def analyze_video(youtube_agent, url, params, on_progress=None):
+    """The analysis of the video at `url` with the options and question in `params`.
+
+    Long videos are analysed part by part in parallel and the notes merged
+    (`agno_shared.video_mapreduce`), calling `on_progress(notes, total)`.
+    """
+    lines, title = video_transcript(youtube_agent, url)
+    if lines and needs_map_reduce(lines):
+        content = analyze_long_video(
+            youtube_agent,
+            lines,
+            url,
+            params["options"] or ["Summary of key points"],
+            params["question"],
+            title,
+            on_progress=on_progress,
+        )
+    else:
+        content = run_with_fast_path(
+            youtube_agent,
+            video_analysis_prompt(url, params["options"], params["question"], params["fast_path"]),
+            calls=plan_tool_calls(youtube_agent, url),
+            enabled=params["fast_path"],
+        )
+    if not content:
+        raise ValueError("The model returned an empty analysis")
+    return content
+
+
+def run_video_analysis_job(params, session_id):
+    """Background job: analyse one video. Returns an entry for `video_analyses`.
+
+    The notes so far on a long video are the partial result.
+    """
+    youtube_agent = get_session_agent("youtube-fitness-analyst", params["model"], session_id)
+    entry = {"url": params["url"], "options": params["options"]}
+
+    def publish(notes, total):
+        report_progress({**entry, "content": format_notes(notes), "progress": f"{len(notes)} of {total} parts"})
+
+    return {**entry, "content": analyze_video(youtube_agent, params["url"], params, on_progress=publish)}
+
+
+def run_video_batch_job(params, session_id):
+    """Background job: analyse a list of videos on a worker pool.
+
+    Returns the batch (`agno_shared.video_batch.analyze_batch()` plus the
+    options, question and any playlist errors); the videos done so far are
+    the partial result.
+    """
+    youtube_agent = get_session_agent("youtube-fitness-analyst", params["model"], session_id)
+    urls, errors = expand_playlists(params["urls"], params["playlists"])
+    if not urls:
+        raise ValueError("; ".join(errors) or "No videos to analyze")
+    header = {"options": params["options"], "question": params["question"], "errors": errors}
+
+    def publish(videos, total):
+        report_progress({**header, "videos": videos, "total": total})
+
+    batch = analyze_batch(urls, lambda url: analyze_video(youtube_agent, url, params), on_result=publish)
+    return {**header, **batch}
+
+
+def analysis_summary(analysis):
+    """Markdown download of one video analysis."""
+    return f"""
+    # Video Analysis Summary
+
+    **Video URL:** {analysis["url"]}
+    **Analysis Focus:** {", ".join(analysis["options"])}
+
+    {analysis["content"]}
+
+    *Analysis generated by AI Health & Fitness Planner*
+    """
+
+
+def display_batch_videos(videos):
+    """One collapsed expander per video of a batch; failures show their error."""
+    for i, video in enumerate(videos, 1):
+        icon = "✅" if "content" in video else "⚠️"
+        with st.expander(f"{icon} Video {i}: {video['url']}"):
+            if "content" in video:
+                st.markdown(video["content"])
+            else:
+                st.error(video["error"])
+
+
+@st.cache_resource
+def get_job_queue():
+    queue = JobQueue()
+    queue.register("plan", run_plan_job)
+    queue.register("video_analysis", run_video_analysis_job)
+    queue.register("video_batch", run_video_batch_job)
+    # Jobs still running when the app last stopped start again; their
+    # sessions pick them up through the `job` query parameter
+    queue.resume()
+    return queue
+
+
+# How often a page with running background jobs checks on them
+JOB_POLL_SECONDS = 1
+JOB_LABELS = {
+    "plan": "Generating your plan",
+    "video_analysis": "Analyzing video",
+    "video_batch": "Analyzing videos",
+}
+# Previous Analyses shows this many of the latest analyses, earlier ones on request
+ANALYSES_PAGE_SIZE = 5
+
+
+def submit_job(kind, params, key_params=None):
+    """Queue a background job for this session and remember it in the URL."""
+    job = get_job_queue().submit(kind, params, st.session_state.session_id, key_params)
+    st.session_state.job_errors.pop(kind, None)
+    if job.id not in st.session_state.pending_jobs:
+        st.session_state.pending_jobs.append(job.id)
+    # Reloading the page keeps polling the same jobs
+    st.query_params["job"] = st.session_state.pending_jobs
+    return job
+
+
+def session_jobs(job_ids, session_id):
+    """The ids among `job_ids` of jobs submitted by `session_id`; a URL may name anyone's job."""
+    queue = get_job_queue()
+    jobs = [queue.get(job_id) for job_id in job_ids]
+    return [job.id for job in jobs if job is not None and job.session_id == session_id]
+
+
+def apply_job_result(job):
+    """Move a finished job's result into the session state.
+
+    A failed job still hands over whatever partial result it published.
+    """
+    if job.trace_id:
+        # The Performance panel shows the job's trace
+        st.session_state.last_trace_id = job.trace_id
+    result = job.result
+    if job.status == FAILED:
+        st.session_state.job_errors[job.kind] = job.error
+        result = job.partial
+    if result is None:
+        return
+    if job.kind == "plan":
+        dietary_plan = result["dietary_plan"] or {}
+        fitness_plan = result["fitness_plan"] or {}
+        st.session_state.dietary_plan = dietary_plan
+        st.session_state.fitness_plan = fitness_plan
+        st.session_state.plan_warnings = result["warnings"]
+        st.session_state.plans_generated = bool(dietary_plan or fitness_plan)
+        st.session_state.qa_pairs = []
+        # Split the plans into sections once, so questions only send the relevant ones
+        st.session_state.plan_index = PlanIndex.from_plans(
+            {
+                "Dietary Plan": dietary_plan.get("meal_plan", ""),
+                "Fitness Plan": fitness_plan.get("routine", ""),
+            }
+        )
+    elif job.kind == "video_analysis":
+        st.session_state.video_analyses.append(result)
+    elif job.kind == "video_batch":
+        st.session_state.video_batch = result
+        st.session_state.video_analyses += [
+            {"url": video["url"], "options": result["options"], "content": video["content"]}
+            for video in result["videos"]
+            if "content" in video
+        ]
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def show_jobs(kind):
+    """Progress of this session's `kind` jobs; reruns the app once one finishes."""
+    queue = get_job_queue()
+    finished = False
+    for job_id in list(st.session_state.pending_jobs):
+        job = queue.get(job_id)
+        if job is not None and job.kind != kind:
+            continue
+        if job is None or job.finished:
+            if job is not None:
+                apply_job_result(job)
+            st.session_state.pending_jobs.remove(job_id)
+            finished = True
+        else:
+            st.info(
+                f"⏳ {JOB_LABELS[kind]}... ({job.status}, {job.elapsed:.0f}s). "
+                "You can keep using the app meanwhile."
+            )
+            if kind == "plan" and job.partial:
+                # The plans that are ready so far
+                display_plans(job.partial)
+            elif kind == "video_analysis" and job.partial:
+                st.caption(f"🎞️ Analyzed {job.partial['progress']} of the video")
+                with st.expander("Notes so far"):
+                    st.markdown(job.partial["content"])
+            elif kind == "video_batch" and job.partial:
+                # Each video as soon as it is done
+                videos = job.partial["videos"]
+                st.progress(len(videos) / job.partial["total"], f"{len(videos)} of {job.partial['total']} videos")
+                display_batch_videos(videos)
+    if finished:
+        st.query_params["job"] = st.session_state.pending_jobs
+        st.rerun()
 
 
 def main():
@@ -192,10 +662,18 @@ def main():
         st.session_state.dietary_plan = {}
         st.session_state.fitness_plan = {}
         st.session_state.qa_pairs = []
+        st.session_state.plan_index = None
         st.session_state.plans_generated = False
-        st.session_state.chat_history = []
+        st.session_state.chat_history = ChatHistory(get_chat_archive())
         st.session_state.active_tab = "Plan Generator"
         st.session_state.video_analyses = []
+        st.session_state.video_batch = None
+        # The session and its background jobs are kept in the URL across page reloads
+        st.session_state.session_id = st.query_params.get("session") or str(uuid4())
+        st.query_params["session"] = st.session_state.session_id
+        st.session_state.pending_jobs = session_jobs(st.query_params.get_all("job"), st.session_state.session_id)
+        st.session_state.job_errors = {}
+        st.session_state.plan_warnings = []
 
     st.title("🏋️‍♂️ AI Health & Fitness Planner")
     st.markdown(
@@ -266,6 +744,47 @@ def main():
             return
 
         st.success(f"Using Ollama model: {selected_model}")
+        # Load state of the models, filled in once the warm-up has been started
+        model_status_placeholder = st.empty()
+
+        max_parallel_calls = st.number_input(
+            "Max parallel model calls",
+            min_value=1,
+            max_value=DEFAULT_MAX_CONCURRENCY,
+            value=DEFAULT_MAX_CONCURRENCY,
+            help="How many of your plan's agent calls may run at once. The app as a whole never runs "
+            "more than AGENT_MAX_CONCURRENCY; this can only lower it for your requests.",
+        )
+
+        stream_responses = st.checkbox(
+            "Stream responses",
+            value=True,
+            help="Show answers token by token, along with tool calls as they happen",
+        )
+
+        route_models = st.checkbox(
+            f"Use {SMALL_MODEL} for quick tasks",
+            value=True,
+            help="Send short, structured requests such as video lookups to a small fast model, and keep the selected model for plans, chat and analysis",
+        )
+
+        fast_path = st.checkbox(
+            "Call tools directly",
+            value=True,
+            help="Fetch captions and search results without asking the model which tool to use, then ask it once to write the answer",
+        )
+        # Request latency per agent and path, filled in at the end of the run
+        latency_placeholder = st.empty()
+        # Tokens saved by compacting tool results, filled in at the end of the run
+        compaction_placeholder = st.empty()
+
+        # Response cache for the templated prompts (plans, research, videos)
+        st.header("⚡ Response Cache")
+        bypass_cache = st.checkbox(
+            "Bypass response cache",
+            help="Always ask the model, even if the same request was answered before",
+        )
+        cache_stats_placeholder = st.empty()
 
         # Intermittent fasting preferences
         st.header("⏱️ Fasting Preferences")
@@ -288,10 +807,15 @@ def main():
             fasting_hours = 0
             fasting_start = "None"
 
-    # Initialize the smart agent
+    response_cache = get_response_cache()
+
+    # Initialize the agents. Each step runs on the model the router picks for it.
     if selected_model:
         try:
-            smart_agent, youtube_agent = initialize_agents(selected_model)
+            router = ModelRouter(selected_model, enabled=route_models)
+            if not AGENT_SERVICE_URL:
+                # Load the models in the background so the first request doesn't wait for it
+                get_default_warmer().warm(sorted(router.models()))
         except Exception as e:
             st.error(f"❌ Error initializing Ollama model: {e}")
             st.info(
@@ -372,204 +896,55 @@ def main():
             )
 
         if st.button("🎯 Generate My Personalized Plan", use_container_width=True):
-            with st.spinner(
-                f"Creating your perfect health and fitness routine using {selected_model}..."
-            ):
-                try:
-                    # Construct user profile
-                    user_profile = f"""
-                    Age: {age}
-                    Weight: {weight}kg
-                    Height: {height}cm
-                    Sex: {sex}
-                    Activity Level: {activity_level}
-                    Dietary Preferences: {dietary_preferences}
-                    Fitness Goals: {fitness_goals}
-                    Health Considerations: {", ".join(health_conditions)}
-                    Intermittent Fasting: {"Yes" if fasting_enabled else "No"}
-                    Fasting Hours: {fasting_hours if fasting_enabled else "N/A"}
-                    Fasting Start: {fasting_start if fasting_enabled else "N/A"}
-                    """
-
-                    # Generate dietary plan using smart agent
-                    dietary_prompt = f"""
-                    Create a comprehensive personalized dietary plan based on this user profile:
-                    {user_profile}
-                    
-                    Return a detailed meal plan that includes specific foods, portions, and timing.
-                    Include breakfast, lunch, dinner, and snacks.
-                    
-                    {"Incorporate intermittent fasting with a " + str(fasting_hours) + "-hour fasting window starting " + fasting_start + "." if fasting_enabled else "Do not include intermittent fasting in the plan."}
-                    
-                    Explain why this plan works well for the user's specific goals and profile.
-                    """
-
-                    dietary_plan_response = smart_agent.run(dietary_prompt)
-
-                    # Generate fitness plan using smart agent
-                    fitness_prompt = f"""
-                    Create a comprehensive personalized fitness plan based on this user profile:
-                    {user_profile}
-                    
-                    Include:
-                    1. A weekly exercise schedule with specific workouts
-                    2. Detailed descriptions of key exercises
-                    3. Progression plan for 4-8 weeks
-                    4. Rest and recovery recommendations
-                    
-                    Suggest YouTube videos that would be helpful for demonstrating proper form or specific routines.
-                    Use the YouTube tool to find 2-3 relevant videos related to the user's specific fitness goals.
-                    """
-
-                    fitness_plan_response = smart_agent.run(fitness_prompt)
-
-                    # Format dietary plan
-                    dietary_plan = {
-                        "why_this_plan_works": "Personalized nutrition tailored to your goals, preferences, and lifestyle",
-                        "meal_plan": dietary_plan_response.content,
-                        "fasting_schedule": f"{fasting_hours}-hour fasting window starting {fasting_start}"
-                        if fasting_enabled
-                        else "No intermittent fasting included",
-                        "important_considerations": """
-                        - Hydration: Drink plenty of water throughout the day, especially during fasting periods
-                        - Electrolytes: Monitor sodium, potassium, and magnesium levels
-                        - Fiber: Ensure adequate intake through vegetables and fruits
-                        - Listen to your body: Adjust portion sizes and fasting schedule as needed
-                        - Consistency: Follow the plan regularly to see results
-                        """,
-                    }
-
-                    # Get video resources using YouTube tool
-                    try:
-                        # Parse the response to extract video recommendations
-                        # This is a more robust approach to extract real video links and data
-                        try:
-                            # First try to find videos directly related to the user's fitness goals
-                            search_term = f"best {fitness_goals.lower()} workout for {age} year old {sex.lower()}"
-                            video_tool_response = smart_agent.run(
-                                f"Use the YouTube tool to find 3 high-quality instructional videos about: {search_term}. Return just the video data in a clear format with titles, URLs and brief descriptions."
-                            )
-
-                            # Backup search if the first one doesn't yield good results
-                            if "youtube.com" not in video_tool_response.content:
-                                backup_search = (
-                                    f"fitness training {fitness_goals.lower()} tutorial"
-                                )
-                                video_tool_response = smart_agent.run(
-                                    f"Use the YouTube tool to search for '{backup_search}' and return 3 video recommendations with their URLs and descriptions."
-                                )
-
-                            # Extract URLs from the response
-                            import re
-
-                            urls = re.findall(
-                                r"https?://(?:www\.)?youtube\.com/watch\?v=[a-zA-Z0-9_-]+",
-                                video_tool_response.content,
-                            )
-                            titles = re.findall(
-                                r"\*\*(.*?)\*\*|Title: (.*?)[\n\r]",
-                                video_tool_response.content,
-                            )
-
-                            # Create video resources
-                            video_resources = []
-                            for i, url in enumerate(urls[:3]):  # Limit to 3 videos
-                                title = ""
-                                if i < len(titles):
-                                    # Extract title from either group 1 or group 2 of the regex match
-                                    title_match = titles[i]
-                                    title = (
-                                        title_match[0]
-                                        if title_match[0]
-                                        else title_match[1]
-                                        if len(title_match) > 1
-                                        else f"Fitness Video {i + 1}"
-                                    )
-
-                                # Extract description near the URL
-                                description_search = video_tool_response.content[
-                                    max(
-                                        0, video_tool_response.content.find(url) - 100
-                                    ) : min(
-                                        len(video_tool_response.content),
-                                        video_tool_response.content.find(url) + 200,
-                                    )
-                                ]
-                                description_match = re.search(
-                                    r"Description: (.*?)[\n\r]|description: (.*?)[\n\r]",
-                                    description_search,
-                                )
-                                description = (
-                                    description_match.group(1)
-                                    if description_match
-                                    else f"Instructional video for your {fitness_goals.lower()} program"
-                                )
-
-                                video_resources.append(
-                                    {
-                                        "title": title,
-                                        "url": url,
-                                        "description": description,
-                                    }
-                                )
-
-                            # If we couldn't extract enough videos, add some defaults
-                            while len(video_resources) < 2:
-                                video_resources.append(
-                                    {
-                                        "title": f"{fitness_goals} Training Guide",
-                                        "url": f"https://www.youtube.com/results?search_query={fitness_goals.replace(' ', '+')}+training",
-                                        "description": f"Search results for {fitness_goals} training programs",
-                                    }
-                                )
-
-                        except Exception as video_err:
-                            st.warning(
-                                f"Could not fetch specific videos. Using general recommendations instead."
-                            )
-                            # Fallback video resources
-                            video_resources = [
-                                {
-                                    "title": f"{fitness_goals} Fundamentals",
-                                    "url": f"https://www.youtube.com/results?search_query={fitness_goals.replace(' ', '+')}+workout",
-                                    "description": "Basic training principles and demonstrations",
-                                },
-                                {
-                                    "title": "Form and Technique Guide",
-                                    "url": f"https://www.youtube.com/results?search_query=proper+form+{fitness_goals.replace(' ', '+')}",
-                                    "description": "Proper exercise form to prevent injury and maximize results",
-                                },
-                            ]
-                    except:
-                        video_resources = []
-
-                    # Format fitness plan
-                    fitness_plan = {
-                        "goals": f"Achieve {fitness_goals} while considering your {activity_level} lifestyle",
-                        "routine": fitness_plan_response.content,
-                        "video_resources": video_resources,
-                        "tips": """
-                        - Track your progress regularly with measurements and photos
-                        - Allow proper rest between workouts to optimize recovery
-                        - Focus on proper form rather than lifting heavier weights
-                        - Stay consistent with your routine - consistency beats perfection
-                        - Adapt your workout intensity based on how you feel
-                        """,
-                    }
+            profile = {
+                "age": age,
+                "weight": weight,
+                "height": height,
+                "sex": sex,
+                "activity_level": activity_level,
+                "dietary_preferences": dietary_preferences,
+                "fitness_goals": fitness_goals,
+                "health_conditions": health_conditions,
+                "fasting_enabled": fasting_enabled,
+                "fasting_hours": fasting_hours,
+                "fasting_start": fasting_start,
+            }
+            # The plans are generated in the background, so other widgets stay usable
+            # meanwhile. They replace the current ones section by section.
+            st.session_state.plans_generated = False
+            submit_job(
+                "plan",
+                {
+                    "profile": profile,
+                    "models": {
+                        step: router.model_for("plan", step)
+                        for step in ("dietary", "fitness", "videos")
+                    },
+                    "bypass_cache": bypass_cache,
+                    "max_parallel_calls": max_parallel_calls,
+                },
+                # Resubmitting a profile joins its running job, whatever the sidebar settings
+                key_params=profile,
+            )
 
-                    st.session_state.dietary_plan = dietary_plan
-                    st.session_state.fitness_plan = fitness_plan
-                    st.session_state.plans_generated = True
-                    st.session_state.qa_pairs = []
+        if st.session_state.pending_jobs:
+            show_jobs("plan")
 
-                    display_dietary_plan(dietary_plan)
-                    display_fitness_plan(fitness_plan)
+        plan_error = st.session_state.job_errors.get("plan")
+        if plan_error:
+            st.error(f"❌ An error occurred: {plan_error}")
+            st.info(
+                "If the model is taking too long to respond, try a different model or check if Ollama is running properly."
+            )
 
-                except Exception as e:
-                    st.error(f"❌ An error occurred: {e}")
-                    st.info(
-                        "If the model is taking too long to respond, try a different model or check if Ollama is running properly."
-                    )
+        if st.session_state.plans_generated:
+            display_plans(
+                {
+                    "dietary_plan": st.session_state.dietary_plan,
+                    "fitness_plan": st.session_state.fitness_plan,
+                    "warnings": st.session_state.plan_warnings,
+                }
+            )
 
         if st.session_state.plans_generated:
             st.header("❓ Questions about your plan?")
@@ -579,26 +954,37 @@ def main():
 
             if st.button("Get Answer", key="plan_answer_btn"):
                 if question_input:
-                    with st.spinner("Finding the best answer for you..."):
-                        dietary_plan = st.session_state.dietary_plan
-                        fitness_plan = st.session_state.fitness_plan
+                    with traced_action("plan question"):
+                        plan_index = st.session_state.get("plan_index")
+                        if plan_index is None:
+                            plan_index = st.session_state.plan_index = PlanIndex.from_plans(
+                                {
+                                    "Dietary Plan": st.session_state.dietary_plan.get("meal_plan", ""),
+                                    "Fitness Plan": st.session_state.fitness_plan.get("routine", ""),
+                                }
+                            )
 
-                        context = f"Dietary Plan: {dietary_plan.get('meal_plan', '')}\n\nFitness Plan: {fitness_plan.get('routine', '')}"
-                        full_context = f"{context}\nUser Question: {question_input}"
+                        context = plan_index.context(question_input)
+                        full_context = f"Relevant sections of the user's plans:\n\n{context}\n\nUser Question: {question_input}"
 
+                        # The streamed answer is replaced by the Q&A history below
+                        answer_placeholder = st.empty()
                         try:
-                            run_response = smart_agent.run(full_context)
+                            with answer_placeholder.container():
+                                answer = render_agent_response(
+                                    get_smart_agent(router, "plan_qa", "answer"),
+                                    full_context,
+                                    stream=stream_responses,
+                                    spinner_text="Finding the best answer for you...",
+                                )
 
-                            if hasattr(run_response, "content"):
-                                answer = run_response.content
-                            else:
+                            if not answer:
                                 answer = "Sorry, I couldn't generate a response at this time."
 
                             st.session_state.qa_pairs.append((question_input, answer))
                         except Exception as e:
-                            st.error(
-                                f"❌ An error occurred while getting the answer: {e}"
-                            )
+                            st.error(f"❌ An error occurred while getting the answer: {e}")
+                    answer_placeholder.empty()
 
             if st.session_state.qa_pairs:
                 st.header("💬 Q&A History")
@@ -613,10 +999,8 @@ def main():
             "Ask any questions about health, fitness, nutrition, or workout routines."
         )
 
-        # Display chat history
-        for message in st.session_state.chat_history:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
+        # Display chat history: the last messages, earlier ones on request
+        render_chat_history(st.session_state.chat_history, key="fitness_chat_history")
 
         # Chat input
         chat_input = st.chat_input(
@@ -629,29 +1013,21 @@ def main():
                 st.markdown(chat_input)
 
             # Add to history
-            st.session_state.chat_history.append(
-                {"role": "user", "content": chat_input}
-            )
+            st.session_state.chat_history.append("user", chat_input)
 
             # Get AI response
-            with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    try:
-                        response = smart_agent.run(chat_input)
-
-                        if hasattr(response, "content"):
-                            response_content = response.content
-                        else:
-                            response_content = str(response)
-
-                        st.markdown(response_content)
+            with st.chat_message("assistant"), traced_action("chat"):
+                try:
+                    response_content = render_agent_response(
+                        get_smart_agent(router, "chat", "answer"),
+                        chat_input,
+                        stream=stream_responses,
+                    )
 
-                        # Add to history
-                        st.session_state.chat_history.append(
-                            {"role": "assistant", "content": response_content}
-                        )
-                    except Exception as e:
-                        st.error(f"Error: {e}")
+                    # Add to history
+                    st.session_state.chat_history.append("assistant", response_content)
+                except Exception as e:
+                    st.error(f"Error: {e}")
 
     # TAB 3: Fitness Research
     with tabs[2]:
@@ -665,15 +1041,19 @@ def main():
 
         if st.button("Search", key="search_btn"):
             if search_query:
-                with st.spinner("Searching for information..."):
+                with traced_action("research"):
                     try:
                         search_prompt = f"Research the following fitness or nutrition topic and provide a detailed, evidence-based response with citations: {search_query}"
-                        search_response = smart_agent.run(search_prompt)
-
-                        if hasattr(search_response, "content"):
-                            st.markdown(search_response.content)
-                        else:
-                            st.markdown(str(search_response))
+                        render_research(
+                            get_smart_agent(router, "research", "answer"),
+                            search_query,
+                            search_prompt,
+                            enabled=fast_path,
+                            stream=stream_responses,
+                            spinner_text="Searching for information...",
+                            cache=response_cache,
+                            bypass_cache=bypass_cache,
+                        )
                     except Exception as e:
                         st.error(f"Error during research: {e}")
 
@@ -714,84 +1094,52 @@ def main():
 
         if st.button("Find Videos", key="video_btn"):
             if video_topic:
-                with st.spinner("Searching for fitness videos..."):
+                with st.spinner("Searching for fitness videos..."), traced_action(
+                    "video resources"
+                ):
                     try:
-                        # More specific prompt that ensures we get actual YouTube URLs
-                        video_prompt = f"""
-                        Use the YouTube tool to search for videos about {video_topic} fitness that are:
-                        - Difficulty: {video_difficulty}
-                        - Duration: {video_duration}
-                        - Equipment required: {", ".join(video_equipment)}
-                        
-                        Please find and list 3-5 specific videos with the following information:
-                        1. Exact video title with YouTube URL
-                        2. Brief description of content (1-2 sentences)
-                        3. Why this video is beneficial for the user
-                        
-                        Ensure you include the full YouTube URL for each video (format: https://www.youtube.com/watch?v=xyz). 
-                        Use the YouTubeTools to get accurate video information.
-                        """
-
-                        video_response = smart_agent.run(video_prompt)
-
-                        if hasattr(video_response, "content"):
-                            content = video_response.content
-
-                            # Check if we actually got videos
-                            if "youtube.com/watch" not in content:
-                                # Try a second attempt with a simplified query
-                                retry_prompt = f"Use the YouTube tool to search for '{video_topic} {video_difficulty} fitness' and return 3 specific videos with their exact YouTube URLs and brief descriptions."
-                                retry_response = smart_agent.run(retry_prompt)
-                                if hasattr(retry_response, "content"):
-                                    content = retry_response.content
-
-                            # Display results in a more visual way
-                            st.markdown("### Found Videos")
-
-                            # Extract and display videos in cards
-                            import re
-
-                            urls = re.findall(
-                                r"https?://(?:www\.)?youtube\.com/watch\?v=[a-zA-Z0-9_-]+",
-                                content,
-                            )
+                        equipment = " ".join(video_equipment)
+                        videos = discover_videos(
+                            f"{video_topic} {video_difficulty} fitness {equipment}",
+                            get_smart_agent(router, "video_resources", "search"),
+                            max_results=5,
+                            duration=video_duration.split()[0].lower(),
+                            cache=response_cache,
+                            bypass_cache=bypass_cache,
+                        )
 
-                            if urls:
-                                for i, url in enumerate(urls):
-                                    # Find nearby text (title and description)
-                                    start_idx = max(0, content.find(url) - 200)
-                                    end_idx = min(len(content), content.find(url) + 300)
-                                    video_section = content[start_idx:end_idx]
-
-                                    # Extract title (best effort)
-                                    title_match = re.search(
-                                        r"\*\*(.*?)\*\*|\[(.*?)\]|Title: (.*?)[\n\r]",
-                                        video_section,
-                                    )
-                                    title = "Fitness Video"
-                                    if title_match:
-                                        for group in title_match.groups():
-                                            if group:
-                                                title = group
-                                                break
-
-                                    # Display video card
-                                    st.markdown(
-                                        f"""
-                                    <div style="margin-bottom: 20px; padding: 15px; border-radius: 8px; border: 1px solid #ddd; background-color: #f9f9f9;">
-                                        <h4>{i + 1}. {title}</h4>
-                                        <a href="{url}" target="_blank">{url}</a>
-                                        <p style="margin-top: 10px;">{video_section}</p>
-                                    </div>
-                                    """,
-                                        unsafe_allow_html=True,
-                                    )
-                            else:
+                        st.markdown("### Found Videos")
+                        if videos:
+                            for i, video in enumerate(videos):
+                                duration = (
+                                    f" <small>({html.escape(video.duration)})</small>"
+                                    if video.duration
+                                    else ""
+                                )
+                                # Display video card
                                 st.markdown(
-                                    content
-                                )  # Fallback to original content if no videos found
+                                    f"""
+                                <div style="margin-bottom: 20px; padding: 15px; border-radius: 8px; border: 1px solid #ddd; background-color: #f9f9f9;">
+                                    <h4>{i + 1}. {html.escape(video.title)}{duration}</h4>
+                                    <a href="{html.escape(video.url)}" target="_blank">{html.escape(video.url)}</a>
+                                    <p style="margin-top: 10px;">{html.escape(video.description)}</p>
+                                </div>
+                                """,
+                                    unsafe_allow_html=True,
+                                )
                         else:
-                            st.markdown(str(video_response))
+                            search_term = f"{video_topic} {video_difficulty} fitness"
+                            search_url = f"https://www.youtube.com/results?search_query={search_term.replace(' ', '+')}"
+                            st.markdown(
+                                f"""
+                            <div style="padding: 15px; border-radius: 8px; border: 1px solid #ffcc00; background-color: #fffaee;">
+                                <h4>⚠️ Could not retrieve specific videos</h4>
+                                <p>Please use this link to view search results on YouTube:</p>
+                                <a href="{search_url}" target="_blank">{search_term} - YouTube Search</a>
+                            </div>
+                            """,
+                                unsafe_allow_html=True,
+                            )
                     except Exception as e:
                         st.error(f"Error finding videos: {e}")
                         st.info("Trying alternative approach...")
@@ -819,12 +1167,22 @@ def main():
         summaries, and key points from the video content.
         """)
 
-        # Video URL input
-        video_url = st.text_input(
-            "Enter a YouTube video URL",
-            key="video_analysis_url",
-            placeholder="https://www.youtube.com/watch?v=...",
+        # Video URL input, or a list of videos in batch mode
+        batch_mode = st.toggle(
+            "Batch mode: analyze a playlist or a list of videos", key="video_batch_mode"
         )
+        if batch_mode:
+            batch_text = st.text_area(
+                f"Paste YouTube video or playlist URLs (up to {MAX_BATCH_VIDEOS} videos)",
+                key="video_batch_urls",
+                placeholder="https://www.youtube.com/watch?v=...\nhttps://www.youtube.com/playlist?list=...",
+            )
+        else:
+            video_url = st.text_input(
+                "Enter a YouTube video URL",
+                key="video_analysis_url",
+                placeholder="https://www.youtube.com/watch?v=...",
+            )
 
         # Analysis options
         analysis_options = st.multiselect(
@@ -848,99 +1206,77 @@ def main():
             placeholder="E.g., What does the instructor say about proper form for squats?",
         )
 
+        # Batch analysis button
+        if batch_mode and st.button("Analyze Videos", key="analyze_batch_btn"):
+            batch_urls, playlists = parse_video_urls(batch_text)
+            if batch_urls or playlists:
+                # The videos are analyzed in the background and added to Previous Analyses
+                submit_job(
+                    "video_batch",
+                    {
+                        "urls": batch_urls[:MAX_BATCH_VIDEOS],
+                        "playlists": playlists,
+                        "options": analysis_options,
+                        "question": specific_question,
+                        "fast_path": fast_path,
+                        "model": router.model_for("video_analysis", "analysis"),
+                    },
+                )
+            else:
+                st.error("Please paste at least one YouTube video or playlist URL")
+
         # Analysis button
-        if st.button("Analyze Video", key="analyze_video_btn"):
+        if not batch_mode and st.button("Analyze Video", key="analyze_video_btn"):
             if video_url and "youtube.com" in video_url:
-                with st.spinner(
-                    "Analyzing video content... This may take a few moments."
-                ):
-                    try:
-                        # Format the analysis request
-                        analysis_prompt = f"""
-                        Analyze this YouTube video: {video_url}
-                        
-                        Focus on these aspects:
-                        {", ".join(analysis_options)}
-                        
-                        {"Also answer this specific question: " + specific_question if specific_question else ""}
-                        
-                        First, get the video data and captions using the YouTube tools.
-                        Then provide a structured analysis with timestamps when possible.
-                        Include practical takeaways that someone could apply to their own fitness routine.
-                        """
-
-                        # Run the analysis
-                        analysis_response = youtube_agent.run(analysis_prompt)
-
-                        # Display results
-                        if hasattr(analysis_response, "content"):
-                            # Display the video preview
-                            video_id = None
-                            if "v=" in video_url:
-                                video_id = video_url.split("v=")[1].split("&")[0]
-                            elif "youtu.be/" in video_url:
-                                video_id = video_url.split("youtu.be/")[1].split("?")[0]
-
-                            if video_id:
-                                st.markdown(
-                                    f"""
-                                <div style="display: flex; justify-content: center; margin-bottom: 20px;">
-                                    <iframe width="560" height="315" 
-                                    src="https://www.youtube.com/embed/{video_id}" 
-                                    frameborder="0" allow="accelerometer; autoplay; clipboard-write; 
-                                    encrypted-media; gyroscope; picture-in-picture" allowfullscreen>
-                                    </iframe>
-                                </div>
-                                """,
-                                    unsafe_allow_html=True,
-                                )
+                # Display the video preview
+                video_id = None
+                if "v=" in video_url:
+                    video_id = video_url.split("v=")[1].split("&")[0]
+                elif "youtu.be/" in video_url:
+                    video_id = video_url.split("youtu.be/")[1].split("?")[0]
+
+                if video_id:
+                    st.markdown(
+                        f"""
+                    <div style="display: flex; justify-content: center; margin-bottom: 20px;">
+                        <iframe width="560" height="315" 
+                        src="https://www.youtube.com/embed/{video_id}" 
+                        frameborder="0" allow="accelerometer; autoplay; clipboard-write; 
+                        encrypted-media; gyroscope; picture-in-picture" allowfullscreen>
+                        </iframe>
+                    </div>
+                    """,
+                        unsafe_allow_html=True,
+                    )
 
-                            # Analysis results
-                            st.markdown("## Analysis Results")
-                            st.markdown(analysis_response.content)
-
-                            # Provide downloadable summary
-                            summary_text = f"""
-                            # Video Analysis Summary
-                            
-                            **Video URL:** {video_url}
-                            **Analysis Focus:** {", ".join(analysis_options)}
-                            
-                            {analysis_response.content}
-                            
-                            *Analysis generated by AI Health & Fitness Planner*
-                            """
-
-                            st.download_button(
-                                label="Download Analysis",
-                                data=summary_text,
-                                file_name="video_analysis_summary.md",
-                                mime="text/markdown",
-                            )
+                # The analysis runs in the background and is added to Previous Analyses
+                submit_job(
+                    "video_analysis",
+                    {
+                        "url": video_url,
+                        "options": analysis_options,
+                        "question": specific_question,
+                        "fast_path": fast_path,
+                        "model": router.model_for("video_analysis", "analysis"),
+                    },
+                )
+            else:
+                st.error("Please enter a valid YouTube URL")
 
-                            # Add to analysis history
-                            if "video_analyses" not in st.session_state:
-                                st.session_state.video_analyses = []
+        if st.session_state.pending_jobs:
+            show_jobs("video_analysis")
+            show_jobs("video_batch")
 
-                            st.session_state.video_analyses.append(
-                                {
-                                    "url": video_url,
-                                    "content": analysis_response.content,
-                                    "options": analysis_options,
-                                }
-                            )
+        batch_error = st.session_state.job_errors.get("video_batch")
+        if batch_error:
+            st.error(f"Error analyzing videos: {batch_error}")
 
-                        else:
-                            st.error(
-                                "Could not generate analysis. Please try a different video or check the URL."
-                            )
-                    except Exception as e:
-                        st.error(f"Error analyzing video: {e}")
-                        st.info(
-                            "Please make sure you've entered a valid YouTube URL and that you're using a model like llama3.2 or qwen that supports YouTube tools."
-                        )
-            else:
-                st.error("Please enter a valid YouTube URL")
+        analysis_error = st.session_state.job_errors.get("video_analysis")
+        if analysis_error:
+            st.error(f"Error analyzing video: {analysis_error}")
+            st.info(
+                "Please make sure you've entered a valid YouTube URL and that you're using a model like llama3.2 or qwen that supports YouTube tools."
+            )
 
         # Tips and examples
         with st.expander("Tips for video analysis"):
@@ -960,13 +1296,47 @@ def main():
             - Training programs: https://www.youtube.com/watch?v=ixkQaZXVQjs (HIIT workout)
             """)
 
+        # Latest batch, as one report
+        batch = st.session_state.get("video_batch")
+        if batch:
+            st.markdown("### Latest Batch")
+            done = sum("content" in video for video in batch["videos"])
+            speed = f", {batch['videos_per_minute']:.1f} videos/min" if batch.get("seconds") else ""
+            st.caption(f"{done} of {len(batch['videos'])} videos analyzed{speed}")
+            for error in batch["errors"]:
+                st.warning(error)
+            display_batch_videos(batch["videos"])
+            st.download_button(
+                label="Download Batch Report",
+                data=batch_report(batch),
+                file_name="video_batch_report.md",
+                mime="text/markdown",
+                key="download_batch_report",
+            )
+
         # Previous analyses
         if "video_analyses" in st.session_state and st.session_state.video_analyses:
             st.markdown("### Previous Analyses")
-            for i, analysis in enumerate(st.session_state.video_analyses):
-                with st.expander(f"Analysis {i + 1}: {analysis['url'][:50]}..."):
+            latest = len(st.session_state.video_analyses) - 1
+            first = latest_start(
+                latest + 1, ANALYSES_PAGE_SIZE, key="analyses", label="analyses"
+            )
+            for i in range(first, latest + 1):
+                analysis = st.session_state.video_analyses[i]
+                with st.expander(
+                    f"Analysis {i + 1}: {analysis['url'][:50]}...", expanded=i == latest
+                ):
                     st.markdown(analysis["content"])
 
+                    # Provide downloadable summary
+                    st.download_button(
+                        label="Download Analysis",
+                        data=analysis_summary(analysis),
+                        file_name="video_analysis_summary.md",
+                        mime="text/markdown",
+                        key=f"download_analysis_{i}",
+                    )
+
                     # Option to remove this analysis
                     if st.button(
                         f"Remove Analysis {i + 1}", key=f"remove_analysis_{i}"
@@ -974,6 +1344,22 @@ def main():
                         st.session_state.video_analyses.pop(i)
                         st.rerun()
 
+    if not AGENT_SERVICE_URL:
+        model_status_placeholder.markdown("  \n".join(status_lines(get_default_warmer())))
+    latency_placeholder.markdown("  \n".join(get_default_latency().lines()))
+    compaction_lines = get_compaction_stats().lines()
+    if compaction_lines:
+        compaction_placeholder.markdown("✂️ **Tool output compaction**  \n" + "  \n".join(compaction_lines))
+    with st.sidebar:
+        render_performance_panel()
+
+    # Cache counters are filled in last so they include this run's requests
+    cache_stats = response_cache.stats()
+    cache_stats_placeholder.markdown(
+        f"**Hits:** {cache_stats['hits']} &nbsp; **Misses:** {cache_stats['misses']} &nbsp; "
+        f"**Entries:** {cache_stats['entries']}"
+    )
+
 
 if __name__ == "__main__":
     main()
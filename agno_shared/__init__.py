@@ -0,0 +1,5 @@
+"""Helpers shared by the Agno Streamlit apps in this repository.
+
+Both `Agno_Agents/streamlit_agent.py` and `Agno_fitness_Agent/fitness_coach.py`
+add the repository root to `sys.path` so they can import from this package.
+"""
@@ -0,0 +1,110 @@
+"""Per-session Agent instances that share their heavy parts.
+
+A Streamlit process serves many sessions, but an `Agent` carries per-run
+state (session_id, memory, run_response, model tool state), so one instance
+must not be shared between sessions. `SessionAgentPool` keeps one lightweight
+clone per (agent_id, session), made with `Agent.deep_copy()`. A clone has
+its own session_id, memory, run state, tools and model settings, and shares
+the template's HTTP client, caches and storage engine.
+The pool is bounded, and clones idle for longer than `idle_ttl` seconds are
+evicted. Their history stays in storage and is reloaded when the session
+comes back.
+
+A template can also be given as a function that builds it. It is then
+built on the first `get()` for its agent_id, so the tools of agents that
+are never used are never imported.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple, Union
+
+from agno.agent import Agent
+
+DEFAULT_MAX_SIZE: int = int(os.getenv("AGENT_POOL_MAX_SIZE", "256"))
+DEFAULT_IDLE_TTL: int = int(os.getenv("AGENT_POOL_IDLE_TTL", str(30 * 60)))
+
+
+def bind_session(agent: Agent, session_id: str) -> Agent:
+    """Point `agent` at `session_id`, dropping state from earlier runs."""
+    agent.session_id = session_id
+    agent.agent_session = None
+    agent.session_name = None
+    agent.run_id = None
+    agent.run_response = None
+    agent.stream = None
+    agent.stream_intermediate_steps = False
+    if agent.memory is not None:
+        agent.memory.clear()
+    return agent
+
+
+def clone_for_session(template: Agent, session_id: str) -> Agent:
+    """A copy of `template` for one session.
+
+    Everything the run mutates is copied. The model client, the caches
+    behind the tools and the storage engine are shared (see
+    `CappedOllama.__deepcopy__` and `agno_shared.shared.SharedOnCopy`).
+    Not thread-safe for the same template; `SessionAgentPool` serializes it.
+    """
+    # Create the shared parts once on the template, so clones running in
+    # parallel neither build their own client nor race to create the table
+    if template.model is not None and hasattr(template.model, "get_client"):
+        template.model.get_client()
+    if template.storage is not None:
+        template.storage.create()
+
+    return bind_session(template.deep_copy(update={"session_id": session_id}), session_id)
+
+
+class SessionAgentPool:
+    def __init__(
+        self,
+        templates: Dict[str, Union[Agent, Callable[[], Agent]]],
+        max_size: int = DEFAULT_MAX_SIZE,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+    ):
+        self.templates = templates
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.created = 0
+        self.evicted = 0
+        self._agents: "OrderedDict[Tuple[str, str], Tuple[float, Agent]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, agent_id: str, session_id: str) -> Agent:
+        """The agent for `agent_id` bound to `session_id`, created on first use."""
+        key = (agent_id, session_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._agents.pop(key, None)
+            if entry is None:
+                agent = clone_for_session(self._template(agent_id), session_id)
+                self.created += 1
+            else:
+                agent = entry[1]
+            self._agents[key] = (now, agent)
+            self._evict(now)
+        return agent
+
+    def _template(self, agent_id: str) -> Agent:
+        template = self.templates[agent_id]
+        if not isinstance(template, Agent):
+            # Build lazily, once
+            template = self.templates[agent_id] = template()
+        return template
+
+    def _evict(self, now: float) -> None:
+        # Entries are kept in least-recently-used order
+        while self._agents:
+            key, (last_used, _) = next(iter(self._agents.items()))
+            if len(self._agents) <= self.max_size and now - last_used <= self.idle_ttl:
+                break
+            del self._agents[key]
+            self.evicted += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"active": len(self._agents), "created": self.created, "evicted": self.evicted}
@@ -0,0 +1,201 @@
+"""Bounded chat history and constant-cost chat rendering for Streamlit.
+
+Both apps kept every message of a conversation in session state and drew
+each one with `st.chat_message` on every rerun, so reruns got slower as a
+conversation grew. `ChatHistory` keeps only the last `max_in_memory`
+messages in the session and moves older ones to a SQLite table; the Agno
+app keeps that table in its agents' storage file.
+
+`render_chat_history()` draws the last `page_size` messages as chat
+bubbles. Earlier messages sit behind a "Show earlier messages" button, one
+page per click. Each earlier page is rendered once into a single markdown
+block and reused on later reruns; the last `CHAT_HISTORY_MAX_BLOCKS` blocks
+used are kept. A rerun therefore draws a fixed number of elements, however
+long the conversation is.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from typing import Iterator, List, Tuple
+from uuid import uuid4
+
+import streamlit as st
+
+DEFAULT_ARCHIVE_FILE: str = "tmp/chat_history.db"
+DEFAULT_MAX_IN_MEMORY: int = int(os.getenv("CHAT_HISTORY_MAX_IN_MEMORY", "40"))
+DEFAULT_PAGE_SIZE: int = int(os.getenv("CHAT_HISTORY_PAGE_SIZE", "10"))
+DEFAULT_MAX_BLOCKS: int = int(os.getenv("CHAT_HISTORY_MAX_BLOCKS", "20"))
+
+ROLE_LABELS = {"user": "You", "assistant": "Assistant"}
+
+
+class ChatArchive:
+    """Messages moved out of session state, by conversation and position."""
+
+    def __init__(self, db_file: str = DEFAULT_ARCHIVE_FILE):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chat_messages (
+                    conversation_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (conversation_id, position)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits (or rolls back) and is closed on exit."""
+        with closing(sqlite3.connect(self.db_file, timeout=30)) as conn, conn:
+            yield conn
+
+    def append(self, conversation_id: str, first_position: int, messages: List[dict]) -> None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO chat_messages VALUES (?, ?, ?, ?, ?)",
+                [
+                    (conversation_id, first_position + i, m["role"], m["content"], now)
+                    for i, m in enumerate(messages)
+                ],
+            )
+
+    def read(self, conversation_id: str, start: int, end: int) -> List[dict]:
+        """Messages at positions `start` to `end` (exclusive)."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT role, content FROM chat_messages "
+                "WHERE conversation_id = ? AND position >= ? AND position < ? ORDER BY position",
+                (conversation_id, start, end),
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def delete(self, conversation_id: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM chat_messages WHERE conversation_id = ?", (conversation_id,))
+
+
+class ChatHistory:
+    """One conversation: recent messages in memory, older ones in a `ChatArchive`."""
+
+    def __init__(
+        self,
+        archive: ChatArchive,
+        max_in_memory: int = DEFAULT_MAX_IN_MEMORY,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_blocks: int = DEFAULT_MAX_BLOCKS,
+    ):
+        self.archive = archive
+        self.max_in_memory = max(max_in_memory, page_size)
+        self.page_size = page_size
+        self.max_blocks = max_blocks
+        self.conversation_id = uuid4().hex
+        self.messages: List[dict] = []
+        self.archived = 0
+        self.pages_shown = 1
+        self._blocks: "OrderedDict[Tuple[int, int], str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.archived + len(self.messages)
+
+    def append(self, role: str, content: str) -> None:
+        self.messages.append({"role": role, "content": content})
+        overflow = len(self.messages) - self.max_in_memory
+        if overflow > 0:
+            self.archive.append(self.conversation_id, self.archived, self.messages[:overflow])
+            del self.messages[:overflow]
+            self.archived += overflow
+
+    def recent(self) -> List[dict]:
+        """The messages still held in memory, oldest first."""
+        return list(self.messages)
+
+    def read(self, start: int, end: int) -> List[dict]:
+        """Messages at positions `start` to `end` (exclusive), from memory or the archive."""
+        messages = []
+        if start < self.archived:
+            messages = self.archive.read(self.conversation_id, start, min(end, self.archived))
+        first = max(start, self.archived) - self.archived
+        return messages + self.messages[first : max(end - self.archived, 0)]
+
+    def clear(self) -> None:
+        """Start a new conversation and drop this one from the archive."""
+        self.archive.delete(self.conversation_id)
+        self.conversation_id = uuid4().hex
+        self.messages = []
+        self.archived = 0
+        self.pages_shown = 1
+        self._blocks.clear()
+
+    def block(self, start: int, end: int) -> str:
+        """Messages `start` to `end` as one markdown block, rendered once.
+
+        Blocks are kept least recently used first, at most `max_blocks` of them.
+        """
+        key = (start, end)
+        if key in self._blocks:
+            self._blocks.move_to_end(key)
+            return self._blocks[key]
+        block = self._blocks[key] = "\n\n---\n\n".join(
+            f"**{ROLE_LABELS.get(m['role'], m['role'])}:** {m['content']}" for m in self.read(start, end)
+        )
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+
+def render_chat_history(history: ChatHistory, key: str) -> None:
+    """The last page of `history` as chat bubbles, with earlier pages on request."""
+    size = history.page_size
+    bubbles_start = max(0, len(history) - size)
+    earlier_start = max(0, bubbles_start - (history.pages_shown - 1) * size)
+    if earlier_start > 0:
+        st.button(
+            f"⬆️ Show earlier messages ({earlier_start} more)",
+            key=f"{key}_show_earlier",
+            on_click=setattr,
+            args=(history, "pages_shown", history.pages_shown + 1),
+        )
+
+    # Earlier messages in pages aligned to their position, so full pages stay cached
+    page_start = earlier_start
+    while page_start < bubbles_start:
+        page_end = min((page_start // size + 1) * size, bubbles_start)
+        with st.container(border=True):
+            st.markdown(history.block(page_start, page_end))
+        page_start = page_end
+
+    for message in history.read(bubbles_start, len(history)):
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+
+def latest_start(total: int, page_size: int, key: str, label: str = "items") -> int:
+    """Index of the first of the last pages of a list to show.
+
+    Renders a "Show earlier" button that adds one page per click; the number
+    of pages shown is kept in session state under `key`.
+    """
+    pages_key = f"{key}_pages_shown"
+    pages = st.session_state.get(pages_key, 1)
+    start = max(0, total - pages * page_size)
+    if start > 0:
+        st.button(
+            f"⬆️ Show earlier {label} ({start} more)",
+            key=f"{key}_show_earlier",
+            on_click=st.session_state.__setitem__,
+            args=(pages_key, pages + 1),
+        )
+    return start
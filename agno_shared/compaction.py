@@ -0,0 +1,353 @@
+"""Compaction of tool results before the model reads them.
+
+Tool results go into the next model turn verbatim: company info with
+addresses and cash-flow figures, news items with thumbnails and ids,
+search results whose snippets repeat each other, and whole video
+transcripts. On a CPU-only Ollama the prefill of that text takes longer
+than writing the answer. `compact()` shrinks a result according to the tool
+that produced it:
+
+* JSON records (company info, news, recommendations, video data) are
+  projected to the fields the agents use;
+* search results are de-duplicated by URL and by near-identical snippets,
+  and each snippet is cut to `SNIPPET_CHARS`;
+* transcripts are split into chunks, which are ranked by their overlap
+  with the user's question. The best chunks are kept in video order; if
+  nothing matches, the chunks are spread evenly over the video;
+* whatever is left is cut to the tool's token budget
+  (`TOOL_TOKEN_BUDGETS`, default `TOOL_RESULT_TOKEN_BUDGET`).
+
+A result that is not in the expected shape (an error message, or a table
+from the batched finance tools) is only cut to the budget.
+
+The toolkits pass themselves to `compact_tool_calls()`, which sets a
+`post_hook` on each of their functions, so every tool call the model makes
+is compacted, with the agent's current input as the question. The fast
+path calls `compact_tool_result()` itself. Each call is
+recorded as a `compact <tool>` span with tokens before and after, and
+totals per tool are kept in `CompactionStats` for the sidebar. Set
+`TOOL_COMPACTION=0` to turn compaction off.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+from agno.tools.function import FunctionCall
+from agno.tools.toolkit import Toolkit
+
+from agno_shared.history import estimate_tokens
+from agno_shared.query import normalize_query
+from agno_shared.shared import lazy_singleton
+from agno_shared.tracing import span
+
+COMPACTION_ENABLED: bool = os.getenv("TOOL_COMPACTION", "1") != "0"
+DEFAULT_TOOL_TOKEN_BUDGET: int = int(os.getenv("TOOL_RESULT_TOKEN_BUDGET", "800"))
+# Token budget per tool, where it differs from the default
+TOOL_TOKEN_BUDGETS: Dict[str, int] = {
+    "get_youtube_video_captions": 1500,
+    "get_video_timestamps": 1500,
+    "duckduckgo_search": 600,
+    "duckduckgo_news": 600,
+    "get_youtube_video_data": 100,
+}
+SNIPPET_CHARS: int = 300
+CHUNK_WORDS: int = 120
+# Snippets sharing at least this fraction of their words are duplicates
+DUPLICATE_OVERLAP: float = 0.8
+
+COMPANY_INFO_FIELDS = (
+    "Name",
+    "Symbol",
+    "Current Stock Price",
+    "Market Cap",
+    "Sector",
+    "Industry",
+    "EPS",
+    "P/E Ratio",
+    "52 Week Low",
+    "52 Week High",
+    "Analyst Recommendation",
+    "Number Of Analyst Opinions",
+    "Revenue Growth",
+    "Gross Margins",
+    "Summary",
+)
+VIDEO_DATA_FIELDS = ("title", "author_name")
+
+_WORD = re.compile(r"\w+")
+_TIMESTAMP_LINE = re.compile(r"^\d+:\d{2} - ", re.MULTILINE)
+
+
+def tool_budget(tool: str) -> int:
+    return TOOL_TOKEN_BUDGETS.get(tool, DEFAULT_TOOL_TOKEN_BUDGET)
+
+
+def fit_to_budget(text: str, budget: int) -> str:
+    """`text` cut to about `budget` tokens, ending on a whole line where possible."""
+    if estimate_tokens(text) <= budget:
+        return text
+    kept = text[: budget * 4]
+    if "\n" in kept:
+        kept = kept.rsplit("\n", 1)[0]
+    return f"{kept}\n[... {estimate_tokens(text) - estimate_tokens(kept)} tokens omitted]"
+
+
+def shorten(text, chars: int = SNIPPET_CHARS) -> str:
+    text = " ".join(str(text or "").split())
+    if len(text) <= chars:
+        return text
+    return text[:chars].rsplit(" ", 1)[0] + "…"
+
+
+def _words(text: str) -> set:
+    return set(_WORD.findall(text.lower()))
+
+
+def url_key(url: str) -> str:
+    """`url` without scheme, "www.", fragment and trailing slash, for de-duplication."""
+    url = re.sub(r"^https?://(www\.)?", "", str(url or "").lower())
+    return url.split("#", 1)[0].rstrip("/")
+
+
+def compact_search_results(result: str, question: str, budget: int) -> Optional[str]:
+    """DuckDuckGo results as one line each, without duplicate URLs or snippets."""
+    items = json.loads(result)
+    if not isinstance(items, list):
+        return None
+    lines: List[str] = []
+    seen_urls = set()
+    seen_snippets: List[set] = []
+    for item in items:
+        if not isinstance(item, dict):
+            return None
+        url = item.get("href") or item.get("url") or ""
+        body = shorten(item.get("body"))
+        words = _words(body)
+        duplicate = any(
+            len(words & other) >= DUPLICATE_OVERLAP * max(len(words), len(other), 1)
+            for other in seen_snippets
+        )
+        if duplicate or url_key(url) in seen_urls:
+            continue
+        seen_urls.add(url_key(url))
+        seen_snippets.append(words)
+        details = ", ".join(part for part in (item.get("source"), str(item.get("date") or "")[:10]) if part)
+        lines.append(f"- {item.get('title', '')}{f' ({details})' if details else ''} <{url}>: {body}")
+    return "\n".join(lines)
+
+
+def compact_company_info(result: str, question: str, budget: int) -> Optional[str]:
+    info = json.loads(result)
+    if not isinstance(info, dict):
+        return None
+    return "\n".join(
+        f"{field}: {shorten(info[field]) if field == 'Summary' else info[field]}"
+        for field in COMPANY_INFO_FIELDS
+        if info.get(field) not in (None, "", "None None")
+    )
+
+
+def compact_company_news(result: str, question: str, budget: int) -> Optional[str]:
+    items = json.loads(result)
+    if not isinstance(items, list):
+        return None
+    lines = []
+    for item in items:
+        # Newer yfinance versions nest the story under "content"
+        content = item.get("content") or item
+        url = (content.get("canonicalUrl") or {}).get("url") or content.get("link", "")
+        publisher = (content.get("provider") or {}).get("displayName") or content.get("publisher", "")
+        date = str(content.get("pubDate") or "")[:10]
+        details = ", ".join(part for part in (publisher, date) if part)
+        lines.append(f"- {content.get('title', '')}{f' ({details})' if details else ''} <{url}>")
+    return "\n".join(lines)
+
+
+def compact_recommendations(result: str, question: str, budget: int) -> Optional[str]:
+    rows = json.loads(result)
+    if not isinstance(rows, dict):
+        return None
+    # Keyed by row number; the first rows are the most recent months
+    lines = []
+    for row in list(rows.values())[:2]:
+        period = row.get("period", "")
+        counts = ", ".join(f"{key} {value}" for key, value in row.items() if key != "period")
+        lines.append(f"{period}: {counts}")
+    return "\n".join(lines)
+
+
+def compact_video_data(result: str, question: str, budget: int) -> Optional[str]:
+    data = json.loads(result)
+    if not isinstance(data, dict):
+        return None
+    return "\n".join(f"{field}: {data[field]}" for field in VIDEO_DATA_FIELDS if data.get(field))
+
+
+def _spread_order(n: int) -> List[int]:
+    """0..n-1 ordered so that every prefix is spread evenly over the range."""
+    order: List[int] = []
+    seen = set()
+    k = 0
+    while len(order) < n:
+        # Van der Corput sequence: 0, 1/2, 1/4, 3/4, 1/8, ...
+        fraction, denominator, bits = 0.0, 1.0, k
+        while bits:
+            denominator *= 2
+            fraction += (bits & 1) / denominator
+            bits >>= 1
+        k += 1
+        i = int(fraction * n)
+        if i not in seen:
+            seen.add(i)
+            order.append(i)
+    return order
+
+
+def rank_chunks(chunks: List[str], question: str) -> List[int]:
+    """Chunk indices, best match for `question` first.
+
+    A chunk scores by the question terms it contains, weighted by how rare
+    each term is across the chunks. Equal scores (and so every chunk, when
+    none matches) are ordered to spread evenly over the text.
+    """
+    terms = set(normalize_query(question).split())
+    chunk_words = [_words(chunk) for chunk in chunks]
+    weights = {
+        term: math.log((len(chunks) + 1) / (1 + sum(term in words for words in chunk_words)))
+        for term in terms
+    }
+    scores = [sum(weight for term, weight in weights.items() if term in words) for words in chunk_words]
+    spread = {index: rank for rank, index in enumerate(_spread_order(len(chunks)))}
+    return sorted(range(len(chunks)), key=lambda i: (-scores[i], spread[i]))
+
+
+def chunk_transcript(result: str) -> List[str]:
+    """Chunks of about `CHUNK_WORDS` words; timestamped lines are kept whole."""
+    if _TIMESTAMP_LINE.match(result):
+        chunks, current, words = [], [], 0
+        for line in result.splitlines():
+            current.append(line)
+            words += len(line.split())
+            if words >= CHUNK_WORDS:
+                chunks.append("\n".join(current))
+                current, words = [], 0
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+    words = result.split()
+    return [" ".join(words[i : i + CHUNK_WORDS]) for i in range(0, len(words), CHUNK_WORDS)]
+
+
+def compact_transcript(result: str, question: str, budget: int) -> Optional[str]:
+    """The transcript chunks that best match `question`, in video order, within `budget`."""
+    if estimate_tokens(result) <= budget:
+        return result
+    chunks = chunk_transcript(result)
+    kept, tokens = set(), 0
+    for i in rank_chunks(chunks, question):
+        chunk_tokens = estimate_tokens(chunks[i])
+        if tokens + chunk_tokens > budget:
+            continue
+        kept.add(i)
+        tokens += chunk_tokens
+    separator = "\n" if _TIMESTAMP_LINE.match(result) else " "
+    parts = []
+    for i in sorted(kept):
+        if parts and i - 1 not in kept:
+            parts.append("[...]")
+        parts.append(chunks[i])
+    return (
+        f"[{len(kept)} of {len(chunks)} transcript excerpts]\n"
+        + separator.join(parts)
+    )
+
+
+# Compactor for the results of each tool, by function name. A compactor
+# returns None (or raises ValueError) when the result has another shape.
+COMPACTORS: Dict[str, Callable[[str, str, int], Optional[str]]] = {
+    "duckduckgo_search": compact_search_results,
+    "duckduckgo_news": compact_search_results,
+    "get_company_info": compact_company_info,
+    "get_company_news": compact_company_news,
+    "get_analyst_recommendations": compact_recommendations,
+    "get_youtube_video_data": compact_video_data,
+    "get_youtube_video_captions": compact_transcript,
+    "get_video_timestamps": compact_transcript,
+}
+
+
+def compact(tool: str, result: str, question: str = "", budget: Optional[int] = None) -> str:
+    """`result` of `tool`, compacted for a model answering `question`."""
+    budget = budget or tool_budget(tool)
+    compactor = COMPACTORS.get(tool)
+    if compactor is not None:
+        try:
+            result = compactor(result, question, budget) or result
+        except (ValueError, TypeError, AttributeError):
+            # Not the shape this tool usually returns, e.g. an error message
+            pass
+    return fit_to_budget(result, budget)
+
+
+class CompactionStats:
+    """Tokens before and after compaction, per tool."""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, tokens_before: int, tokens_after: int) -> None:
+        with self._lock:
+            totals = self._totals.setdefault(tool, {"calls": 0, "before": 0, "after": 0, "last_saved": 0})
+            totals["calls"] += 1
+            totals["before"] += tokens_before
+            totals["after"] += tokens_after
+            totals["last_saved"] = tokens_before - tokens_after
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {tool: dict(totals) for tool, totals in sorted(self._totals.items())}
+
+    def lines(self) -> List[str]:
+        """One markdown line per tool, for a sidebar."""
+        return [
+            f"`{tool}` {t['calls']}× · {t['before']:,} → {t['after']:,} tokens · last saved {t['last_saved']:,}"
+            for tool, t in self.summary().items()
+        ]
+
+
+@lazy_singleton
+def get_default_stats() -> CompactionStats:
+    return CompactionStats()
+
+
+def compact_tool_result(tool: str, result: str, question: str = "") -> str:
+    """`compact()`, recorded as a span and in the default `CompactionStats`."""
+    if not COMPACTION_ENABLED or not isinstance(result, str):
+        return result
+    with span(f"compact {tool}", "internal") as s:
+        compacted = compact(tool, result, question)
+        before, after = estimate_tokens(result), estimate_tokens(compacted)
+        if s is not None:
+            s.set(tokens_before=before, tokens_after=after, tokens_saved=before - after)
+    get_default_stats().record(tool, before, after)
+    return compacted
+
+
+def _compact_result(fc: FunctionCall) -> None:
+    # agno runs the post-hook only after a successful call, sync or async
+    if isinstance(fc.result, str):
+        run_input = getattr(getattr(fc.function, "_agent", None), "run_input", None)
+        question = run_input if isinstance(run_input, str) else ""
+        fc.result = compact_tool_result(fc.function.name, fc.result, question)
+
+
+def compact_tool_calls(toolkit: Toolkit) -> Toolkit:
+    """Compact the result of every call the model makes to `toolkit`."""
+    for function in toolkit.functions.values():
+        function.post_hook = _compact_result
+    return toolkit
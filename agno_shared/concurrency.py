@@ -0,0 +1,120 @@
+"""Bounded concurrent execution of independent agent runs.
+
+A single Ollama host only serves `OLLAMA_NUM_PARALLEL` requests at once.
+Thread pools sized per feature (plan steps, video windows, batch workers)
+multiply with each other and with the number of sessions, so the cap is
+enforced per process instead: every model request made through
+`CappedOllama` (which `agno_shared.warmup.ollama_model()` builds) first
+takes one of `AGENT_MAX_CONCURRENCY` slots. The pool sizes below only
+decide how much work is lined up for those slots.
+"""
+
+import asyncio
+import copy
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from agno_shared.tracing import TracedOllama, bind, span
+
+# Cap on simultaneous model calls in this process
+DEFAULT_MAX_CONCURRENCY: int = int(os.getenv("AGENT_MAX_CONCURRENCY", "3"))
+
+_model_slots = threading.BoundedSemaphore(max(1, DEFAULT_MAX_CONCURRENCY))
+
+
+@contextmanager
+def model_slot():
+    """Hold one of the process-wide model request slots."""
+    if not _model_slots.acquire(blocking=False):
+        with span("wait for model slot", "internal"):
+            _model_slots.acquire()
+    try:
+        yield
+    finally:
+        _model_slots.release()
+
+
+@asynccontextmanager
+async def async_model_slot():
+    """`model_slot()` for coroutines, without blocking the event loop."""
+    while not _model_slots.acquire(blocking=False):
+        await asyncio.sleep(0.05)
+    try:
+        yield
+    finally:
+        _model_slots.release()
+
+
+class CappedOllama(TracedOllama):
+    """Traced Ollama model whose requests wait for a process-wide model slot."""
+
+    def invoke(self, messages):
+        with model_slot():
+            return super().invoke(messages)
+
+    def invoke_stream(self, messages):
+        # The slot is held until the stream is finished or closed
+        with model_slot():
+            yield from super().invoke_stream(messages)
+
+    async def ainvoke(self, messages):
+        async with async_model_slot():
+            return await super().ainvoke(messages)
+
+    async def ainvoke_stream(self, messages):
+        async with async_model_slot():
+            async for chunk in super().ainvoke_stream(messages):
+                yield chunk
+
+    def __deepcopy__(self, memo):
+        # Agent.deep_copy() copies the model; the copies keep one HTTP client
+        # (and connection pool) but get their own tool and request state
+        clone = copy.copy(self)
+        for name, value in vars(self).items():
+            if name not in ("client", "async_client"):
+                setattr(clone, name, copy.deepcopy(value, memo))
+        return clone
+
+
+def isolated_run(agent, prompt: str, **kwargs):
+    """Run `prompt` on a private copy of `agent`.
+
+    `Agent.run` mutates per-run state (run_id, run_response, model tools), so
+    an agent instance must never be shared between threads.
+    """
+    # Agent.stream sticks once an agent has streamed, so ask for a response explicitly
+    kwargs.setdefault("stream", False)
+    with span(f"agent {agent.agent_id}", "agent", isolated=True):
+        return agent.deep_copy().run(prompt, **kwargs)
+
+
+def iter_parallel(
+    tasks: Dict[str, Callable[[], Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> Iterator[Tuple[str, Future]]:
+    """Run the task callables in a bounded thread pool.
+
+    Yields `(name, future)` pairs in completion order, so callers can render
+    each result as soon as it is ready.
+    """
+    max_workers = max(1, min(max_concurrency, len(tasks) or 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(bind(task)): name for name, task in tasks.items()}
+        for future in as_completed(futures):
+            yield futures[future], future
+
+
+def run_parallel(
+    tasks: Dict[str, Callable[[], Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> Dict[str, Any]:
+    """Run the task callables concurrently and return their results by name.
+
+    Every task is allowed to finish; the first failure (in task order) is
+    re-raised afterwards.
+    """
+    futures = dict(iter_parallel(tasks, max_concurrency))
+    return {name: futures[name].result() for name in tasks}
@@ -0,0 +1,300 @@
+"""Direct tool calls for requests that only use the model as a router.
+
+Asking an agent to "analyse this video" or "get the $NVDA price" costs two
+model completions: one to pick the tool and its arguments, and one to write
+the answer once the tool result is back. When the tool and its arguments
+follow from the request itself (a YouTube URL, `$`-prefixed ticker symbols,
+an explicit "search for ..."), `plan_tool_calls()` picks them without the
+model. `render_with_fast_path()` runs those tools directly and then makes a
+single synthesis call on a tool-less copy of the agent. `run_with_fast_path()`
+does the same without Streamlit, for background jobs. Tool results are
+compacted for the question (`agno_shared.compaction`) before the synthesis
+call.
+
+The tool results go to the model in a message after the user's prompt
+(`context_message()`), so the session history keeps the prompt as the
+user's turn, not the prompt with the results pasted in.
+
+Both paths are timed into `PathLatency`, so the sidebar can show what the
+fast path saves.
+"""
+
+import copy
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import streamlit as st
+from agno.models.message import Message
+
+from agno_shared.compaction import compact_tool_result
+from agno_shared.concurrency import isolated_run
+from agno_shared.shared import lazy_singleton
+from agno_shared.streaming import render_agent_response, response_text
+from agno_shared.tracing import bind, span
+
+MAX_TICKERS: int = 3
+# Batched finance tools take every ticker in one call
+MAX_BATCH_TICKERS: int = 10
+# Only cashtags count: any all-caps word (AI, USA, GDP) could pass for a ticker
+_TICKER = re.compile(r"(?<![\w$])\$([A-Za-z]{1,5}(?:\.[A-Za-z]{1,2})?)(?![\w])")
+# Questions that ask for a web search, rather than ones the model may answer itself
+_SEARCH_WORDS = re.compile(
+    r"\b(search\w*|look(?:ing)? up|google|research\w*|news|latest"
+    r"|find (?:me )?(?:articles|sources|studies|papers))\b",
+    re.IGNORECASE,
+)
+_YOUTUBE_URL = re.compile(r"https?://(?:www\.|m\.)?(?:youtube\.com|youtu\.be)/\S+")
+_NEWS_WORDS = re.compile(r"\b(news|latest|recent|today|this week)\b", re.IGNORECASE)
+_RECOMMENDATION_WORDS = re.compile(r"\b(recommend\w*|analysts?|rating|buy|sell|hold)\b", re.IGNORECASE)
+_INFO_WORDS = re.compile(r"\b(info\w*|company|about|overview|sector|market cap|fundamentals?)\b", re.IGNORECASE)
+
+
+class ToolCall(NamedTuple):
+    name: str
+    function: Callable[..., str]
+    kwargs: Dict
+
+    def label(self) -> str:
+        return f"{self.name}({', '.join(str(v) for v in self.kwargs.values())})"
+
+
+def agent_toolkit(agent, module: str, class_name: str):
+    """The agent's toolkit of class `module.class_name`, if it has one.
+
+    A toolkit whose module was never imported cannot be on the agent, so
+    this never imports the (heavy) tool modules itself.
+    """
+    toolkit_class = getattr(sys.modules.get(module), class_name, None)
+    if toolkit_class is None:
+        return None
+    for tool in getattr(agent, "tools", None) or []:
+        if isinstance(tool, toolkit_class):
+            return tool
+    return None
+
+
+def _call(toolkit, name: str, **kwargs) -> Optional[ToolCall]:
+    if name not in toolkit.functions:
+        return None
+    return ToolCall(name, getattr(toolkit, name), kwargs)
+
+
+def tickers(text: str, limit: int = MAX_TICKERS) -> List[str]:
+    """Ticker symbols written as cashtags (`$NVDA`) in `text`, upper-cased."""
+    found = []
+    for symbol in _TICKER.findall(text):
+        if symbol.upper() not in found:
+            found.append(symbol.upper())
+    return found[:limit]
+
+
+def plan_tool_calls(agent, text: str) -> List[ToolCall]:
+    """The tool calls `agent` would make for `text`, if they are obvious.
+
+    Returns an empty list when picking the tool needs the model, e.g. a
+    company named in words rather than by cashtag, or a question the agent
+    may answer without searching.
+    """
+    calls: List[Optional[ToolCall]] = []
+
+    youtube = agent_toolkit(agent, "agno.tools.youtube", "YouTubeTools")
+    url = _YOUTUBE_URL.search(text)
+    if youtube is not None and url:
+        calls += [
+            _call(youtube, "get_youtube_video_data", url=url.group(0)),
+            _call(youtube, "get_youtube_video_captions", url=url.group(0)),
+        ]
+        return [call for call in calls if call is not None]
+
+    finance = agent_toolkit(agent, "agno_shared.finance_cache", "BatchedFinanceTools")
+    if finance is not None:
+        # One call per kind of data, covering every ticker
+        symbols = tickers(text, MAX_BATCH_TICKERS)
+        arguments = [{"symbols": ",".join(symbols)}] if symbols else []
+    else:
+        finance = agent_toolkit(agent, "agno.tools.yfinance", "YFinanceTools")
+        symbols = tickers(text) if finance is not None else []
+        arguments = [{"symbol": symbol} for symbol in symbols]
+    if arguments:
+        for kwargs in arguments:
+            calls.append(_call(finance, "get_current_stock_price", **kwargs))
+            if _INFO_WORDS.search(text):
+                calls.append(_call(finance, "get_company_info", **kwargs))
+            if _RECOMMENDATION_WORDS.search(text):
+                calls.append(_call(finance, "get_analyst_recommendations", **kwargs))
+            if _NEWS_WORDS.search(text):
+                calls.append(_call(finance, "get_company_news", **kwargs))
+        return [call for call in calls if call is not None]
+
+    search = agent_toolkit(agent, "agno.tools.duckduckgo", "DuckDuckGoTools")
+    if search is not None and _SEARCH_WORDS.search(text):
+        calls.append(_call(search, "duckduckgo_search", query=text))
+        if _NEWS_WORDS.search(text):
+            calls.append(_call(search, "duckduckgo_news", query=text))
+    return [call for call in calls if call is not None]
+
+
+def run_tool_calls(calls: List[ToolCall], question: str = "") -> Dict[str, str]:
+    """Run `calls` in parallel; returns {label: compacted result}. Errors become results."""
+
+    def run(call: ToolCall) -> str:
+        with span(f"tool {call.name}", "tool", direct=True, arguments=json.dumps(call.kwargs)):
+            try:
+                result = str(call.function(**call.kwargs))
+            except Exception as e:
+                return f"Error: {e}"
+        return compact_tool_result(call.name, result, question)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(calls))) as executor:
+        results = list(executor.map(bind(run), calls))
+    return {call.label(): result for call, result in zip(calls, results)}
+
+
+def synthesis_context(results: Dict[str, str]) -> str:
+    sections = "\n\n".join(f"### {label}\n{result}" for label, result in results.items())
+    return (
+        "The tools have already been called for you. Answer the question above using "
+        f"these results and do not call any tools:\n\n{sections}"
+    )
+
+
+def context_message(context: str) -> Message:
+    """`context` as a message for the model, sent after the prompt and never stored."""
+    return Message(role="user", content=context, add_to_agent_memory=False)
+
+
+def context_kwargs(context: str, kwargs: dict) -> dict:
+    """`render_agent_response()` kwargs that send `context` after the prompt.
+
+    The context is also part of the response cache key, so a cached answer
+    is only reused for the same tool results.
+    """
+    return {
+        **kwargs,
+        "messages": [context_message(context)],
+        "cache_context": kwargs.get("cache_context", "") + context,
+    }
+
+
+def synthesis_agent(agent, history: bool = True):
+    """A copy of `agent` without tools that shares its session and memory.
+
+    With `history=False` the copy neither reads nor writes the session, for
+    intermediate calls whose prompts are not the user's turns.
+    """
+    if not hasattr(agent, "get_tools"):
+        # RemoteAgent: the service decides about tools itself
+        return agent
+    runner = copy.copy(agent)
+    runner.tools = None
+    runner._functions_for_model = None
+    runner._tools_for_model = None
+    runner.model = copy.copy(agent.model)
+    runner.model._tools = None
+    runner.model._functions = None
+    if not history:
+        runner.storage = None
+        runner.memory = None
+        runner.add_history_to_messages = False
+        runner.read_chat_history = False
+    return runner
+
+
+class PathLatency:
+    """Wall-clock time of each request, keyed by "<agent_id>:<path>"."""
+
+    def __init__(self, max_samples: int = 200):
+        self.max_samples = max_samples
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(key, [])
+            samples.append(seconds)
+            del samples[: -self.max_samples]
+
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                key: {"count": len(samples), "median": median(samples), "last": samples[-1]}
+                for key, samples in sorted(self._samples.items())
+            }
+
+    def lines(self) -> List[str]:
+        """One markdown line per agent and path, for a sidebar."""
+        return [
+            f"`{key}` {entry['count']}× · median {entry['median']:.1f}s · last {entry['last']:.1f}s"
+            for key, entry in self.summary().items()
+        ]
+
+
+@lazy_singleton
+def get_default_latency() -> PathLatency:
+    return PathLatency()
+
+
+def render_with_fast_path(
+    agent,
+    prompt: str,
+    calls: Optional[List[ToolCall]] = None,
+    enabled: bool = True,
+    latency: Optional[PathLatency] = None,
+    **kwargs,
+) -> str:
+    """`render_agent_response()`, with the tools called directly when possible.
+
+    `calls` defaults to `plan_tool_calls(agent, prompt)`. Without any (or
+    with `enabled=False`) the agent runs as usual.
+    """
+    latency = latency or get_default_latency()
+    start = time.perf_counter()
+    if enabled and calls is None:
+        calls = plan_tool_calls(agent, prompt)
+    if not enabled or not calls:
+        content = render_agent_response(agent, prompt, **kwargs)
+        latency.record(f"{agent.agent_id}:agent", time.perf_counter() - start)
+        return content
+
+    with st.spinner("Fetching data..."):
+        results = run_tool_calls(calls, prompt)
+    st.caption("⚡ Direct: " + ", ".join(f"`{label}`" for label in results))
+    context = synthesis_context(results)
+    content = render_agent_response(synthesis_agent(agent), prompt, **context_kwargs(context, kwargs))
+    latency.record(f"{agent.agent_id}:direct", time.perf_counter() - start)
+    return content
+
+
+def run_with_fast_path(
+    agent,
+    prompt: str,
+    calls: Optional[List[ToolCall]] = None,
+    enabled: bool = True,
+    latency: Optional[PathLatency] = None,
+) -> str:
+    """`render_with_fast_path()` without Streamlit: returns the answer text.
+
+    The model call runs on a private copy of the agent, so this is safe in a
+    worker thread.
+    """
+    latency = latency or get_default_latency()
+    start = time.perf_counter()
+    if enabled and calls is None:
+        calls = plan_tool_calls(agent, prompt)
+    if not enabled or not calls:
+        content = response_text(isolated_run(agent, prompt))
+        latency.record(f"{agent.agent_id}:agent", time.perf_counter() - start)
+        return content
+
+    results = run_tool_calls(calls, prompt)
+    content = response_text(
+        isolated_run(synthesis_agent(agent), prompt, messages=[context_message(synthesis_context(results))])
+    )
+    latency.record(f"{agent.agent_id}:direct", time.perf_counter() - start)
+    return content
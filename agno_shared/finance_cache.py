@@ -0,0 +1,439 @@
+"""Batched, cached Yahoo Finance tools for the Finance Agent.
+
+agno's `YFinanceTools` takes one symbol per call, so "compare AAPL, MSFT,
+NVDA, GOOG" makes the model call the price, info, recommendation and news
+tools once per ticker, one round-trip after another, and each answer is a
+JSON dump of the full record. `BatchedFinanceTools` offers the same four
+tools for a list of symbols:
+
+* prices for all symbols come from one `yf.download()` call, and the change
+  against the previous close is computed on the whole frame at once;
+* company info, analyst recommendations and news have no batch endpoint in
+  yfinance, so the symbols that are not cached are fetched concurrently;
+* every result is a compact markdown table with one row per symbol.
+
+Results are cached per symbol in `TickerCache`, so a later question about
+an overlapping set of tickers only fetches the new ones, and symbols that
+another session is already fetching are waited for rather than fetched
+again (single-flight). While the US
+market is open prices expire after `FINANCE_PRICE_TTL` seconds (default
+60); outside trading hours prices and fundamentals are kept until the next
+open, since they do not change in between.
+"""
+
+import datetime
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import pandas as pd
+import yfinance as yf
+from agno.tools import Toolkit
+from agno.utils.log import log_debug, logger
+
+from agno_shared.compaction import compact_tool_calls
+from agno_shared.shared import SharedOnCopy, lazy_singleton
+from agno_shared.tracing import bind, span, trace_tool_calls
+
+PRICE_TTL_SECONDS: int = int(os.getenv("FINANCE_PRICE_TTL", "60"))
+INFO_TTL_SECONDS: int = int(os.getenv("FINANCE_INFO_TTL", str(6 * 60 * 60)))
+NEWS_TTL_SECONDS: int = int(os.getenv("FINANCE_NEWS_TTL", str(15 * 60)))
+DEFAULT_MAX_ENTRIES: int = int(os.getenv("FINANCE_CACHE_MAX_ENTRIES", "2000"))
+MAX_SYMBOLS: int = int(os.getenv("FINANCE_MAX_SYMBOLS", "20"))
+FETCH_WORKERS: int = 8
+
+# Regular trading hours of the US exchanges (holidays are not taken into account)
+MARKET_TIMEZONE_NAME = "America/New_York"
+MARKET_OPEN = datetime.time(9, 30)
+MARKET_CLOSE = datetime.time(16, 0)
+
+_SYMBOL_SEPARATOR = re.compile(r"[\s,;]+")
+
+
+@lazy_singleton
+def market_timezone() -> datetime.tzinfo:
+    """The exchanges' time zone, or Eastern Standard Time without a tz database.
+
+    Windows and slim images may have neither a system tz database nor the
+    `tzdata` package; there the fixed offset is an hour off during daylight
+    saving time, which only shifts the cache TTLs.
+    """
+    try:
+        return ZoneInfo(MARKET_TIMEZONE_NAME)
+    except ZoneInfoNotFoundError:
+        logger.warning(f"Time zone {MARKET_TIMEZONE_NAME} not found; install tzdata. Using UTC-5.")
+        return datetime.timezone(datetime.timedelta(hours=-5), "EST")
+
+
+def market_is_open(now: Optional[datetime.datetime] = None) -> bool:
+    tz = market_timezone()
+    now = (now or datetime.datetime.now(tz)).astimezone(tz)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def seconds_until_open(now: Optional[datetime.datetime] = None) -> float:
+    """Seconds until the next regular session opens; 0 while the market is open."""
+    tz = market_timezone()
+    now = (now or datetime.datetime.now(tz)).astimezone(tz)
+    if market_is_open(now):
+        return 0.0
+    day = now.date() if now.time() < MARKET_OPEN else now.date() + datetime.timedelta(days=1)
+    while day.weekday() >= 5:
+        day += datetime.timedelta(days=1)
+    opens = datetime.datetime.combine(day, MARKET_OPEN, tzinfo=tz)
+    return (opens - now).total_seconds()
+
+
+def market_ttl(kind: str, now: Optional[datetime.datetime] = None) -> float:
+    """How long a `kind` record ("price", "info", "recommendations", "news") stays fresh."""
+    if kind == "news":
+        return NEWS_TTL_SECONDS
+    ttl = PRICE_TTL_SECONDS if kind == "price" else INFO_TTL_SECONDS
+    # Nothing changes until the market opens again
+    return max(ttl, seconds_until_open(now))
+
+
+def parse_symbols(symbols: Union[str, Sequence[str]]) -> List[str]:
+    """Upper-case, de-duplicated symbols from "AAPL, msft NVDA" or a list."""
+    if isinstance(symbols, str):
+        symbols = _SYMBOL_SEPARATOR.split(symbols)
+    found: List[str] = []
+    for symbol in symbols:
+        symbol = str(symbol).strip().lstrip("$").upper()
+        if symbol and symbol not in found:
+            found.append(symbol)
+    return found[:MAX_SYMBOLS]
+
+
+class TickerCache(SharedOnCopy):
+    """Per-symbol records keyed by (kind, symbol), each with its own expiry."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.collapsed = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, dict]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def get_many(
+        self,
+        kind: str,
+        symbols: List[str],
+        fetch: Callable[[List[str]], Dict[str, dict]],
+    ) -> Dict[str, dict]:
+        """Records of `symbols`; the missing or expired ones are fetched in one `fetch` call.
+
+        `fetch` returns {symbol: record}. Symbols it leaves out are not cached.
+        Symbols another caller is already fetching are waited for instead.
+        """
+        # The TTL is decided by the time of the request, so a download that
+        # runs past the close does not cache its prices overnight
+        now = time.time()
+        records: Dict[str, dict] = {}
+        missing: List[str] = []
+        waiting: Dict[str, Future] = {}
+        with self._lock:
+            for symbol in symbols:
+                key = (kind, symbol)
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(key)
+                    records[symbol] = entry[1]
+                elif key in self._in_flight:
+                    waiting[symbol] = self._in_flight[key]
+                else:
+                    self._in_flight[key] = Future()
+                    missing.append(symbol)
+            self.hits += len(records)
+            self.misses += len(missing)
+            self.collapsed += len(waiting)
+            owned = {symbol: self._in_flight[(kind, symbol)] for symbol in missing}
+
+        if missing:
+            try:
+                with span(f"fetch {kind}", "http", symbols=",".join(missing)):
+                    fetched = fetch(missing)
+            except Exception as e:
+                with self._lock:
+                    for symbol in missing:
+                        del self._in_flight[(kind, symbol)]
+                for future in owned.values():
+                    future.set_exception(e)
+                raise
+
+            expires = now + market_ttl(kind, datetime.datetime.fromtimestamp(now, market_timezone()))
+            with self._lock:
+                self.fetches += 1
+                for symbol, record in fetched.items():
+                    self._entries[(kind, symbol)] = (expires, record)
+                    self._entries.move_to_end((kind, symbol))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                for symbol in missing:
+                    del self._in_flight[(kind, symbol)]
+            for symbol, future in owned.items():
+                future.set_result(fetched.get(symbol))
+            records.update(fetched)
+
+        for symbol, future in waiting.items():
+            record = future.result()
+            if record is not None:
+                records[symbol] = record
+        return {symbol: records[symbol] for symbol in symbols if symbol in records}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "fetches": self.fetches,
+                "collapsed": self.collapsed,
+                "entries": len(self._entries),
+            }
+
+
+@lazy_singleton
+def get_default_cache() -> TickerCache:
+    """Process-wide cache shared by every BatchedFinanceTools instance."""
+    return TickerCache()
+
+
+def _fetch_prices(symbols: List[str]) -> Dict[str, dict]:
+    """Last price and change of every symbol, from one daily-bars download."""
+    data = yf.download(
+        symbols,
+        period="5d",
+        interval="1d",
+        group_by="column",
+        auto_adjust=False,
+        progress=False,
+        threads=True,
+    )
+    if data is None or data.empty:
+        return {}
+    closes = data["Close"]
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(symbols[0])
+    closes = closes.ffill()
+    last = closes.iloc[-1]
+    change = (last / closes.iloc[max(len(closes) - 2, 0)] - 1) * 100
+    as_of = closes.index[-1].strftime("%Y-%m-%d")
+    return {
+        symbol: {"price": float(last[symbol]), "change": float(change[symbol]), "as_of": as_of}
+        for symbol in closes.columns
+        if symbol in symbols and pd.notna(last[symbol])
+    }
+
+
+def _fetch_each(symbols: List[str], fetch_one: Callable[[str], Optional[dict]]) -> Dict[str, dict]:
+    """`fetch_one` for every symbol, concurrently; symbols that fail are left out."""
+
+    def fetch(symbol: str) -> Optional[dict]:
+        try:
+            return fetch_one(symbol)
+        except Exception as e:
+            log_debug(f"Could not fetch {symbol}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(symbols))) as executor:
+        records = list(executor.map(bind(fetch), symbols))
+    return {symbol: record for symbol, record in zip(symbols, records) if record}
+
+
+def _info(symbol: str) -> Optional[dict]:
+    info = yf.Ticker(symbol).info or {}
+    if not info.get("shortName") and not info.get("longName"):
+        return None
+    return {
+        "name": info.get("shortName") or info.get("longName"),
+        "sector": info.get("sector"),
+        "industry": info.get("industry"),
+        "price": info.get("regularMarketPrice", info.get("currentPrice")),
+        "currency": info.get("currency", "USD"),
+        "market_cap": info.get("marketCap"),
+        "pe": info.get("trailingPE"),
+        "eps": info.get("trailingEps"),
+        "low_52w": info.get("fiftyTwoWeekLow"),
+        "high_52w": info.get("fiftyTwoWeekHigh"),
+        "rating": info.get("recommendationKey"),
+    }
+
+
+def _recommendations(symbol: str) -> Optional[dict]:
+    frame = yf.Ticker(symbol).recommendations
+    if frame is None or frame.empty:
+        return None
+    # The first row is the current month ("0m")
+    row = frame.iloc[0]
+    return {column: int(row.get(column, 0) or 0) for column in ("strongBuy", "buy", "hold", "sell", "strongSell")}
+
+
+def _news(symbol: str) -> Optional[dict]:
+    stories = []
+    for item in yf.Ticker(symbol).news or []:
+        # Newer yfinance versions nest the story under "content"
+        content = item.get("content") or item
+        url = (content.get("canonicalUrl") or {}).get("url") or content.get("link", "")
+        stories.append(
+            {
+                "title": content.get("title", ""),
+                "date": str(content.get("pubDate") or content.get("providerPublishTime") or "")[:10],
+                "url": url,
+            }
+        )
+    return {"stories": stories} if stories else None
+
+
+def _number(value, digits: int = 2) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return "–"
+    if isinstance(value, (int, float)):
+        for size, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M")):
+            if abs(value) >= size:
+                return f"{value / size:.{digits}f}{suffix}"
+        return f"{value:.{digits}f}" if isinstance(value, float) else str(value)
+    return str(value)
+
+
+def _table(header: List[str], rows: List[List[str]]) -> str:
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    lines += ["| " + " | ".join(cell.replace("|", "/") for cell in row) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def _not_found(symbols: List[str], records: Dict[str, dict]) -> str:
+    missing = [symbol for symbol in symbols if symbol not in records]
+    return f"\n\nNo data for: {', '.join(missing)}" if missing else ""
+
+
+class BatchedFinanceTools(Toolkit):
+    def __init__(
+        self,
+        stock_price: bool = True,
+        company_info: bool = False,
+        analyst_recommendations: bool = False,
+        company_news: bool = False,
+        cache: Optional[TickerCache] = None,
+    ):
+        super().__init__(name="batched_finance_tools")
+        self.cache: TickerCache = cache or get_default_cache()
+
+        if stock_price:
+            self.register(self.get_current_stock_price)
+        if company_info:
+            self.register(self.get_company_info)
+        if analyst_recommendations:
+            self.register(self.get_analyst_recommendations)
+        if company_news:
+            self.register(self.get_company_news)
+        # Model-initiated calls are traced and their results compacted
+        compact_tool_calls(trace_tool_calls(self))
+
+    def get_current_stock_price(self, symbols: str) -> str:
+        """Use this function to get the current stock price of one or more stock symbols.
+        Pass every symbol you need in a single call.
+
+        Args:
+            symbols (str): Comma-separated stock symbols, e.g. "AAPL,MSFT,NVDA".
+
+        Returns:
+            str: A table with the price and daily change of each symbol.
+        """
+        symbols = parse_symbols(symbols)
+        if not symbols:
+            return "No stock symbols given"
+        try:
+            records = self.cache.get_many("price", symbols, _fetch_prices)
+        except Exception as e:
+            return f"Error fetching stock prices for {', '.join(symbols)}: {e}"
+        rows = [
+            [s, _number(records[s]["price"]), f"{records[s]['change']:+.2f}%", records[s]["as_of"]]
+            for s in symbols
+            if s in records
+        ]
+        return _table(["Symbol", "Price", "Change", "As of"], rows) + _not_found(symbols, records)
+
+    def get_company_info(self, symbols: str) -> str:
+        """Use this function to get company information and key figures for one or more stock
+        symbols. Pass every symbol you need in a single call.
+
+        Args:
+            symbols (str): Comma-separated stock symbols, e.g. "AAPL,MSFT,NVDA".
+
+        Returns:
+            str: A table with name, sector, market cap, P/E, EPS, 52-week range and analyst
+            rating of each symbol.
+        """
+        symbols = parse_symbols(symbols)
+        if not symbols:
+            return "No stock symbols given"
+        records = self.cache.get_many("info", symbols, lambda missing: _fetch_each(missing, _info))
+        rows = [
+            [
+                s,
+                r["name"] or "–",
+                r["sector"] or "–",
+                f"{_number(r['price'])} {r['currency']}",
+                _number(r["market_cap"]),
+                _number(r["pe"]),
+                _number(r["eps"]),
+                f"{_number(r['low_52w'])} to {_number(r['high_52w'])}" if r["high_52w"] else "–",
+                r["rating"] or "–",
+            ]
+            for s, r in ((s, records[s]) for s in symbols if s in records)
+        ]
+        header = ["Symbol", "Name", "Sector", "Price", "Market cap", "P/E", "EPS", "52w range", "Rating"]
+        return _table(header, rows) + _not_found(symbols, records)
+
+    def get_analyst_recommendations(self, symbols: str) -> str:
+        """Use this function to get this month's analyst recommendations for one or more stock
+        symbols. Pass every symbol you need in a single call.
+
+        Args:
+            symbols (str): Comma-separated stock symbols, e.g. "AAPL,MSFT,NVDA".
+
+        Returns:
+            str: A table with the number of strong buy, buy, hold, sell and strong sell
+            ratings of each symbol.
+        """
+        symbols = parse_symbols(symbols)
+        if not symbols:
+            return "No stock symbols given"
+        records = self.cache.get_many(
+            "recommendations", symbols, lambda missing: _fetch_each(missing, _recommendations)
+        )
+        columns = ("strongBuy", "buy", "hold", "sell", "strongSell")
+        rows = [[s] + [str(records[s][c]) for c in columns] for s in symbols if s in records]
+        header = ["Symbol", "Strong buy", "Buy", "Hold", "Sell", "Strong sell"]
+        return _table(header, rows) + _not_found(symbols, records)
+
+    def get_company_news(self, symbols: str, num_stories: int = 3) -> str:
+        """Use this function to get recent news for one or more stock symbols.
+        Pass every symbol you need in a single call.
+
+        Args:
+            symbols (str): Comma-separated stock symbols, e.g. "AAPL,MSFT,NVDA".
+            num_stories (int): The number of stories per symbol. Defaults to 3.
+
+        Returns:
+            str: A table with the date, headline and link of each story.
+        """
+        symbols = parse_symbols(symbols)
+        if not symbols:
+            return "No stock symbols given"
+        records = self.cache.get_many("news", symbols, lambda missing: _fetch_each(missing, _news))
+        rows = [
+            [s, story["date"] or "–", story["title"], story["url"]]
+            for s in symbols
+            if s in records
+            for story in records[s]["stories"][:num_stories]
+        ]
+        return _table(["Symbol", "Date", "Headline", "Link"], rows) + _not_found(symbols, records)
@@ -0,0 +1,144 @@
+"""Token-budgeted conversation history.
+
+`num_history_responses` replays a fixed number of earlier runs, so the
+prompt, and with it Ollama's prefill time, grows with every long tool result
+(finance tables, transcripts) they contain. `TokenBudgetMemory` replays as
+many recent runs as fit in a per-model token budget instead:
+
+1. tool results in earlier runs longer than `max_tool_result_tokens` are cut
+   to their opening lines, oldest first, until the history fits, then
+2. the oldest runs are dropped until it fits.
+
+Tokens are estimated at four characters each, which is close enough for
+budgeting without loading a tokenizer. The actual prompt size of each
+request is reported by Ollama and returned by `token_counts()`.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+from agno.agent import Agent
+from agno.memory.agent import AgentMemory
+from agno.models.message import Message
+from agno.utils.log import log_debug
+
+# History budget in tokens, by model family (the model id up to the tag)
+MODEL_HISTORY_BUDGETS: Dict[str, int] = {
+    "llama3.2": 1500,
+    "qwen2.5": 3000,
+    "deepseek-r1": 2000,
+    "phi4": 3000,
+    "gemma3": 3000,
+}
+DEFAULT_HISTORY_BUDGET: int = 1500
+# Overrides the per-model budgets when set
+HISTORY_TOKEN_BUDGET: Optional[int] = int(os.getenv("HISTORY_TOKEN_BUDGET", "0")) or None
+MAX_TOOL_RESULT_TOKENS: int = int(os.getenv("HISTORY_MAX_TOOL_RESULT_TOKENS", "200"))
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    return len(text) // 4 + 1 if text else 0
+
+
+def message_tokens(message: Message) -> int:
+    content = message.content if isinstance(message.content, str) else str(message.content or "")
+    return estimate_tokens(content) + estimate_tokens(str(message.tool_calls) if message.tool_calls else None)
+
+
+def history_budget(model_id: str) -> int:
+    if HISTORY_TOKEN_BUDGET is not None:
+        return HISTORY_TOKEN_BUDGET
+    return MODEL_HISTORY_BUDGETS.get(model_id.split(":")[0], DEFAULT_HISTORY_BUDGET)
+
+
+def shorten_tool_result(message: Message, max_tokens: int) -> Message:
+    """A copy of a tool result message cut to about `max_tokens` tokens."""
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    kept = content[: max_tokens * 4]
+    if "\n" in kept:
+        # End on a whole line
+        kept = kept.rsplit("\n", 1)[0]
+    trimmed = estimate_tokens(content) - estimate_tokens(kept)
+    return message.model_copy(update={"content": f"{kept}\n[... {trimmed} tokens of earlier tool output omitted]"})
+
+
+class TokenBudgetMemory(AgentMemory):
+    """AgentMemory whose history window is bounded by tokens, not by run count.
+
+    The `last_n` the agent passes (its `num_history_responses`) is ignored;
+    `max_runs` is the only count limit.
+    """
+
+    token_budget: int = DEFAULT_HISTORY_BUDGET
+    max_tool_result_tokens: int = MAX_TOOL_RESULT_TOKENS
+    max_runs: int = 20
+    # What the last call to get_messages_from_last_n_runs() sent and trimmed
+    history_stats: Dict[str, int] = {}
+
+    def get_messages_from_last_n_runs(
+        self, last_n: Optional[int] = None, skip_role: Optional[str] = None
+    ) -> List[Message]:
+        runs: List[List[Message]] = []
+        for run in self.runs[-self.max_runs:]:
+            if not (run.response and run.response.messages):
+                continue
+            runs.append(
+                [
+                    message
+                    for message in run.response.messages
+                    if not (skip_role and message.role == skip_role) and not message.from_history
+                ]
+            )
+
+        total = full = sum(message_tokens(m) for run in runs for m in run)
+        shortened = dropped = 0
+
+        # 1. Cut long tool results, oldest first
+        for run in runs:
+            for i, message in enumerate(run):
+                if total <= self.token_budget:
+                    break
+                if message.role == "tool" and message_tokens(message) > self.max_tool_result_tokens:
+                    run[i] = shorten_tool_result(message, self.max_tool_result_tokens)
+                    total -= message_tokens(message) - message_tokens(run[i])
+                    shortened += 1
+
+        # 2. Drop whole runs, oldest first, so tool calls keep their results
+        while runs and total > self.token_budget:
+            total -= sum(message_tokens(m) for m in runs.pop(0))
+            dropped += 1
+
+        self.history_stats = {
+            "history_tokens": total,
+            "saved_tokens": full - total,
+            "runs": len(runs),
+            "dropped_runs": dropped,
+            "shortened_tool_results": shortened,
+        }
+        log_debug(f"History: {self.history_stats}")
+        return [message for run in runs for message in run]
+
+
+def history_memory(model_id: str, **kwargs) -> TokenBudgetMemory:
+    """A TokenBudgetMemory with the history budget for `model_id`."""
+    return TokenBudgetMemory(token_budget=history_budget(model_id), **kwargs)
+
+
+def token_counts(agent: Agent) -> Dict[str, int]:
+    """Prompt and completion tokens of the agent's last run, as reported by the model.
+
+    Includes the estimated history size and savings when the agent uses a
+    TokenBudgetMemory. Empty when nothing is known (e.g. a cached answer).
+    """
+    counts: Dict[str, int] = {}
+    run_response = getattr(agent, "run_response", None)
+    # Replayed history messages carry the metrics of their original run, so skip them
+    for message in getattr(run_response, "messages", None) or []:
+        if message.role == "assistant" and message.metrics is not None and not message.from_history:
+            for key in ("input_tokens", "output_tokens"):
+                counts[key] = counts.get(key, 0) + getattr(message.metrics, key)
+    if not counts.get("input_tokens"):
+        return {}
+    if counts and isinstance(getattr(agent, "memory", None), TokenBudgetMemory):
+        counts.update(agent.memory.history_stats)
+    return counts
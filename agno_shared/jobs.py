@@ -0,0 +1,244 @@
+"""Background jobs for long-running work such as plan generation.
+
+Streamlit reruns the whole script on every widget interaction, so work done
+inline in a button handler is lost (or started twice) if the user clicks
+anything while it runs. `JobQueue` moves that work to a local worker pool.
+The script submits a job and keeps only its id; later reruns poll the job
+and pick up the result once it is done.
+
+Jobs live in a small SQLite table under `tmp/`, next to the other caches.
+A job is a `kind` plus JSON parameters, run by the handler registered for
+that kind, and its result must be JSON as well. Submitting a job of the
+same kind and key from the same session while an earlier one is still
+queued or running returns the earlier job, so double clicks and repeated
+submissions of one profile coalesce into one job. The key is the part of
+the parameters that says what the job is about (all of them by default),
+so settings such as a cache toggle don't split a profile into two jobs.
+Jobs of different
+sessions never coalesce: a job runs with its session's agents and history,
+and its result belongs to that session. Jobs left queued or running by a
+process that stopped are picked up again by `resume()`. One process should
+own a jobs file; other processes would resume its running jobs a second
+time.
+
+A handler can publish a partial result with `report_progress()` while it
+runs, so the page can show the parts that are ready. The partial result is
+kept when the job fails later.
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from uuid import uuid4
+
+from agno_shared.tracing import trace
+
+DEFAULT_JOBS_FILE: str = "tmp/jobs.db"
+DEFAULT_MAX_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+# Finished jobs are deleted after this many seconds
+DEFAULT_RETENTION_SECONDS: int = int(os.getenv("JOB_RETENTION_SECONDS", str(24 * 60 * 60)))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Job(NamedTuple):
+    id: str
+    kind: str
+    status: str
+    params: Dict[str, Any]
+    result: Any
+    partial: Any
+    error: Optional[str]
+    trace_id: Optional[str]
+    session_id: str
+    created_at: float
+    updated_at: float
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def elapsed(self) -> float:
+        return (self.updated_at if self.finished else time.time()) - self.created_at
+
+
+_COLUMNS = "id, kind, status, params, result, partial, error, trace_id, session_id, created_at, updated_at"
+
+
+def _job(row) -> Job:
+    id, kind, status, params, result, partial, error, trace_id, session_id, created_at, updated_at = row
+    return Job(
+        id,
+        kind,
+        status,
+        json.loads(params),
+        json.loads(result) if result is not None else None,
+        json.loads(partial) if partial is not None else None,
+        error,
+        trace_id,
+        session_id or "",
+        created_at,
+        updated_at,
+    )
+
+
+def job_key(kind: str, params: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps([kind, params], sort_keys=True, default=str).encode()).hexdigest()
+
+
+_current_job: contextvars.ContextVar[Optional[Tuple["JobQueue", str]]] = contextvars.ContextVar(
+    "current_job", default=None
+)
+
+
+def report_progress(partial: Any) -> None:
+    """Publish a partial result of the job running in this thread (JSON, like the result)."""
+    current = _current_job.get()
+    if current is not None:
+        queue, job_id = current
+        queue._update(job_id, partial=json.dumps(partial, default=str))
+
+
+class JobQueue:
+    def __init__(
+        self,
+        db_file: str = DEFAULT_JOBS_FILE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retention_seconds: int = DEFAULT_RETENTION_SECONDS,
+    ):
+        self.db_file = db_file
+        self.retention_seconds = retention_seconds
+        self.coalesced = 0
+        self._handlers: Dict[str, Callable[[Dict[str, Any], str], Any]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job")
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    result TEXT,
+                    partial TEXT,
+                    error TEXT,
+                    trace_id TEXT,
+                    session_id TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits (or rolls back) and is closed on exit."""
+        with closing(sqlite3.connect(self.db_file, timeout=30)) as conn, conn:
+            yield conn
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any], str], Any]) -> None:
+        """Run jobs of `kind` with `handler(params, session_id)`. Its return value must be JSON."""
+        self._handlers[kind] = handler
+
+    def submit(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        session_id: str = "",
+        key_params: Optional[Dict[str, Any]] = None,
+    ) -> Job:
+        """Queue a job, or return this session's queued or running job with the same key.
+
+        The key is `kind` and `key_params`, which default to all of `params`.
+        """
+        if kind not in self._handlers:
+            raise KeyError(f"No handler registered for job kind {kind!r}")
+        key = job_key(kind, params if key_params is None else key_params)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE key = ? AND session_id = ? AND status IN (?, ?) "
+                "ORDER BY created_at LIMIT 1",
+                (key, session_id, QUEUED, RUNNING),
+            ).fetchone()
+            if row is not None:
+                self.coalesced += 1
+                return _job(row)
+            job_id = uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, kind, key, status, params, session_id, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, key, QUEUED, json.dumps(params, default=str), session_id, now, now),
+            )
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, now - self.retention_seconds),
+            )
+        self._executor.submit(self._run, job_id)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row is not None else None
+
+    def resume(self) -> List[str]:
+        """Queue again the jobs an earlier process left unfinished. Returns their ids."""
+        with self._lock, self._connect() as conn:
+            job_ids = [
+                job_id
+                for job_id, kind in conn.execute(
+                    "SELECT id, kind FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+                ).fetchall()
+                if kind in self._handlers
+            ]
+            conn.executemany(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                [(QUEUED, time.time(), job_id) for job_id in job_ids],
+            )
+        for job_id in job_ids:
+            self._executor.submit(self._run, job_id)
+        return job_ids
+
+    def _update(self, job_id: str, **fields) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def _run(self, job_id: str) -> None:
+        job = self.get(job_id)
+        if job is None or job.status != QUEUED:
+            return
+        token = _current_job.set((self, job_id))
+        try:
+            with trace(f"job {job.kind}", job_id=job_id) as root:
+                self._update(job_id, status=RUNNING, trace_id=root.trace_id if root is not None else None)
+                try:
+                    result = json.dumps(self._handlers[job.kind](job.params, job.session_id), default=str)
+                except Exception as e:
+                    self._update(job_id, status=FAILED, error=f"{type(e).__name__}: {e}")
+                    return
+                self._update(job_id, status=DONE, result=result)
+        finally:
+            _current_job.reset(token)
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        stats = {status: counts.get(status, 0) for status in (QUEUED, RUNNING, DONE, FAILED)}
+        stats["coalesced"] = self.coalesced
+        return stats
@@ -0,0 +1,118 @@
+"""Retrieval over generated plans for follow-up questions.
+
+Plan Q&A used to send both full plans with every question, so each answer
+paid prefill on the whole text. `PlanIndex` splits the plans into sections
+once, when they are generated, and ranks the sections against a question
+with BM25. Only the top few go to the model, so the prompt size no longer
+depends on how long the plans are.
+
+The index is plain Python and lives in the Streamlit session. A pair of
+plans is a few dozen sections, far below the size where a vector store
+would pay for itself.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple
+
+from agno_shared.query import STOPWORDS
+
+DEFAULT_TOP_K: int = int(os.getenv("PLAN_QA_TOP_K", "4"))
+MAX_SECTION_CHARS: int = 1200
+
+# Markdown headings, bold-only lines ("**Day 1: Push**") and "Day N" lines start a section
+_HEADING = re.compile(r"^\s*(#{1,6}\s+.+|\*\*[^*]+\*\*:?\s*|(?:day|week)\s+\d+\b.*)$", re.IGNORECASE)
+
+
+class Section(NamedTuple):
+    source: str
+    heading: str
+    text: str
+
+
+def tokenize(text: str) -> List[str]:
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    # Crude plural folding, so "squats" matches "squat"
+    return [w[:-1] if len(w) > 3 and w.endswith("s") else w for w in words if w not in STOPWORDS]
+
+
+def split_sections(text: str, source: str, max_chars: int = MAX_SECTION_CHARS) -> List[Section]:
+    """Split a markdown plan at its headings, then long sections at blank lines."""
+    sections: List[Section] = []
+    heading, lines = "", []
+
+    def close():
+        body = "\n".join(lines).strip()
+        if not body:
+            return
+        part = ""
+        for paragraph in re.split(r"\n\s*\n", body):
+            if part and len(part) + len(paragraph) > max_chars:
+                sections.append(Section(source, heading, part))
+                part = ""
+            part = f"{part}\n\n{paragraph}" if part else paragraph
+        sections.append(Section(source, heading, part))
+
+    for line in text.splitlines():
+        if _HEADING.match(line):
+            close()
+            heading, lines = line.strip().strip("#* :"), [line]
+        else:
+            lines.append(line)
+    close()
+    return sections
+
+
+class PlanIndex:
+    """BM25 index over the sections of one or more plans."""
+
+    def __init__(self, sections: List[Section], k1: float = 1.5, b: float = 0.75):
+        self.sections = sections
+        self.k1 = k1
+        self.b = b
+        self._terms = [Counter(tokenize(f"{s.heading} {s.text}")) for s in sections]
+        self._lengths = [sum(terms.values()) for terms in self._terms]
+        self._average_length = sum(self._lengths) / len(self._lengths) if sections else 0.0
+        document_frequency = Counter(term for terms in self._terms for term in terms)
+        self._idf = {
+            term: math.log(1 + (len(sections) - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    @classmethod
+    def from_plans(cls, plans: Dict[str, str]) -> "PlanIndex":
+        """Index plans given as {source name: markdown text}."""
+        return cls([section for source, text in plans.items() for section in split_sections(text or "", source)])
+
+    def score(self, query_terms: List[str], i: int) -> float:
+        terms, length = self._terms[i], self._lengths[i]
+        score = 0.0
+        for term in query_terms:
+            tf = terms.get(term, 0)
+            if tf:
+                norm = self.k1 * (1 - self.b + self.b * length / (self._average_length or 1))
+                score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+        return score
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K) -> List[Section]:
+        """The `top_k` sections most relevant to `query`, in plan order.
+
+        When nothing matches, the opening section of each plan is returned,
+        so the model still sees what the plans are about.
+        """
+        query_terms = set(tokenize(query))
+        scores = [(self.score(list(query_terms), i), i) for i in range(len(self.sections))]
+        best = sorted((i for score, i in sorted(scores, reverse=True)[:top_k] if score > 0))
+        if not best:
+            seen, best = set(), []
+            for i, section in enumerate(self.sections):
+                if section.source not in seen:
+                    seen.add(section.source)
+                    best.append(i)
+        return [self.sections[i] for i in best]
+
+    def context(self, query: str, top_k: int = DEFAULT_TOP_K) -> str:
+        """The relevant sections formatted for a prompt, labelled with their plan."""
+        return "\n\n".join(f"{section.source}:\n{section.text}" for section in self.search(query, top_k))
@@ -0,0 +1,24 @@
+"""Query normalisation shared by the search cache, the fast path and plan Q&A.
+
+Kept apart from `agno_shared.search_cache` so that importing it does not
+import the DuckDuckGo tools.
+"""
+
+import re
+
+STOPWORDS = frozenset(
+    """
+    a about an and are as at be by can could do does for from how i in is it
+    me my of on or please should show tell that the their there these this to
+    was what when where which who why will with would you your
+    """.split()
+)
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a search query used as the cache key."""
+    words = re.findall(r"[\w$%+#.-]+", query.lower())
+    words = [w.strip(".") for w in words]
+    kept = [w for w in words if w and w not in STOPWORDS]
+    # A query made only of stopwords still needs a distinct key
+    return " ".join(kept or words)
@@ -0,0 +1,177 @@
+"""Research in one parallel fetch and one generation.
+
+Given a research question, the agent searched DuckDuckGo one query at a
+time, with a model turn before each search. Even the fast path made only
+one search. `render_research()` instead:
+
+1. expands the question into up to `RESEARCH_MAX_QUERIES` sub-queries
+   from templates (`RESEARCH_FACETS`), so no model call comes before the
+   fetch;
+2. runs every web search and a news search for the question concurrently,
+   through the agent's cached DuckDuckGo tools;
+3. de-duplicates the results by URL and fuses the ranked lists with
+   reciprocal rank fusion: a source scores `1 / (RRF_K + rank)` in every
+   list it appears in, so sources found by several sub-queries come first;
+4. makes one synthesis call with the best `RESEARCH_MAX_SOURCES` sources,
+   numbered, and asks for every claim to cite its source as `[n]`. The
+   sources go in a message after the prompt, so only the prompt is stored
+   as the user's turn.
+
+Agents without DuckDuckGo tools (and `enabled=False`) fall back to
+`render_with_fast_path()`.
+"""
+
+import functools
+import json
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+import streamlit as st
+
+from agno_shared.compaction import shorten, url_key
+from agno_shared.concurrency import iter_parallel
+from agno_shared.fast_path import (
+    PathLatency,
+    agent_toolkit,
+    context_kwargs,
+    get_default_latency,
+    plan_tool_calls,
+    render_with_fast_path,
+    synthesis_agent,
+)
+from agno_shared.query import normalize_query
+from agno_shared.streaming import render_agent_response
+from agno_shared.tracing import span
+
+MAX_QUERIES: int = int(os.getenv("RESEARCH_MAX_QUERIES", "4"))
+MAX_SOURCES: int = int(os.getenv("RESEARCH_MAX_SOURCES", "6"))
+RESULTS_PER_QUERY: int = 5
+# Reciprocal rank fusion constant; larger values flatten the rank differences
+RRF_K: int = 60
+# Added to the question's key terms to make the sub-queries
+RESEARCH_FACETS = ("research evidence", "systematic review meta-analysis", "guidelines recommendations")
+
+
+class Source(NamedTuple):
+    url: str
+    title: str
+    snippet: str
+    details: str
+    score: float
+
+
+def expand_query(query: str, max_queries: int = MAX_QUERIES) -> List[str]:
+    """`query` and its sub-queries, without two that normalise alike."""
+    terms = normalize_query(query)
+    queries: Dict[str, str] = {}
+    for candidate in [query] + [f"{terms} {facet}" for facet in RESEARCH_FACETS]:
+        queries.setdefault(normalize_query(candidate), candidate)
+    return list(queries.values())[:max_queries]
+
+
+def fuse(ranked_lists: List[List[dict]], limit: int = MAX_SOURCES, k: int = RRF_K) -> List[Source]:
+    """The results of all lists, one per URL, best fused rank first."""
+    scores: Dict[str, float] = {}
+    items: Dict[str, dict] = {}
+    for results in ranked_lists:
+        for rank, item in enumerate(results, 1):
+            url = item.get("href") or item.get("url") or ""
+            if not url:
+                continue
+            key = url_key(url)
+            scores[key] = scores.get(key, 0.0) + 1 / (k + rank)
+            items.setdefault(key, item)
+    # Stable sort: equal scores keep the order they were first found in
+    best = sorted(scores, key=lambda key: -scores[key])[:limit]
+    return [
+        Source(
+            url=items[key].get("href") or items[key].get("url"),
+            title=items[key].get("title", ""),
+            snippet=shorten(items[key].get("body")),
+            details=", ".join(
+                part for part in (items[key].get("source"), str(items[key].get("date") or "")[:10]) if part
+            ),
+            score=scores[key],
+        )
+        for key in best
+    ]
+
+
+def gather_sources(search, queries: List[str], news_query: str = "") -> List[Source]:
+    """Web results for every query and news for `news_query`, fetched at once and fused."""
+    tasks = {
+        f"search {query}": functools.partial(search.duckduckgo_search, query=query, max_results=RESULTS_PER_QUERY)
+        for query in queries
+    }
+    if news_query and "duckduckgo_news" in search.functions:
+        tasks[f"news {news_query}"] = functools.partial(
+            search.duckduckgo_news, query=news_query, max_results=RESULTS_PER_QUERY
+        )
+    results: Dict[str, List[dict]] = {}
+    with span("research fetch", "internal", queries=len(tasks)) as s:
+        for name, future in iter_parallel(tasks, len(tasks)):
+            try:
+                items = json.loads(future.result())
+            except Exception:
+                # A failed or unparsable search just contributes nothing
+                continue
+            if isinstance(items, list):
+                results[name] = [item for item in items if isinstance(item, dict)]
+        sources = fuse([results[name] for name in tasks if name in results])
+        if s is not None:
+            s.set(results=sum(len(items) for items in results.values()), sources=len(sources))
+    return sources
+
+
+def research_context(sources: List[Source]) -> str:
+    listed = "\n\n".join(
+        f"[{i}] {source.title}{f' ({source.details})' if source.details else ''} <{source.url}>\n{source.snippet}"
+        for i, source in enumerate(sources, 1)
+    )
+    return (
+        "The searches have already been done for you. Answer the question above using only "
+        f"these numbered sources and do not call any tools:\n\n{listed}\n\n"
+        "Cite the source of every claim by its number in square brackets, like [1] or [2][3]. "
+        "Say so when the sources do not cover part of the question. End with a \"Sources\" "
+        "list of the numbers you cited, with their titles and URLs."
+    )
+
+
+def render_research(
+    agent,
+    query: str,
+    prompt: str,
+    enabled: bool = True,
+    latency: Optional[PathLatency] = None,
+    **kwargs,
+) -> str:
+    """Research `query`, render the cited answer to `prompt` and return its text.
+
+    `kwargs` go to `render_agent_response()` (streaming, response cache).
+    """
+    latency = latency or get_default_latency()
+    search = agent_toolkit(agent, "agno.tools.duckduckgo", "DuckDuckGoTools") if enabled else None
+    if search is None:
+        return render_with_fast_path(
+            agent, prompt, calls=plan_tool_calls(agent, query), enabled=enabled, latency=latency, **kwargs
+        )
+
+    start = time.perf_counter()
+    queries = expand_query(query)
+    with st.spinner("Searching..."):
+        sources = gather_sources(search, queries, news_query=query)
+    if not sources:
+        return render_with_fast_path(agent, prompt, calls=[], enabled=False, latency=latency, **kwargs)
+
+    news = " and news" if "duckduckgo_news" in search.functions else ""
+    st.caption(f"🔎 {len(sources)} sources from " + ", ".join(f"`{q}`" for q in queries) + news)
+    content = render_agent_response(
+        synthesis_agent(agent), prompt, **context_kwargs(research_context(sources), kwargs)
+    )
+    with st.expander(f"📚 Sources ({len(sources)})"):
+        st.markdown(
+            "\n".join(f"{i}. [{source.title or source.url}]({source.url})" for i, source in enumerate(sources, 1))
+        )
+    latency.record(f"{agent.agent_id}:research", time.perf_counter() - start)
+    return content
@@ -0,0 +1,207 @@
+"""On-disk, content-addressed cache for deterministic agent prompts.
+
+Entries are keyed by (model id, instructions hash, tool set, prompt) and live
+in a small SQLite database under `tmp/`, next to the agent storage. Expired
+entries are dropped on read, and the cache is trimmed back to `max_entries`
+and `max_bytes` by evicting the least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from typing import Iterator, Optional
+
+from agno.run.response import RunResponse
+
+from agno_shared.concurrency import isolated_run
+from agno_shared.tracing import span
+
+DEFAULT_CACHE_FILE: str = "tmp/response_cache.db"
+DEFAULT_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL", str(24 * 60 * 60)))
+DEFAULT_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "500"))
+DEFAULT_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+
+def tool_names(agent) -> list:
+    names = []
+    for tool in agent.tools or []:
+        functions = getattr(tool, "functions", None)
+        if functions is not None:
+            names.extend(f"{tool.name}.{name}" for name in functions)
+        else:
+            names.append(getattr(tool, "name", None) or getattr(tool, "__name__", str(tool)))
+    return sorted(names)
+
+
+def _instructions_hash(agent) -> str:
+    instructions = agent.instructions
+    if callable(instructions):
+        instructions = getattr(instructions, "__qualname__", repr(instructions))
+    parts = [
+        agent.name,
+        agent.role,
+        agent.description,
+        instructions,
+        agent.expected_output,
+        agent.markdown,
+    ]
+    return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        db_file: str = DEFAULT_CACHE_FILE,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.db_file = db_file
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits (or rolls back) and is closed on exit."""
+        with closing(sqlite3.connect(self.db_file, timeout=30)) as conn, conn:
+            yield conn
+
+    def key(self, agent, prompt: str, context: str = "") -> str:
+        """Content address of `prompt` sent to `agent`.
+
+        `context` covers anything else the answer depends on, such as the
+        previous turns of a conversation.
+        """
+        parts = [
+            getattr(agent.model, "id", None),
+            _instructions_hash(agent),
+            tool_names(agent),
+            prompt,
+            context,
+        ]
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, content: str) -> None:
+        if not content:
+            return
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, content, len(content.encode()), now, now),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Drop least recently used entries until both bounds hold again
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access"
+        ).fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._lock, self._connect() as conn:
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": count, "bytes": total}
+
+
+def cached_run(
+    agent,
+    prompt: str,
+    cache: Optional[ResponseCache] = None,
+    bypass: bool = False,
+    context: str = "",
+    isolated: bool = False,
+    **kwargs,
+):
+    """`agent.run(prompt)` that reads through and writes to `cache`.
+
+    A cache hit returns a RunResponse with just the cached content. With
+    `isolated=True` a miss runs on a private copy of the agent (see
+    `agno_shared.concurrency.isolated_run`), for use from worker threads.
+    """
+    kwargs.setdefault("stream", False)
+
+    def run():
+        if isolated:
+            return isolated_run(agent, prompt, **kwargs)
+        with span(f"agent {agent.agent_id}", "agent"):
+            return agent.run(prompt, **kwargs)
+
+    if cache is None:
+        return run()
+
+    key = cache.key(agent, prompt, context)
+    if not bypass:
+        with span("response cache lookup", "cache") as lookup:
+            content = cache.get(key)
+            if lookup is not None:
+                lookup.set(hit=content is not None)
+        if content is not None:
+            return RunResponse(content=content, agent_id=agent.agent_id)
+
+    response = run()
+    if isinstance(getattr(response, "content", None), str):
+        cache.put(key, response.content)
+    return response
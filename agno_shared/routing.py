@@ -0,0 +1,69 @@
+"""Model routing for the fitness app.
+
+Every request used to go to the model picked in the sidebar, whether it was
+a multi-section plan or "list three video URLs". `ModelRouter` decides per
+(tab, step). Short, structured and tool-lookup steps go to a small fast
+model (`ROUTER_SMALL_MODEL`, default `llama3.2:3b`), and long-form writing
+goes to the chosen model. Steps that rely on tool calls fall back to the
+small model when the chosen one can't call tools.
+
+Policies are {tab: {step: "small" | "chosen"}}. `MODEL_ROUTING_POLICY` can
+override any of them with JSON, e.g. `{"plan": {"videos": "chosen"}}`.
+"""
+
+import json
+import os
+from typing import Dict, Optional, Set
+
+SMALL_MODEL: str = os.getenv("ROUTER_SMALL_MODEL", "llama3.2:3b")
+# Model families that handle Ollama tool calls reliably
+TOOL_CAPABLE_FAMILIES = ("llama", "qwen")
+
+DEFAULT_POLICIES: Dict[str, Dict[str, str]] = {
+    "plan": {"dietary": "chosen", "fitness": "chosen", "videos": "small"},
+    "plan_qa": {"answer": "chosen"},
+    "chat": {"answer": "chosen"},
+    "research": {"answer": "chosen"},
+    "video_resources": {"search": "small"},
+    "video_analysis": {"analysis": "chosen"},
+}
+
+# Steps that only work if the model can call tools
+TOOL_STEPS = {("video_analysis", "analysis")}
+
+
+def load_policies() -> Dict[str, Dict[str, str]]:
+    policies = {tab: dict(steps) for tab, steps in DEFAULT_POLICIES.items()}
+    for tab, steps in json.loads(os.getenv("MODEL_ROUTING_POLICY", "{}")).items():
+        policies.setdefault(tab, {}).update(steps)
+    return policies
+
+
+def supports_tools(model: str) -> bool:
+    return any(family in model for family in TOOL_CAPABLE_FAMILIES)
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        chosen_model: str,
+        small_model: str = SMALL_MODEL,
+        policies: Optional[Dict[str, Dict[str, str]]] = None,
+        enabled: bool = True,
+    ):
+        self.chosen_model = chosen_model
+        self.small_model = small_model
+        self.policies = policies if policies is not None else load_policies()
+        self.enabled = enabled
+
+    def model_for(self, tab: str, step: str) -> str:
+        """The model to run `step` of `tab` on."""
+        target = self.policies.get(tab, {}).get(step, "chosen") if self.enabled else "chosen"
+        model = self.small_model if target == "small" else self.chosen_model
+        if (tab, step) in TOOL_STEPS and not supports_tools(model):
+            model = self.small_model
+        return model
+
+    def models(self) -> Set[str]:
+        """Every model some step is routed to."""
+        return {self.model_for(tab, step) for tab, steps in self.policies.items() for step in steps}
@@ -0,0 +1,144 @@
+"""Deduplicated, TTL-bounded cache for DuckDuckGo searches.
+
+Queries are normalised (case, punctuation, whitespace and stopwords), so
+"What is the best protein intake?" and "best protein intake" share one entry.
+News results expire quickly, general search results last longer. Identical
+searches that are already in flight are collapsed into a single request
+(single-flight), which keeps concurrent sessions under DuckDuckGo's rate
+limits.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+from agno.tools.duckduckgo import DuckDuckGoTools
+
+from agno_shared.compaction import compact_tool_calls
+from agno_shared.query import normalize_query
+from agno_shared.shared import SharedOnCopy, lazy_singleton
+from agno_shared.tracing import span, trace_tool_calls
+
+SEARCH_TTL_SECONDS: int = int(os.getenv("SEARCH_CACHE_TTL", str(6 * 60 * 60)))
+NEWS_TTL_SECONDS: int = int(os.getenv("SEARCH_CACHE_NEWS_TTL", str(15 * 60)))
+DEFAULT_MAX_ENTRIES: int = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000"))
+
+
+class SearchCache(SharedOnCopy):
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0
+        self._entries: "OrderedDict[Tuple, Tuple[float, str]]" = OrderedDict()
+        self._in_flight: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, key: Tuple, ttl_seconds: int, fetch: Callable[[], str]) -> str:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            future = self._in_flight.get(key)
+            if future is not None:
+                # Someone is already running this search; wait for their result
+                self.collapsed += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            with span(f"fetch {key[0]}", "http", cache_key=repr(key)):
+                result = fetch()
+        except Exception as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = (time.time() + ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            del self._in_flight[key]
+        future.set_result(result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "collapsed": self.collapsed,
+                "entries": len(self._entries),
+            }
+
+
+@lazy_singleton
+def get_default_cache() -> SearchCache:
+    """Process-wide cache shared by every CachedDuckDuckGoTools instance."""
+    return SearchCache()
+
+
+class CachedDuckDuckGoTools(DuckDuckGoTools):
+    def __init__(
+        self,
+        cache: Optional[SearchCache] = None,
+        search_ttl: int = SEARCH_TTL_SECONDS,
+        news_ttl: int = NEWS_TTL_SECONDS,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.cache: SearchCache = cache or get_default_cache()
+        self.search_ttl = search_ttl
+        self.news_ttl = news_ttl
+        # Model-initiated calls are traced and their results compacted
+        compact_tool_calls(trace_tool_calls(self))
+
+    def duckduckgo_search(self, query: str, max_results: int = 5) -> str:
+        """Use this function to search DuckDuckGo for a query.
+
+        Args:
+            query(str): The query to search for.
+            max_results (optional, default=5): The maximum number of results to return.
+
+        Returns:
+            The result from DuckDuckGo.
+        """
+        max_results = self.fixed_max_results or max_results
+        key = ("search", self.modifier, normalize_query(query), max_results)
+        return self.cache.get_or_fetch(
+            key,
+            self.search_ttl,
+            lambda: DuckDuckGoTools.duckduckgo_search(self, query, max_results),
+        )
+
+    def duckduckgo_news(self, query: str, max_results: int = 5) -> str:
+        """Use this function to get the latest news from DuckDuckGo.
+
+        Args:
+            query(str): The query to search for.
+            max_results (optional, default=5): The maximum number of results to return.
+
+        Returns:
+            The latest news from DuckDuckGo.
+        """
+        max_results = self.fixed_max_results or max_results
+        key = ("news", normalize_query(query), max_results)
+        return self.cache.get_or_fetch(
+            key,
+            self.news_ttl,
+            lambda: DuckDuckGoTools.duckduckgo_news(self, query, max_results),
+        )
@@ -0,0 +1,294 @@
+"""Multi-user agent service for both Streamlit apps.
+
+Run from the repository root:
+
+    uvicorn agno_shared.service:app --host 0.0.0.0 --port 8000 --workers 4
+
+and point the apps at it with `AGENT_SERVICE_URL=http://localhost:8000`.
+
+Each worker process keeps a pool of Agent instances per (agent_id, model).
+A request checks an instance out, binds it to the request's session_id, and
+returns it when the run is done. Sessions therefore never share run state,
+and agents with storage reload their own history. Runs pass through a
+bounded queue. At most `AGENT_SERVICE_MAX_CONCURRENCY` execute at once, at
+most `AGENT_SERVICE_MAX_QUEUE` wait, and further requests get
+`429 Too Many Requests` with a `Retry-After` header.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import anyio
+from agno.agent import Agent
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+# The app packages (Agno_Agents/, Agno_fitness_Agent/) live in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agno_shared.agent_pool import bind_session, clone_for_session  # noqa: E402
+from agno_shared.concurrency import DEFAULT_MAX_CONCURRENCY  # noqa: E402
+from agno_shared.history import TokenBudgetMemory, history_budget  # noqa: E402
+from agno_shared.response_cache import tool_names  # noqa: E402
+from agno_shared.routing import ModelRouter  # noqa: E402
+from agno_shared.warmup import ollama_model  # noqa: E402
+
+MAX_CONCURRENCY: int = int(os.getenv("AGENT_SERVICE_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY)))
+MAX_QUEUE: int = int(os.getenv("AGENT_SERVICE_MAX_QUEUE", "32"))
+POOL_SIZE: int = int(os.getenv("AGENT_POOL_SIZE", "4"))
+RETRY_AFTER_SECONDS: int = 5
+
+
+def _agents_app_builder(agent_id: str) -> Callable[[Optional[str]], Agent]:
+    def build(model: Optional[str]) -> Agent:
+        from Agno_Agents.agents import AGENT_BUILDERS
+
+        os.makedirs("tmp", exist_ok=True)
+        agent = AGENT_BUILDERS[agent_id]()
+        if model:
+            agent.model = ollama_model(model)
+            if isinstance(agent.memory, TokenBudgetMemory):
+                agent.memory.token_budget = history_budget(model)
+        return agent
+
+    return build
+
+
+def _fitness_app_builder(agent_id: str) -> Callable[[Optional[str]], Agent]:
+    def build(model: Optional[str]) -> Agent:
+        from Agno_fitness_Agent.agents import AGENT_BUILDERS, DEFAULT_MODEL
+
+        model = model or DEFAULT_MODEL
+        if agent_id == "youtube-fitness-analyst":
+            # Video analysis needs tool calls; the router swaps in a model that can make them
+            model = ModelRouter(model).model_for("video_analysis", "analysis")
+        return AGENT_BUILDERS[agent_id](model)
+
+    return build
+
+
+# Agent builders, keyed by agent_id. Each takes an optional model override.
+REGISTRY: Dict[str, Callable[[Optional[str]], Agent]] = {
+    "web-agent": _agents_app_builder("web-agent"),
+    "finance-agent": _agents_app_builder("finance-agent"),
+    "youtube-agent": _agents_app_builder("youtube-agent"),
+    "smart-fitness-assistant": _fitness_app_builder("smart-fitness-assistant"),
+    "youtube-fitness-analyst": _fitness_app_builder("youtube-fitness-analyst"),
+}
+
+
+class AgentPool:
+    """Idle Agent instances for one (agent_id, model)."""
+
+    def __init__(self, build: Callable[[], Agent], max_idle: int = POOL_SIZE):
+        self.build = build
+        self.max_idle = max_idle
+        self.created = 0
+        self._template: Optional[Agent] = None
+        self._idle: List[Agent] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, session_id: str) -> Agent:
+        with self._lock:
+            agent = self._idle.pop() if self._idle else None
+        if agent is None:
+            # Instances are clones of one built agent, sharing its model client and tools
+            with self._lock:
+                if self._template is None:
+                    self._template = self.build()
+                self.created += 1
+                return clone_for_session(self._template, session_id)
+        return bind_session(agent, session_id)
+
+    def release(self, agent: Agent) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(agent)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"idle": len(self._idle), "created": self.created}
+
+
+class RunQueue:
+    """Bounded admission for agent runs, with backpressure."""
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, max_queue: int = MAX_QUEUE):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    def check(self) -> None:
+        """Reject the run with 429 if every slot is busy and the queue is full."""
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            raise HTTPException(
+                status_code=429,
+                detail="Agent service is at capacity, please retry shortly",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+
+    @asynccontextmanager
+    async def slot(self, check: bool = True) -> AsyncIterator[None]:
+        """Hold a run slot, waiting in the queue for one first.
+
+        The slot is released on exit, however the run ends. `check=False` is
+        for runs already admitted by `check()`.
+        """
+        if check:
+            self.check()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+
+class RunRequest(BaseModel):
+    prompt: str
+    session_id: str
+    model: Optional[str] = None
+    stream: bool = False
+
+
+app = FastAPI(title="Agno agent service")
+run_queue = RunQueue()
+_pools: Dict[Tuple[str, Optional[str]], AgentPool] = {}
+_pools_lock = threading.Lock()
+_agent_info: Dict[Tuple[str, Optional[str]], dict] = {}
+# One lock per active session, so turns of a conversation never interleave
+_session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def get_pool(agent_id: str, model: Optional[str]) -> AgentPool:
+    if agent_id not in REGISTRY:
+        raise HTTPException(status_code=404, detail=f"Unknown agent: {agent_id}")
+    with _pools_lock:
+        key = (agent_id, model)
+        if key not in _pools:
+            _pools[key] = AgentPool(lambda: REGISTRY[agent_id](model))
+        return _pools[key]
+
+
+def session_lock(session_id: str) -> asyncio.Lock:
+    lock = _session_locks.get(session_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _session_locks[session_id] = lock
+    return lock
+
+
+def agent_info(agent_id: str, model: Optional[str]) -> dict:
+    key = (agent_id, model)
+    if key not in _agent_info:
+        pool = get_pool(agent_id, model)
+        agent = pool.acquire("info")
+        try:
+            instructions = agent.instructions
+            _agent_info[key] = {
+                "agent_id": agent_id,
+                "name": agent.name,
+                "role": agent.role,
+                "description": agent.description,
+                "instructions": instructions if not callable(instructions) else None,
+                "expected_output": agent.expected_output,
+                "markdown": agent.markdown,
+                "tools": tool_names(agent),
+                "model": agent.model.id if agent.model is not None else None,
+            }
+        finally:
+            pool.release(agent)
+    return _agent_info[key]
+
+
+@app.get("/health")
+def health():
+    with _pools_lock:
+        pools = {f"{agent_id}:{model or 'default'}": pool.stats() for (agent_id, model), pool in _pools.items()}
+    return {"status": "ok", "queue": run_queue.stats(), "pools": pools}
+
+
+@app.get("/v1/agents")
+def list_agents():
+    return {"agents": list(REGISTRY)}
+
+
+@app.get("/v1/agents/{agent_id}")
+def get_agent(agent_id: str, model: Optional[str] = None):
+    return agent_info(agent_id, model)
+
+
+@app.post("/v1/agents/{agent_id}/runs")
+async def create_run(agent_id: str, request: RunRequest):
+    pool = get_pool(agent_id, request.model)
+    # Full queues get their 429 now, before a streaming response has started
+    run_queue.check()
+
+    if request.stream:
+        return StreamingResponse(_stream_run(pool, request), media_type="application/x-ndjson")
+
+    # The session lock comes first: a turn waiting for an earlier turn of its
+    # conversation must not hold a slot another session could run in
+    async with session_lock(request.session_id), run_queue.slot(check=False):
+        # A cold acquire builds and copies the agent, which must not block the event loop
+        agent = await run_in_threadpool(pool.acquire, request.session_id)
+        try:
+            response = await run_in_threadpool(agent.run, request.prompt, stream=False)
+        finally:
+            pool.release(agent)
+
+    content = response.content
+    return {
+        "content": content if isinstance(content, str) else json.dumps(content, default=str),
+        "run_id": response.run_id,
+        "session_id": request.session_id,
+        "model": response.model,
+        "metrics": response.metrics,
+    }
+
+
+async def _stream_run(pool: AgentPool, request: RunRequest):
+    # The slot is taken here, not in create_run(), so a response that is never
+    # iterated (the client went away) never holds one
+    async with session_lock(request.session_id), run_queue.slot(check=False):
+        agent = await run_in_threadpool(pool.acquire, request.session_id)
+        chunks = agent.run(request.prompt, stream=True, stream_intermediate_steps=True)
+        step: Optional[asyncio.Future] = None
+        try:
+            while True:
+                step = asyncio.ensure_future(run_in_threadpool(next, chunks, None))
+                chunk = await asyncio.shield(step)
+                if chunk is None:
+                    break
+                content = chunk.content if isinstance(chunk.content, str) else None
+                yield json.dumps({"event": chunk.event, "content": content}) + "\n"
+        finally:
+            # After a client disconnect, let the step in progress finish and close the
+            # run, so the agent is idle before another request can check it out
+            with anyio.CancelScope(shield=True):
+                if step is not None:
+                    await asyncio.wait([step])
+                await run_in_threadpool(chunks.close)
+            pool.release(agent)
@@ -0,0 +1,128 @@
+"""Thin client for the agent service (see `agno_shared.service`).
+
+`RemoteAgent` mirrors the small part of `agno.agent.Agent` the Streamlit apps
+use (`run`, `run_response`, `deep_copy` and the identity fields used for
+cache keys), so the apps can switch to the service by setting
+`AGENT_SERVICE_URL` without touching their rendering code.
+"""
+
+import json
+import os
+from types import SimpleNamespace
+from typing import Dict, Iterator, Optional
+from uuid import uuid4
+
+import httpx
+from agno.run.response import RunEvent, RunResponse
+
+AGENT_SERVICE_URL: Optional[str] = os.getenv("AGENT_SERVICE_URL")
+
+# Generation can take minutes on CPU-only hosts, so only bound the connect step
+DEFAULT_TIMEOUT = httpx.Timeout(None, connect=10.0)
+
+
+class AgentServiceBusy(Exception):
+    """The service queue is full; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Agent service is busy, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class RemoteAgent:
+    def __init__(
+        self,
+        base_url: str,
+        info: Dict,
+        session_id: Optional[str] = None,
+        client: Optional[httpx.Client] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.info = info
+        self.session_id = session_id or str(uuid4())
+        self.client = client or httpx.Client(timeout=DEFAULT_TIMEOUT)
+        self.run_response: Optional[RunResponse] = None
+
+        # Identity fields, matching agno.agent.Agent
+        self.agent_id: str = info["agent_id"]
+        self.name: Optional[str] = info.get("name")
+        self.role: Optional[str] = info.get("role")
+        self.description: Optional[str] = info.get("description")
+        self.instructions = info.get("instructions")
+        self.expected_output: Optional[str] = info.get("expected_output")
+        self.markdown: bool = info.get("markdown", False)
+        self.tools = info.get("tools", [])
+        self.model = SimpleNamespace(id=info.get("model"))
+
+    @classmethod
+    def connect(cls, base_url: str, agent_id: str, model: Optional[str] = None) -> "RemoteAgent":
+        client = httpx.Client(timeout=DEFAULT_TIMEOUT)
+        params = {"model": model} if model else {}
+        response = client.get(f"{base_url.rstrip('/')}/v1/agents/{agent_id}", params=params)
+        response.raise_for_status()
+        return cls(base_url, response.json(), client=client)
+
+    def for_session(self, session_id: str) -> "RemoteAgent":
+        """Same agent, bound to another conversation."""
+        return RemoteAgent(self.base_url, self.info, session_id=session_id, client=self.client)
+
+    def deep_copy(self, **_) -> "RemoteAgent":
+        return self.for_session(self.session_id)
+
+    def _payload(self, prompt: str, stream: bool) -> Dict:
+        return {
+            "prompt": prompt,
+            "session_id": self.session_id,
+            "model": self.info.get("model"),
+            "stream": stream,
+        }
+
+    def _raise_for_status(self, response: httpx.Response) -> None:
+        if response.status_code == 429:
+            raise AgentServiceBusy(float(response.headers.get("Retry-After", 1)))
+        response.raise_for_status()
+
+    def run(self, prompt: str, stream: Optional[bool] = False, stream_intermediate_steps: bool = False, **_):
+        if stream:
+            return self._stream(prompt, stream_intermediate_steps)
+
+        response = self.client.post(
+            f"{self.base_url}/v1/agents/{self.agent_id}/runs", json=self._payload(prompt, False)
+        )
+        self._raise_for_status(response)
+        data = response.json()
+        self.run_response = RunResponse(
+            content=data.get("content"),
+            agent_id=self.agent_id,
+            session_id=self.session_id,
+            run_id=data.get("run_id"),
+            model=data.get("model"),
+            metrics=data.get("metrics"),
+        )
+        return self.run_response
+
+    def _stream(self, prompt: str, stream_intermediate_steps: bool) -> Iterator[RunResponse]:
+        content = ""
+        with self.client.stream(
+            "POST",
+            f"{self.base_url}/v1/agents/{self.agent_id}/runs",
+            json=self._payload(prompt, True),
+        ) as response:
+            self._raise_for_status(response)
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event["event"] == RunEvent.run_response.value:
+                    content += event.get("content") or ""
+                elif not stream_intermediate_steps:
+                    continue
+                yield RunResponse(
+                    content=event.get("content"),
+                    event=event["event"],
+                    agent_id=self.agent_id,
+                    session_id=self.session_id,
+                )
+        self.run_response = RunResponse(
+            content=content, agent_id=self.agent_id, session_id=self.session_id
+        )
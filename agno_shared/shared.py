@@ -0,0 +1,39 @@
+"""Process-wide objects shared by the apps, the agent copies and the service.
+
+`lazy_singleton` turns a factory into an accessor that builds one instance
+on first use, under a lock, and returns it to every caller after that.
+
+`SharedOnCopy` is a mixin for objects that every copy of an agent must
+keep sharing, such as caches and storage engines. `Agent.deep_copy()`
+deep-copies an agent's tools and storage, and for these the "copy" is the
+object itself.
+"""
+
+import functools
+import threading
+from typing import Callable, List, TypeVar
+
+T = TypeVar("T")
+
+
+def lazy_singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """An accessor for the one instance `factory()` builds, on first call."""
+    lock = threading.Lock()
+    instance: List[T] = []
+
+    @functools.wraps(factory)
+    def get() -> T:
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    return get
+
+
+class SharedOnCopy:
+    """Deep copies of these objects are the objects themselves."""
+
+    def __deepcopy__(self, memo):
+        return self
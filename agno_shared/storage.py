@@ -0,0 +1,225 @@
+"""Tuned SQLite storage for agent sessions.
+
+Several `SqliteAgentStorage` tables pointing at one file each open their own
+engine, use SQLite's default rollback journal and commit every upsert with a
+full fsync. Under concurrent sessions that serializes writers and surfaces
+"database is locked". `agent_storage()` returns a storage that instead
+
+* shares one pooled engine per database file, with WAL enabled, `synchronous`
+  set to `AGENT_STORAGE_SYNCHRONOUS` (default NORMAL) and a busy timeout,
+* queues the session upsert at the end of a run and writes queued sessions
+  in one transaction every `AGENT_STORAGE_BATCH_MS` milliseconds (latest
+  write per session wins, reads see queued sessions; 0 writes through), and
+* deletes sessions not updated for `AGENT_STORAGE_MAX_AGE_DAYS` days every
+  `AGENT_STORAGE_COMPACT_INTERVAL` seconds, then checkpoints the WAL.
+
+Set `AGENT_STORAGE_MODE=plain` to use agno's stock storage instead.
+"""
+
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from agno.storage.agent.sqlite import SqliteAgentStorage
+from agno.storage.session import Session
+from agno.utils.log import logger
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import sessionmaker
+
+from agno_shared.shared import SharedOnCopy
+from agno_shared.tracing import span
+
+STORAGE_MODE: str = os.getenv("AGENT_STORAGE_MODE", "tuned")
+SYNCHRONOUS: str = os.getenv("AGENT_STORAGE_SYNCHRONOUS", "NORMAL")
+POOL_SIZE: int = int(os.getenv("AGENT_STORAGE_POOL_SIZE", "8"))
+BATCH_MS: int = int(os.getenv("AGENT_STORAGE_BATCH_MS", "20"))
+MAX_AGE_DAYS: float = float(os.getenv("AGENT_STORAGE_MAX_AGE_DAYS", "30"))
+COMPACT_INTERVAL: int = int(os.getenv("AGENT_STORAGE_COMPACT_INTERVAL", str(6 * 60 * 60)))
+
+
+class SqliteDatabase:
+    """One pooled WAL engine per database file, with a batched session writer."""
+
+    def __init__(self, db_file: str):
+        db_path = Path(db_file).resolve()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.engine: Engine = create_engine(
+            f"sqlite:///{db_path}",
+            pool_size=POOL_SIZE,
+            max_overflow=POOL_SIZE,
+            connect_args={"timeout": 30, "check_same_thread": False},
+        )
+        event.listen(self.engine, "connect", self._configure_connection)
+
+        self.storages: Dict[str, "TunedSqliteAgentStorage"] = {}
+        self._pending: Dict[Tuple[str, str], Session] = {}
+        # The batch being written, still served to readers until it commits
+        self._writing: Dict[Tuple[str, str], Session] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        threading.Thread(target=self._write_loop, name="agent-storage-writer", daemon=True).start()
+        threading.Thread(target=self._compact_loop, name="agent-storage-compaction", daemon=True).start()
+
+    @staticmethod
+    def _configure_connection(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+        cursor.execute("PRAGMA busy_timeout=30000")
+        cursor.close()
+
+    def queue(self, storage: "TunedSqliteAgentStorage", session: Session) -> None:
+        with self._pending_lock:
+            self._pending[(storage.table_name, session.session_id)] = session
+        self._wake.set()
+
+    def pending(self, table_name: str, session_id: str) -> Optional[Session]:
+        key = (table_name, session_id)
+        with self._pending_lock:
+            return self._pending.get(key) or self._writing.get(key)
+
+    def flush(self) -> None:
+        """Write every queued session in one transaction."""
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+                self._writing = batch
+            if not batch:
+                return
+            try:
+                with self.engine.begin() as connection:
+                    for (table_name, _), session in batch.items():
+                        connection.execute(self.storages[table_name].upsert_statement(session))
+            except Exception as e:
+                logger.error(f"Error writing {len(batch)} agent sessions: {e}")
+                # Keep the sessions for the next flush unless they were written again since
+                with self._pending_lock:
+                    self._pending = {**batch, **self._pending}
+            finally:
+                with self._pending_lock:
+                    self._writing = {}
+
+    def _write_loop(self) -> None:
+        while True:
+            self._wake.wait()
+            time.sleep(BATCH_MS / 1000)
+            self._wake.clear()
+            self.flush()
+
+    def compact(self, max_age_days: float = MAX_AGE_DAYS) -> int:
+        """Delete sessions not updated for `max_age_days` days. Returns the number deleted."""
+        self.flush()
+        cutoff = int(time.time() - max_age_days * 24 * 60 * 60)
+        deleted = 0
+        with self.engine.begin() as connection:
+            for storage in list(self.storages.values()):
+                table = storage.table
+                never_updated = table.c.updated_at.is_(None) & (table.c.created_at < cutoff)
+                stale = (table.c.updated_at < cutoff) | never_updated
+                result = connection.execute(table.delete().where(stale))
+                deleted += result.rowcount
+        with self.engine.connect() as connection:
+            connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        return deleted
+
+    def _compact_loop(self) -> None:
+        while True:
+            time.sleep(COMPACT_INTERVAL)
+            try:
+                deleted = self.compact()
+                if deleted:
+                    logger.info(f"Compacted {deleted} old agent sessions")
+            except Exception as e:
+                logger.error(f"Error compacting agent sessions: {e}")
+
+
+class TunedSqliteAgentStorage(SharedOnCopy, SqliteAgentStorage):
+    """`SqliteAgentStorage` on a shared `SqliteDatabase`, with batched upserts."""
+
+    def __init__(self, table_name: str, database: SqliteDatabase, batch_writes: bool = BATCH_MS > 0):
+        self.database = database
+        self.batch_writes = batch_writes
+        super().__init__(table_name=table_name, db_engine=database.engine)
+        # agno 1.2 replaces a passed-in engine with an in-memory one, so set it here
+        self.db_engine = database.engine
+        self.inspector = inspect(database.engine)
+        self.SqlSession = sessionmaker(bind=database.engine)
+        database.storages[table_name] = self
+
+    def upsert_statement(self, session: Session):
+        values = dict(
+            agent_id=session.agent_id,
+            team_session_id=session.team_session_id,
+            user_id=session.user_id,
+            memory=session.memory,
+            agent_data=session.agent_data,
+            session_data=session.session_data,
+            extra_data=session.extra_data,
+        )
+        stmt = sqlite.insert(self.table).values(session_id=session.session_id, **values)
+        return stmt.on_conflict_do_update(
+            index_elements=["session_id"], set_=dict(values, updated_at=int(time.time()))
+        )
+
+    def upsert(self, session: Session, create_and_retry: bool = True) -> Optional[Session]:
+        if self.mode != "agent" or not self.batch_writes:
+            with span(f"storage upsert {self.table_name}", "storage", queued=False):
+                return super().upsert(session, create_and_retry=create_and_retry)
+        with span(f"storage upsert {self.table_name}", "storage", queued=True):
+            self.database.queue(self, session)
+        return session
+
+    def read(self, session_id: str, user_id: Optional[str] = None) -> Optional[Session]:
+        with span(f"storage read {self.table_name}", "storage") as read_span:
+            session = self.database.pending(self.table_name, session_id)
+            if session is not None and (user_id is None or session.user_id == user_id):
+                if read_span is not None:
+                    read_span.set(pending=True)
+                return session
+            return super().read(session_id, user_id=user_id)
+
+    def get_all_session_ids(self, user_id: Optional[str] = None, entity_id: Optional[str] = None) -> List[str]:
+        self.database.flush()
+        return super().get_all_session_ids(user_id=user_id, entity_id=entity_id)
+
+    def get_all_sessions(self, user_id: Optional[str] = None, entity_id: Optional[str] = None) -> List[Session]:
+        self.database.flush()
+        return super().get_all_sessions(user_id=user_id, entity_id=entity_id)
+
+    def delete_session(self, session_id: Optional[str] = None):
+        self.database.flush()
+        return super().delete_session(session_id)
+
+
+_databases: Dict[str, SqliteDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_file: str) -> SqliteDatabase:
+    key = str(Path(db_file).resolve())
+    with _databases_lock:
+        if key not in _databases:
+            _databases[key] = SqliteDatabase(db_file)
+        return _databases[key]
+
+
+def agent_storage(table_name: str, db_file: str) -> SqliteAgentStorage:
+    """Storage for one agent's sessions, tuned unless `AGENT_STORAGE_MODE=plain`."""
+    if STORAGE_MODE == "plain":
+        return SqliteAgentStorage(table_name=table_name, db_file=db_file)
+    storage = TunedSqliteAgentStorage(table_name, get_database(db_file))
+    storage.create()
+    return storage
+
+
+@atexit.register
+def _flush_all() -> None:
+    for database in list(_databases.values()):
+        database.flush()
@@ -0,0 +1,176 @@
+"""Incremental rendering of agent responses in Streamlit."""
+
+import html
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import streamlit as st
+from agno.run.response import RunEvent
+
+from agno_shared.history import token_counts
+from agno_shared.response_cache import ResponseCache
+from agno_shared.tracing import Span, get_tracer, span, trace
+
+
+def response_text(response) -> str:
+    """Return the text content of a RunResponse (or anything else)."""
+    if hasattr(response, "content"):
+        return response.content if isinstance(response.content, str) else str(response.content)
+    return str(response)
+
+
+def stream_agent_response(agent, prompt: str, tool_log=None, **kwargs) -> Iterator[str]:
+    """Yield the content chunks of `agent.run(prompt, stream=True)`.
+
+    Suitable for `st.write_stream`. Tool call events are written to the
+    `tool_log` container (if given) as soon as they happen.
+    """
+    for chunk in agent.run(prompt, stream=True, stream_intermediate_steps=True, **kwargs):
+        if chunk.event == RunEvent.tool_call_started.value:
+            if tool_log is not None:
+                tool_log.caption(f"🔧 Calling `{chunk.content}`")
+        elif chunk.event == RunEvent.tool_call_completed.value:
+            if tool_log is not None:
+                tool_log.caption(f"✅ {chunk.content}")
+        elif chunk.event == RunEvent.run_response.value and isinstance(chunk.content, str):
+            yield chunk.content
+
+
+def format_token_counts(counts: dict) -> str:
+    text = f"🔢 {counts['input_tokens']:,} prompt / {counts.get('output_tokens', 0):,} completion tokens"
+    if "history_tokens" in counts:
+        text += f" · history ~{counts['history_tokens']:,}"
+        if counts["saved_tokens"]:
+            text += f" (~{counts['saved_tokens']:,} trimmed)"
+    return text
+
+
+def render_agent_response(
+    agent,
+    prompt: str,
+    stream: bool = True,
+    spinner_text: str = "Thinking...",
+    cache: Optional[ResponseCache] = None,
+    bypass_cache: bool = False,
+    cache_context: str = "",
+    **kwargs,
+) -> str:
+    """Run `prompt` on `agent`, render the answer and return its full text.
+
+    With `stream=True` tokens are written as they arrive and tool calls are
+    listed above the answer; otherwise the answer is shown once complete.
+    When a `cache` is given, cached answers are shown straight away and new
+    answers are stored in it.
+    """
+    cache_key = cache.key(agent, prompt, cache_context) if cache is not None else None
+    if cache_key is not None and not bypass_cache:
+        with span("response cache lookup", "cache") as lookup:
+            cached = cache.get(cache_key)
+            if lookup is not None:
+                lookup.set(hit=cached is not None)
+        if cached is not None:
+            st.caption("⚡ Served from the response cache")
+            st.markdown(cached)
+            return cached
+
+    with span(f"agent {agent.agent_id}", "agent", stream=stream):
+        if not stream:
+            with st.spinner(spinner_text):
+                content = response_text(agent.run(prompt, stream=False, **kwargs))
+            st.markdown(content)
+        else:
+            tool_log = st.container()
+            streamed: Optional[str] = st.write_stream(
+                stream_agent_response(agent, prompt, tool_log=tool_log, **kwargs)
+            )
+            if isinstance(streamed, str) and streamed:
+                content = streamed
+            else:
+                # Nothing was streamed (e.g. structured output); fall back to the final response
+                content = response_text(agent.run_response)
+                st.markdown(content)
+
+    counts = token_counts(agent)
+    if "input_tokens" in counts:
+        st.caption(format_token_counts(counts))
+
+    if cache_key is not None:
+        cache.put(cache_key, content)
+    return content
+
+
+@contextmanager
+def traced_action(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """Trace one user action and remember it for `render_performance_panel()`."""
+    with trace(name, **attributes) as root:
+        if root is not None:
+            st.session_state.last_trace_id = root.trace_id
+        yield root
+
+
+# Bar colour per span kind
+SPAN_COLORS: Dict[str, str] = {
+    "request": "#6c757d",
+    "agent": "#0d6efd",
+    "model": "#6f42c1",
+    "tool": "#fd7e14",
+    "http": "#d63384",
+    "storage": "#20c997",
+    "cache": "#adb5bd",
+}
+
+
+def span_details(s: Span) -> str:
+    a = s.attributes
+    if s.kind == "model" and "gen_ai.usage.input_tokens" in a:
+        details = f"{a['gen_ai.usage.input_tokens']:,} in / {a['gen_ai.usage.output_tokens']:,} out"
+        if "tokens_per_second" in a:
+            details += f" · {a['tokens_per_second']:.0f} tok/s"
+        phases = [f"{name} {a[f'ollama.{name}_ms'] / 1000:.1f}s" for name in ("load", "prefill", "decode") if f"ollama.{name}_ms" in a]
+        return " · ".join([details] + phases)
+    if "hit" in a:
+        return "hit" if a["hit"] else "miss"
+    return ""
+
+
+def render_waterfall(spans: List[Span]) -> None:
+    """One bar per span, offset from the start of the trace and indented by nesting depth."""
+    root = spans[0]
+    total = max(root.duration_ms, 1e-3)
+    depth = {root.span_id: 0}
+    rows = []
+    for s in sorted(spans, key=lambda s: s.start_ns):
+        level = depth.get(s.span_id, depth.get(s.parent_id, 0) + 1)
+        depth[s.span_id] = level
+        left = (s.start_ns - root.start_ns) / 1e6 / total * 100
+        width = max(s.duration_ms / total * 100, 0.5)
+        details = span_details(s)
+        label = html.escape(s.name) + (" ⚠️" if s.error else "")
+        rows.append(
+            f"""<div style="margin-left:{level * 8}px;font-size:0.75rem;" title="{html.escape(details or s.error or '')}">"""
+            f"""{label} · {s.duration_ms / 1000:.2f}s{f' · {html.escape(details)}' if details else ''}"""
+            f"""<div style="position:relative;height:6px;background:#eee;border-radius:3px;">"""
+            f"""<div style="position:absolute;left:{left:.1f}%;width:{width:.1f}%;height:6px;"""
+            f"""background:{SPAN_COLORS.get(s.kind, '#999')};border-radius:3px;"></div></div></div>"""
+        )
+    st.markdown("".join(rows), unsafe_allow_html=True)
+
+    by_kind: Dict[str, float] = {}
+    for s in spans:
+        # Time spent waiting on the model, the network and the database
+        if s.kind in ("model", "http", "storage"):
+            by_kind[s.kind] = by_kind.get(s.kind, 0.0) + s.duration_ms
+    st.caption(
+        f"Total {total / 1000:.2f}s · "
+        + " · ".join(f"{kind} {ms / 1000:.2f}s" for kind, ms in by_kind.items())
+    )
+
+
+def render_performance_panel() -> None:
+    """Collapsible waterfall of the session's last traced request."""
+    with st.expander("⏱️ Performance"):
+        spans = get_tracer().spans(st.session_state.get("last_trace_id"))
+        if spans:
+            render_waterfall(spans)
+        else:
+            st.caption("No request traced yet in this session")
@@ -0,0 +1,272 @@
+"""Request tracing for the agent apps.
+
+A trace is one user action (a chat turn, a generated plan). The spans in it
+cover:
+
+* model calls (`TracedOllama`, used by `warmup.ollama_model()`), including
+  prompt and completion tokens, decode tokens/s, and Ollama's own split into
+  model load, prefill and decode time;
+* tool calls, both the ones the model makes (the toolkits pass themselves
+  to `trace_tool_calls()`, which wraps each function's entrypoint) and
+  direct calls from the fast path, with the network fetches behind the
+  search and YouTube caches as child spans;
+* agent session reads and writes in `agno_shared.storage`.
+
+Finished traces are appended to `TRACE_FILE` (default `tmp/traces.jsonl`),
+one span per line. The field names follow the OpenTelemetry span model
+(`traceId`, `spanId`, `parentSpanId`, `startTimeUnixNano`, ...), and model
+attributes use the `gen_ai.*` semantic conventions. The last
+`MAX_TRACES` traces are also kept in memory for the apps' Performance
+panel. Spans started outside a trace (e.g. the storage writer thread) are
+not recorded. Set `TRACING=0` to turn tracing off.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import types
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+from agno.models.ollama import Ollama
+from agno.tools.toolkit import Toolkit
+
+from agno_shared.shared import lazy_singleton
+
+TRACING_ENABLED: bool = os.getenv("TRACING", "1") != "0"
+TRACE_FILE: str = os.getenv("TRACE_FILE", "tmp/traces.jsonl")
+MAX_TRACES: int = int(os.getenv("TRACE_MAX_IN_MEMORY", "50"))
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otel(self) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+        }
+
+
+class JsonlExporter:
+    """Appends finished spans to a JSON-lines file."""
+
+    def __init__(self, path: str = TRACE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(span.to_otel(), default=str) + "\n" for span in spans)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(lines)
+
+
+class Tracer:
+    def __init__(self, exporter: Optional[JsonlExporter] = None, max_traces: int = MAX_TRACES, enabled: bool = True):
+        self.exporter = exporter
+        self.max_traces = max_traces
+        self.enabled = enabled
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, name: str, kind: str = "internal", **attributes) -> Optional[Span]:
+        """A child of the current span, or None outside a trace. End it with `end()`."""
+        parent = _current.get()
+        if parent is None or not self.enabled:
+            return None
+        span = Span(name, kind, parent.trace_id, parent.span_id, attributes)
+        with self._lock:
+            self._traces.setdefault(span.trace_id, []).append(span)
+        return span
+
+    def end(self, span: Optional[Span], error: Optional[BaseException] = None) -> None:
+        if span is None or span.end_ns is not None:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes) -> Iterator[Optional[Span]]:
+        """Record a child span around the block; its own children nest under it."""
+        span = self.start(name, kind, **attributes)
+        if span is None:
+            yield None
+            return
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            self.end(span)
+
+    @contextmanager
+    def trace(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Start a new trace around the block and export it when the block ends."""
+        if not self.enabled:
+            yield None
+            return
+        root = Span(name, "request", uuid4().hex, None, attributes)
+        with self._lock:
+            self._traces[root.trace_id] = [root]
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        token = _current.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            if root.end_ns is None:
+                root.end_ns = time.time_ns()
+            if self.exporter is not None:
+                try:
+                    self.exporter.export(self.spans(root.trace_id))
+                except OSError:
+                    pass
+
+    def spans(self, trace_id: Optional[str]) -> List[Span]:
+        with self._lock:
+            return list(self._traces.get(trace_id, []))
+
+
+def bind(fn: Callable) -> Callable:
+    """`fn` with the current span as its parent, for running in another thread."""
+    parent = _current.get()
+
+    def bound(*args, **kwargs):
+        token = _current.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return bound
+
+
+@lazy_singleton
+def get_tracer() -> Tracer:
+    return Tracer(JsonlExporter(), enabled=TRACING_ENABLED)
+
+
+def span(name: str, kind: str = "internal", **attributes):
+    return get_tracer().span(name, kind, **attributes)
+
+
+def trace(name: str, **attributes):
+    return get_tracer().trace(name, **attributes)
+
+
+def _record_usage(span: Optional[Span], response) -> None:
+    """Token counts and Ollama's timing split from a final chat response."""
+    if span is None or response is None:
+        return
+    get = response.get if hasattr(response, "get") else lambda key: getattr(response, key, None)
+    input_tokens, output_tokens = get("prompt_eval_count") or 0, get("eval_count") or 0
+    span.set(**{"gen_ai.usage.input_tokens": input_tokens, "gen_ai.usage.output_tokens": output_tokens})
+    for field, name in (("load_duration", "load"), ("prompt_eval_duration", "prefill"), ("eval_duration", "decode")):
+        if get(field):
+            span.set(**{f"ollama.{name}_ms": get(field) / 1e6})
+    if output_tokens and get("eval_duration"):
+        span.set(tokens_per_second=output_tokens / (get("eval_duration") / 1e9))
+
+
+class TracedOllama(Ollama):
+    """Ollama model that records a span per request."""
+
+    def invoke(self, messages):
+        tracer = get_tracer()
+        with tracer.span(f"model {self.id}", "model", **{"gen_ai.request.model": self.id}) as model_span:
+            response = super().invoke(messages)
+            _record_usage(model_span, response)
+            return response
+
+    def invoke_stream(self, messages):
+        # The span is not made current: the caller runs between chunks
+        tracer = get_tracer()
+        model_span = tracer.start(f"model {self.id}", "model", stream=True, **{"gen_ai.request.model": self.id})
+        start = time.perf_counter()
+        try:
+            for chunk in super().invoke_stream(messages):
+                if model_span is not None and "time_to_first_token_ms" not in model_span.attributes:
+                    model_span.set(time_to_first_token_ms=(time.perf_counter() - start) * 1000)
+                if chunk.get("done"):
+                    _record_usage(model_span, chunk)
+                yield chunk
+        except BaseException as e:
+            tracer.end(model_span, e)
+            raise
+        tracer.end(model_span)
+
+
+def _traced_method(method: Callable, name: str) -> Callable:
+    @functools.wraps(method)
+    def traced(self, *args, **kwargs):
+        arguments = {key: value for key, value in kwargs.items() if key not in ("agent", "fc")}
+        with span(f"tool {name}", "tool", arguments=json.dumps(arguments, default=str)) as s:
+            result = method(self, *args, **kwargs)
+            if s is not None:
+                s.set(result_chars=len(str(result or "")))
+            return result
+
+    traced._traced = True
+    return traced
+
+
+def trace_tool_calls(toolkit: Toolkit) -> Toolkit:
+    """Record a `tool <name>` span around every call the model makes to `toolkit`.
+
+    Each function's entrypoint (a method of the toolkit) is replaced by a
+    traced method bound to the same toolkit. It keeps the signature and
+    docstring agno builds the tool schema from, and failed calls get a span
+    with the error. `Agent.deep_copy()` rebinds the method to the copied
+    toolkit only until agno wraps it with `validate_call` on the agent's
+    first run. Copies made after that keep calling the original toolkit,
+    which is fine for these toolkits: their state is the shared caches.
+    Direct calls (`getattr(toolkit, name)`) are not affected.
+    """
+    for function in toolkit.functions.values():
+        entrypoint = function.entrypoint
+        if not isinstance(entrypoint, types.MethodType) or getattr(entrypoint.__func__, "_traced", False):
+            continue
+        function.entrypoint = types.MethodType(_traced_method(entrypoint.__func__, function.name), toolkit)
+    return toolkit
@@ -0,0 +1,144 @@
+"""Batch analysis of many videos against the same analysis options.
+
+Coaches paste a playlist or a list of 10-50 URLs. Analysing them one job at
+a time would queue every video behind the previous one. `analyze_batch()`
+instead runs the per-video analysis on a pool of `VIDEO_BATCH_WORKERS`
+threads and hands each finished video to `on_result` in the caller's
+thread, so a background job can publish the videos done so far.
+
+Transcripts and video data come through `CachedYouTubeTools`, so a video
+analysed before (alone or in another batch) is not fetched again. Each
+long video is still analysed in parts by `agno_shared.video_mapreduce`.
+The workers fetch transcripts and build prompts in parallel, but every
+model request waits for one of the process-wide model slots
+(`AGENT_MAX_CONCURRENCY`, see `agno_shared.concurrency`), so a batch never
+sends Ollama more requests at once than the rest of the app would. A video
+that fails is recorded with its error and the batch goes on.
+`batch_report()` combines the analyses into one markdown download.
+"""
+
+import functools
+import os
+import re
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from agno_shared.concurrency import iter_parallel
+
+BATCH_WORKERS: int = int(os.getenv("VIDEO_BATCH_WORKERS", "4"))
+MAX_BATCH_VIDEOS: int = int(os.getenv("VIDEO_BATCH_MAX_VIDEOS", "50"))
+
+_URL = re.compile(r"(?:https?://)?(?:www\.|m\.)?(?:youtube\.com|youtu\.be)/[^\s,;<>\"']+")
+_VIDEO_ID = re.compile(r"^[\w-]{11}$")
+
+
+def watch_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def parse_video_urls(text: str) -> Tuple[List[str], List[str]]:
+    """Video URLs and playlist ids in pasted `text`, de-duplicated, in order.
+
+    Video links of any form (watch, youtu.be, shorts, embed) are turned into
+    watch URLs. Playlist links without a video are returned as playlist ids
+    for `expand_playlists()`.
+    """
+    videos: List[str] = []
+    playlists: List[str] = []
+    for match in _URL.findall(text):
+        url = urlparse(match if "://" in match else "https://" + match)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split("/") if part]
+        if url.hostname and url.hostname.endswith("youtu.be"):
+            video_id = parts[0] if parts else None
+        elif parts[:1] in (["shorts"], ["embed"], ["v"], ["live"]) and len(parts) > 1:
+            video_id = parts[1]
+        else:
+            video_id = query.get("v", [None])[0]
+        if video_id and _VIDEO_ID.match(video_id):
+            videos.append(watch_url(video_id))
+        elif query.get("list"):
+            playlists.append(query["list"][0])
+    return list(dict.fromkeys(videos)), list(dict.fromkeys(playlists))
+
+
+def expand_playlists(
+    urls: List[str], playlist_ids: List[str], tools=None, max_videos: int = MAX_BATCH_VIDEOS
+) -> Tuple[List[str], List[str]]:
+    """`urls` plus the videos of each playlist, up to `max_videos`, and any errors."""
+    from agno_shared.youtube_cache import CachedYouTubeTools
+
+    tools = tools or CachedYouTubeTools()
+    urls, errors = list(urls), []
+    for playlist_id in playlist_ids:
+        try:
+            video_ids = tools.get_playlist_video_ids(playlist_id)
+        except Exception as e:
+            errors.append(f"Playlist {playlist_id}: {e}")
+            continue
+        if not video_ids:
+            errors.append(f"Playlist {playlist_id}: no videos found")
+        urls += [watch_url(video_id) for video_id in video_ids]
+    urls = list(dict.fromkeys(urls))
+    if len(urls) > max_videos:
+        errors.append(f"Only the first {max_videos} of {len(urls)} videos are analyzed")
+    return urls[:max_videos], errors
+
+
+def analyze_batch(
+    urls: List[str],
+    analyze: Callable[[str], str],
+    on_result: Optional[Callable[[List[dict], int], None]] = None,
+    max_workers: int = BATCH_WORKERS,
+) -> dict:
+    """Run `analyze(url)` for every video on a worker pool.
+
+    Returns `{"videos": [...], "seconds": ..., "videos_per_minute": ...}`,
+    with one `{"url", "content"}` or `{"url", "error"}` entry per video in
+    the order of `urls`. `on_result(videos, total)` is called in this thread
+    after each video with the entries so far, in `urls` order.
+    """
+    start = time.perf_counter()
+    tasks = {url: functools.partial(analyze, url) for url in urls}
+    videos: Dict[str, dict] = {}
+    for url, future in iter_parallel(tasks, max_workers):
+        if future.exception() is not None:
+            error = future.exception()
+            videos[url] = {"url": url, "error": f"{type(error).__name__}: {error}"}
+        else:
+            videos[url] = {"url": url, "content": future.result()}
+        if on_result is not None:
+            on_result([videos[u] for u in urls if u in videos], len(urls))
+    seconds = time.perf_counter() - start
+    return {
+        "videos": [videos[url] for url in urls],
+        "seconds": seconds,
+        "videos_per_minute": len(urls) / seconds * 60 if seconds else 0.0,
+    }
+
+
+def batch_report(batch: dict) -> str:
+    """Markdown download of a whole batch: contents, one section per video, failures."""
+    done = [video for video in batch["videos"] if "content" in video]
+    failed = [video for video in batch["videos"] if "error" in video]
+    lines = [
+        "# Video Batch Analysis",
+        "",
+        f"**Videos:** {len(done)} analyzed, {len(failed)} failed",
+        f"**Analysis Focus:** {', '.join(batch.get('options') or [])}",
+    ]
+    if batch.get("question"):
+        lines.append(f"**Question:** {batch['question']}")
+    lines += ["", "## Contents", ""]
+    lines += [f"{i}. [{video['url']}](#video-{i})" for i, video in enumerate(done, 1)]
+    for i, video in enumerate(done, 1):
+        # The analysis' own headings go one level below the video's
+        content = re.sub(r"(?m)^(#{1,5}) ", r"#\1 ", video["content"])
+        lines += ["", f'<a id="video-{i}"></a>', "", f"## Video {i}: {video['url']}", "", content]
+    if failed or batch.get("errors"):
+        lines += ["", "## Not Analyzed", ""]
+        lines += [f"- {video['url']}: {video['error']}" for video in failed]
+        lines += [f"- {error}" for error in batch.get("errors") or []]
+    lines += ["", "*Analysis generated by AI Health & Fitness Planner*", ""]
+    return "\n".join(lines)
@@ -0,0 +1,210 @@
+"""Structured YouTube video discovery.
+
+Both video call sites in the fitness app used to ask the model for free
+text, scrape URLs out of it with regexes, and send a second full request
+whenever no "youtube.com" link came back. `discover_videos()` returns typed
+`VideoRecord`s instead:
+
+1. A DuckDuckGo video search (through the shared search cache) finds real
+   YouTube videos with titles, descriptions and durations. That takes no
+   model call at all.
+2. Only if the search finds nothing is the agent asked, once, for a
+   `VideoList` as structured output. If the model answers in prose anyway,
+   records are taken from its answer and its tool results. There is no
+   retry.
+
+Video ids are checked for shape, and model-suggested ones are confirmed
+through the cached YouTube oEmbed lookup, so made-up videos are dropped
+without another model call.
+
+duckduckgo_search and the YouTube tools are imported by the functions
+that use them, so importing this module does not load them.
+"""
+
+import json
+import re
+from typing import TYPE_CHECKING, List, Optional
+from urllib.error import HTTPError
+
+from agno.utils.log import logger
+from pydantic import BaseModel, Field
+
+from agno_shared.query import normalize_query
+from agno_shared.response_cache import ResponseCache
+from agno_shared.streaming import response_text
+from agno_shared.tracing import span
+
+if TYPE_CHECKING:
+    from agno_shared.search_cache import SearchCache
+    from agno_shared.youtube_cache import CachedYouTubeTools
+
+_VIDEO_URL = re.compile(
+    r"https?://(?:www\.|m\.)?(?:youtube\.com/(?:watch\?(?:\S*&)?v=|shorts/|embed/)|youtu\.be/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+)
+
+
+class VideoRecord(BaseModel):
+    title: str = Field(..., description="Exact title of the video")
+    url: str = Field(..., description="Full YouTube URL, https://www.youtube.com/watch?v=<id>")
+    description: str = Field("", description="One or two sentences about the content")
+    duration: Optional[str] = Field(None, description="Length of the video, e.g. 12:34")
+
+
+class VideoList(BaseModel):
+    videos: List[VideoRecord]
+
+
+def video_id(url: str) -> Optional[str]:
+    """The 11-character video id of a YouTube URL, or None if it isn't one."""
+    match = _VIDEO_URL.search(url or "")
+    return match.group(1) if match else None
+
+
+def watch_url(vid: str) -> str:
+    return f"https://www.youtube.com/watch?v={vid}"
+
+
+def _dedupe(records: List[VideoRecord]) -> List[VideoRecord]:
+    seen, unique = set(), []
+    for record in records:
+        vid = video_id(record.url)
+        if vid is not None and vid not in seen:
+            seen.add(vid)
+            unique.append(record.model_copy(update={"url": watch_url(vid)}))
+    return unique
+
+
+def search_videos(
+    query: str,
+    max_results: int = 3,
+    duration: Optional[str] = None,
+    cache: Optional["SearchCache"] = None,
+) -> List[VideoRecord]:
+    """YouTube videos for `query` from a DuckDuckGo video search. No model calls."""
+    from duckduckgo_search import DDGS
+
+    from agno_shared.search_cache import SEARCH_TTL_SECONDS, get_default_cache
+
+    cache = cache or get_default_cache()
+    key = ("videos", normalize_query(query), duration)
+    raw = cache.get_or_fetch(
+        key,
+        SEARCH_TTL_SECONDS,
+        # Ask for extra results, since not all of them are on YouTube
+        lambda: json.dumps(DDGS().videos(query, duration=duration, max_results=max(10, max_results * 3))),
+    )
+    records = [
+        VideoRecord(
+            title=item.get("title") or "YouTube video",
+            url=item.get("content") or "",
+            description=item.get("description") or "",
+            duration=item.get("duration") or None,
+        )
+        for item in json.loads(raw)
+    ]
+    return _dedupe(records)[:max_results]
+
+
+def records_from_text(content: str) -> List[VideoRecord]:
+    """Best-effort records from free text: every YouTube URL and the title nearest to it."""
+    records = []
+    for match in _VIDEO_URL.finditer(content):
+        before = content[max(0, match.start() - 200) : match.start()]
+        titles = re.findall(r"\*\*(.+?)\*\*|\[(.+?)\]\(|\"title\":\s*\"(.+?)\"|Title:\s*(.+)", before)
+        title = next((group for found in reversed(titles) for group in found if group), "YouTube video")
+        after = content[match.end() : match.end() + 300]
+        description = re.search(r"[Dd]escription\"?:\s*\"?(.+?)[\"\n]", after)
+        records.append(
+            VideoRecord(
+                title=title.strip(),
+                url=watch_url(match.group(1)),
+                description=description.group(1).strip() if description else "",
+            )
+        )
+    return _dedupe(records)
+
+
+def verify_records(records: List[VideoRecord], tools: Optional["CachedYouTubeTools"] = None) -> List[VideoRecord]:
+    """Drop records whose video doesn't exist, using the cached oEmbed lookup.
+
+    Videos that can't be checked (e.g. no network) are kept.
+    """
+    from agno_shared.youtube_cache import CachedYouTubeTools
+
+    tools = tools or CachedYouTubeTools()
+    verified = []
+    for record in records:
+        try:
+            metadata = tools.get_video_metadata(video_id(record.url))
+        except HTTPError:
+            logger.warning(f"Dropping unknown video {record.url}")
+            continue
+        except Exception:
+            verified.append(record)
+            continue
+        verified.append(record.model_copy(update={"title": metadata.get("title") or record.title}))
+    return verified
+
+
+def ask_agent_for_videos(
+    agent,
+    query: str,
+    max_results: int = 3,
+    cache: Optional[ResponseCache] = None,
+    bypass_cache: bool = False,
+) -> List[VideoRecord]:
+    """One structured-output request to a private copy of `agent`. Never retried."""
+    prompt = (
+        f"Find {max_results} high-quality YouTube videos about: {query}. "
+        "Return each video's exact title, full YouTube URL, a one or two sentence description, and its duration if known."
+    )
+    cache_key = cache.key(agent, prompt, "video-records") if cache is not None else None
+    if cache_key is not None and not bypass_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return VideoList.model_validate_json(cached).videos
+
+    runner = agent.deep_copy()
+    runner.response_model = VideoList
+    runner.structured_outputs = True
+    # A streamed chat turn leaves this set on the agent, and agno then returns
+    # the "Run started" event instead of the structured response
+    runner.stream_intermediate_steps = False
+    with span(f"agent {runner.agent_id}", "agent", structured=True):
+        response = runner.run(prompt, stream=False)
+    if isinstance(response.content, VideoList):
+        records = _dedupe(response.content.videos)
+    else:
+        # The model answered in prose; use its answer and whatever its tools returned
+        tool_output = "\n".join(
+            str(message.content) for message in (getattr(response, "messages", None) or []) if message.role == "tool"
+        )
+        records = records_from_text(f"{response_text(response)}\n{tool_output}")
+    records = verify_records(records)[:max_results]
+
+    if cache_key is not None and records:
+        cache.put(cache_key, VideoList(videos=records).model_dump_json())
+    return records
+
+
+def discover_videos(
+    query: str,
+    agent=None,
+    max_results: int = 3,
+    duration: Optional[str] = None,
+    cache: Optional[ResponseCache] = None,
+    bypass_cache: bool = False,
+) -> List[VideoRecord]:
+    """Videos for `query`: a search first, then at most one model call.
+
+    `duration` is one of "short", "medium" or "long". Safe to call from a
+    worker thread.
+    """
+    try:
+        records = search_videos(query, max_results, duration)
+    except Exception as e:
+        logger.warning(f"Video search failed: {e}")
+        records = []
+    if records or agent is None:
+        return records
+    return ask_agent_for_videos(agent, query, max_results, cache, bypass_cache)
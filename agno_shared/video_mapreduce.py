@@ -0,0 +1,193 @@
+"""Map-reduce analysis of long videos.
+
+Analysing a video in one model call puts the whole transcript in one
+context window. A long workout program or lecture either overflows a small
+model's context or spends most of the request in prefill, and tool-output
+compaction would have to drop most of it. `analyze_long_video()` instead:
+
+1. splits the transcript into windows of `VIDEO_WINDOW_SECONDS` (default
+   5 min; wider if that would make more than `VIDEO_MAX_WINDOWS`), with an
+   `[m:ss]` marker every `MARKER_SECONDS` taken from the caption times;
+2. maps: takes notes on every window for the selected analysis sections,
+   at most `VIDEO_MAP_CONCURRENCY` windows at a time, each note citing the
+   markers it is based on;
+3. reduces: merges the notes into one analysis with a section per selected
+   option, keeping the timestamps from the notes.
+
+Every window is about the same size, so with enough parallelism the time
+taken depends on the window length, not on the length of the video.
+`needs_map_reduce()` tells whether a transcript is too long for the usual
+single call.
+"""
+
+import functools
+import math
+import os
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from agno_shared.compaction import fit_to_budget, tool_budget
+from agno_shared.concurrency import DEFAULT_MAX_CONCURRENCY, isolated_run, iter_parallel
+from agno_shared.fast_path import synthesis_agent
+from agno_shared.history import estimate_tokens
+from agno_shared.streaming import response_text
+from agno_shared.tracing import span
+
+WINDOW_SECONDS: int = int(os.getenv("VIDEO_WINDOW_SECONDS", "300"))
+MAX_WINDOWS: int = int(os.getenv("VIDEO_MAX_WINDOWS", "12"))
+MAP_CONCURRENCY: int = int(os.getenv("VIDEO_MAP_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY)))
+MARKER_SECONDS: int = 30
+# Notes of one window are cut to this many tokens before the reduce step
+NOTE_TOKENS: int = 300
+
+
+class Window(NamedTuple):
+    index: int
+    start: float
+    end: float
+    text: str
+
+    def label(self) -> str:
+        return f"{timestamp(self.start)}–{timestamp(self.end)}"
+
+
+def timestamp(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def needs_map_reduce(lines: List[dict]) -> bool:
+    """Whether the transcript is too long to send whole in one request."""
+    return estimate_tokens(" ".join(line["text"] for line in lines)) > tool_budget(
+        "get_youtube_video_captions"
+    )
+
+
+def transcript_windows(
+    lines: List[dict], window_seconds: int = WINDOW_SECONDS, max_windows: int = MAX_WINDOWS
+) -> List[Window]:
+    """Transcript lines ({text, start, duration}) grouped into timestamped windows."""
+    if not lines:
+        return []
+    duration = lines[-1]["start"] + lines[-1].get("duration", 0)
+    window_seconds = max(window_seconds, math.ceil(duration / max_windows))
+    groups: Dict[int, List[dict]] = {}
+    for line in lines:
+        groups.setdefault(int(line["start"] // window_seconds), []).append(line)
+
+    windows = []
+    for number in sorted(groups):
+        parts, next_marker = [], -1.0
+        for line in groups[number]:
+            if line["start"] >= next_marker:
+                parts.append(f"[{timestamp(line['start'])}]")
+                next_marker = line["start"] + MARKER_SECONDS
+            parts.append(line["text"].replace("\n", " "))
+        first, last = groups[number][0], groups[number][-1]
+        end = last["start"] + last.get("duration", 0)
+        windows.append(Window(len(windows), first["start"], end, " ".join(parts)))
+    return windows
+
+
+def video_transcript(agent, url: str) -> Tuple[Optional[List[dict]], str]:
+    """Transcript lines and title of the video at `url`, through the agent's YouTube tools.
+
+    The transcript is None when it cannot be fetched; the agent can then try itself.
+    """
+    from agno_shared.youtube_cache import CachedYouTubeTools
+
+    tools = next(
+        (tool for tool in getattr(agent, "tools", None) or [] if isinstance(tool, CachedYouTubeTools)),
+        None,
+    ) or CachedYouTubeTools()
+    try:
+        video_id = tools.get_youtube_video_id(url)
+        lines = tools.get_transcript(video_id) if video_id else None
+    except Exception:
+        return None, ""
+    try:
+        title = tools.get_video_metadata(video_id).get("title") or ""
+    except Exception:
+        title = ""
+    return lines or None, title
+
+
+def format_notes(notes: List[Tuple[Window, str]]) -> str:
+    return "\n\n".join(f"### Part {window.index + 1} ({window.label()})\n{note}" for window, note in notes)
+
+
+def map_prompt(window: Window, total: int, sections: List[str], question: str) -> str:
+    return f"""
+    This is part {window.index + 1} of {total} of a YouTube video, from {window.label()}.
+    Transcript of this part, with [m:ss] timestamps:
+
+    {window.text}
+
+    Take notes on this part for these sections: {", ".join(sections)}.
+    {"Also note anything that answers this question: " + question if question else ""}
+    Under each section name, write at most 3 short bullet points. Start each bullet with the
+    [m:ss] timestamp where it is said, copied from the transcript. Write "nothing" under a
+    section this part does not cover. Only use what the transcript says.
+    """
+
+
+def reduce_prompt(
+    url: str, title: str, sections: List[str], question: str, notes: List[Tuple[Window, str]]
+) -> str:
+    headings = list(sections) + (["Answer to your question"] if question else []) + ["Practical Takeaways"]
+    return f"""
+    Analyze this YouTube video: {url}{f' ("{title}")' if title else ""}
+
+    These are notes on its consecutive parts, taken from the transcript:
+
+    {format_notes(notes)}
+
+    Write a structured analysis with exactly these sections as "## " headings, in this order:
+    {", ".join(headings)}.
+    {"Answer this specific question: " + question if question else ""}
+    Under each section, merge the points from all parts in video order and keep the [m:ss]
+    timestamp of every point you use. Never invent timestamps. Ignore notes that say "nothing".
+    The practical takeaways should be things someone could apply to their own fitness routine.
+    """
+
+
+def analyze_long_video(
+    agent,
+    lines: List[dict],
+    url: str,
+    sections: List[str],
+    question: str = "",
+    title: str = "",
+    on_progress: Optional[Callable[[List[Tuple[Window, str]], int], None]] = None,
+    max_concurrency: int = MAP_CONCURRENCY,
+) -> str:
+    """The analysis of a long video from its transcript `lines`.
+
+    `on_progress(notes, total)` is called after each window with the notes
+    so far, in video order. Windows whose call fails are left out; if every
+    window fails, the first error is raised.
+    """
+    windows = transcript_windows(lines)
+    # The window and reduce prompts are not turns of the user's conversation
+    runner = synthesis_agent(agent, history=False)
+
+    def take_notes(window: Window) -> str:
+        return response_text(isolated_run(runner, map_prompt(window, len(windows), sections, question)))
+
+    tasks = {window.index: functools.partial(take_notes, window) for window in windows}
+    notes: Dict[int, str] = {}
+    errors: List[BaseException] = []
+    with span("video map", "internal", windows=len(windows), max_concurrency=max_concurrency):
+        for index, future in iter_parallel(tasks, max_concurrency):
+            if future.exception() is not None:
+                errors.append(future.exception())
+                continue
+            notes[index] = fit_to_budget(future.result(), NOTE_TOKENS)
+            if on_progress is not None:
+                on_progress([(windows[i], notes[i]) for i in sorted(notes)], len(windows))
+    if not notes:
+        raise errors[0] if errors else ValueError("The video has no transcript")
+
+    ordered = [(windows[i], notes[i]) for i in sorted(notes)]
+    with span("video reduce", "internal", windows=len(ordered)):
+        return response_text(isolated_run(runner, reduce_prompt(url, title, sections, question, ordered)))
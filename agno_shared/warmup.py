@@ -0,0 +1,159 @@
+"""Ollama model warm-up and keep-alive.
+
+The first request to a model that is not in memory pays the whole load,
+often several seconds. `ModelWarmer` preloads models in a background thread
+when the app starts or the selected model changes, and asks Ollama to keep
+them loaded for `MODEL_KEEP_ALIVE` (default 30m).
+
+Tags that point at the same weights (`llama3.2`, `llama3.2:latest` and
+`llama3.2:3b` in the Ollama library) are resolved to one canonical tag by
+digest. `ollama_model()` builds agents on that tag, so the apps send one
+model name and load one set of weights.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+
+from agno.models.ollama import Ollama
+from ollama import Client
+
+from agno_shared.concurrency import CappedOllama
+from agno_shared.shared import lazy_singleton
+
+KEEP_ALIVE: str = os.getenv("MODEL_KEEP_ALIVE", "30m")
+WARMUP_TIMEOUT: float = float(os.getenv("MODEL_WARMUP_TIMEOUT", "300"))
+# How long the tag list and the loaded-model list are reused
+_LIST_TTL: float = 5.0
+
+
+def full_tag(model: str) -> str:
+    return model if ":" in model else f"{model}:latest"
+
+
+class ModelWarmer:
+    def __init__(self, host: Optional[str] = None, keep_alive: str = KEEP_ALIVE):
+        self.keep_alive = keep_alive
+        self.client = Client(host=host, timeout=WARMUP_TIMEOUT)
+        # Listing calls get a short timeout so a stopped Ollama does not block the UI
+        self._quick_client = Client(host=host, timeout=2)
+        # Canonical tag -> {"status", "seconds", "error"}
+        self.models: Dict[str, dict] = {}
+        # Canonical tag -> other names it was requested under
+        self.aliases: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-warmup")
+        self._digests: Dict[str, str] = {}
+        self._digests_at = 0.0
+        self._loaded: Dict[str, str] = {}
+        self._loaded_at = 0.0
+
+    def _refresh_digests(self) -> None:
+        if time.monotonic() - self._digests_at < _LIST_TTL:
+            return
+        try:
+            listed = self._quick_client.list().models
+            self._digests = {m.model: m.digest for m in listed if m.model and m.digest}
+        except Exception:
+            pass
+        self._digests_at = time.monotonic()
+
+    def canonical(self, model: str) -> str:
+        """The first installed tag (alphabetically) with the same weights as `model`."""
+        self._refresh_digests()
+        tag = full_tag(model)
+        digest = self._digests.get(tag)
+        if digest is None:
+            return model
+        canonical = min(name for name, other in self._digests.items() if other == digest)
+        if model != canonical:
+            with self._lock:
+                self.aliases.setdefault(canonical, set()).add(model)
+        return canonical
+
+    def warm(self, models: List[str]) -> None:
+        """Start loading `models` in the background, once per set of weights.
+
+        Models that were loaded before but have since been unloaded are loaded again.
+        """
+        loaded = self.loaded()
+        for model in models:
+            canonical = self.canonical(model)
+            with self._lock:
+                entry = self.models.setdefault(canonical, {"status": "queued"})
+                expired = entry["status"] == "ready" and full_tag(canonical) not in loaded
+                if not entry.get("submitted") and (entry["status"] != "ready" or expired):
+                    entry["submitted"] = True
+                    self._executor.submit(self._load, canonical)
+
+    def _load(self, model: str) -> None:
+        with self._lock:
+            self.models[model]["status"] = "loading"
+        start = time.perf_counter()
+        try:
+            # An empty prompt loads the model without generating anything
+            self.client.generate(model=model, prompt="", keep_alive=self.keep_alive)
+            update = {"status": "ready"}
+        except Exception as e:
+            update = {"status": "error", "error": str(e)}
+        update["seconds"] = time.perf_counter() - start
+        update["submitted"] = False
+        with self._lock:
+            self.models[model].update(update)
+        self._loaded_at = 0.0
+
+    def loaded(self) -> Dict[str, str]:
+        """Models Ollama currently holds in memory, with their expiry time."""
+        if time.monotonic() - self._loaded_at >= _LIST_TTL:
+            try:
+                running = self._quick_client.ps().models
+                self._loaded = {m.model: str(m.expires_at or "") for m in running if m.model}
+            except Exception:
+                self._loaded = {}
+            self._loaded_at = time.monotonic()
+        return self._loaded
+
+    def status(self) -> Dict[str, dict]:
+        """Warm-up state of every requested model, marked with whether it is loaded now."""
+        loaded = self.loaded()
+        with self._lock:
+            return {
+                model: {
+                    **{k: v for k, v in entry.items() if k != "submitted"},
+                    "aliases": sorted(self.aliases.get(model, ())),
+                    "loaded": full_tag(model) in loaded,
+                }
+                for model, entry in self.models.items()
+            }
+
+
+@lazy_singleton
+def get_default_warmer() -> ModelWarmer:
+    return ModelWarmer()
+
+
+def ollama_model(model: str, **kwargs) -> Ollama:
+    """An Ollama model on the canonical tag for `model`, kept loaded for `MODEL_KEEP_ALIVE`.
+
+    Requests are traced (see `agno_shared.tracing`) and capped per process
+    (see `agno_shared.concurrency`).
+    """
+    return CappedOllama(id=get_default_warmer().canonical(model), keep_alive=KEEP_ALIVE, **kwargs)
+
+
+def status_lines(warmer: ModelWarmer) -> List[str]:
+    """One markdown line per model, for a sidebar."""
+    icons = {"queued": "⏳", "loading": "🔄", "ready": "✅", "error": "❌"}
+    lines = []
+    for model, entry in warmer.status().items():
+        line = f"{icons.get(entry['status'], '•')} `{model}` {entry['status']}"
+        if entry["status"] == "ready":
+            line += f" in {entry['seconds']:.1f}s" if entry["loaded"] else " (unloaded since)"
+        if entry["aliases"]:
+            line += f" · also {', '.join(entry['aliases'])}"
+        if entry["status"] == "error":
+            line += f": {entry['error'][:80]}"
+        lines.append(line)
+    return lines
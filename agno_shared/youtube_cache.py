@@ -0,0 +1,287 @@
+"""Read-through cache for YouTube captions and video metadata.
+
+`CachedYouTubeTools` is a drop-in replacement for agno's `YouTubeTools`.
+Each raw transcript and oEmbed record is fetched once per video id. It is
+stored zlib-compressed in `tmp/youtube_cache.db` and then reused for
+captions, timestamps and video data. Re-analysing a video with a different
+question therefore skips the network round-trips. When the cache grows past
+`max_bytes`, the least recently used entries are evicted.
+
+Pre-fetch videos from the command line (run from the app directory):
+
+    PYTHONPATH=.. python -m agno_shared.youtube_cache [URL_OR_ID ...]
+
+Without arguments the example videos from the fitness app are warmed up.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from agno.tools.youtube import YouTubeTools, YouTubeTranscriptApi
+from agno.utils.log import log_debug
+
+from agno_shared.compaction import compact_tool_calls
+from agno_shared.shared import SharedOnCopy, lazy_singleton
+from agno_shared.tracing import span, trace_tool_calls
+
+DEFAULT_CACHE_FILE: str = os.getenv("YOUTUBE_CACHE_FILE", "tmp/youtube_cache.db")
+DEFAULT_MAX_BYTES: int = int(os.getenv("YOUTUBE_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+
+# Example videos listed in the Video Analysis tips of fitness_coach.py
+EXAMPLE_VIDEO_URLS: List[str] = [
+    "https://www.youtube.com/watch?v=IODxDxX7oi4",
+    "https://www.youtube.com/watch?v=wxzc_2c6GMg",
+    "https://www.youtube.com/watch?v=ixkQaZXVQjs",
+]
+
+
+class YouTubeCache(SharedOnCopy):
+    """Compressed, size-bounded store of per-video records."""
+
+    def __init__(self, db_file: str = DEFAULT_CACHE_FILE, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.db_file = db_file
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS videos (
+                    key TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits (or rolls back) and is closed on exit."""
+        with closing(sqlite3.connect(self.db_file, timeout=30)) as conn, conn:
+            yield conn
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT data FROM videos WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE videos SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, value: Any) -> None:
+        data = zlib.compress(json.dumps(value).encode())
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now, now),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM videos").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for old_key, size in conn.execute(
+                "SELECT key, size FROM videos ORDER BY last_access"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM videos WHERE key = ?", (old_key,))
+                total -= size
+
+    def stats(self) -> dict:
+        with self._lock, self._connect() as conn:
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM videos"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": count, "bytes": total}
+
+
+@lazy_singleton
+def get_default_cache() -> YouTubeCache:
+    """Process-wide cache shared by every CachedYouTubeTools instance."""
+    return YouTubeCache()
+
+
+class CachedYouTubeTools(YouTubeTools):
+    def __init__(self, cache: Optional[YouTubeCache] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.cache: YouTubeCache = cache or get_default_cache()
+        # Model-initiated calls are traced and their results compacted
+        compact_tool_calls(trace_tool_calls(self))
+
+    def get_transcript(self, video_id: str) -> List[Dict[str, Any]]:
+        """Raw transcript lines ({text, start, duration}) for `video_id`."""
+        key = f"transcript:{video_id}:{','.join(self.languages or [])}"
+        transcript = self.cache.get(key)
+        if transcript is None:
+            log_debug(f"Fetching transcript for youtube video: {video_id}")
+            kwargs: Dict = {}
+            if self.languages:
+                kwargs["languages"] = self.languages
+            if self.proxies:
+                kwargs["proxies"] = self.proxies
+            with span("fetch youtube transcript", "http", video_id=video_id):
+                if hasattr(YouTubeTranscriptApi, "get_transcript"):
+                    transcript = YouTubeTranscriptApi.get_transcript(video_id, **kwargs)
+                else:
+                    # youtube-transcript-api >= 1.0 replaced the static helpers
+                    kwargs.pop("proxies", None)
+                    transcript = YouTubeTranscriptApi().fetch(video_id, **kwargs).to_raw_data()
+            transcript = [
+                {"text": line["text"], "start": line["start"], "duration": line.get("duration", 0)}
+                for line in transcript
+            ]
+            self.cache.put(key, transcript)
+        return transcript
+
+    def get_video_metadata(self, video_id: str) -> Dict[str, Any]:
+        """oEmbed metadata for `video_id`."""
+        key = f"data:{video_id}"
+        data = self.cache.get(key)
+        if data is None:
+            log_debug(f"Fetching video data for youtube video: {video_id}")
+            params = {"format": "json", "url": f"https://www.youtube.com/watch?v={video_id}"}
+            with span("fetch youtube oembed", "http", video_id=video_id):
+                with urlopen("https://www.youtube.com/oembed?" + urlencode(params)) as response:
+                    video_data = json.loads(response.read().decode())
+            data = {
+                field: video_data.get(field)
+                for field in (
+                    "title",
+                    "author_name",
+                    "author_url",
+                    "type",
+                    "height",
+                    "width",
+                    "version",
+                    "provider_name",
+                    "provider_url",
+                    "thumbnail_url",
+                )
+            }
+            self.cache.put(key, data)
+        return data
+
+    def get_playlist_video_ids(self, playlist_id: str) -> List[str]:
+        """Ids of the videos on the public page of playlist `playlist_id`, in order.
+
+        Not cached: playlists change. The page lists about the first 100 videos.
+        """
+        request = Request(
+            "https://www.youtube.com/playlist?" + urlencode({"list": playlist_id}),
+            headers={"User-Agent": "Mozilla/5.0", "Accept-Language": "en"},
+        )
+        with span("fetch youtube playlist", "http", playlist_id=playlist_id):
+            with urlopen(request) as response:
+                page = response.read().decode("utf-8", "replace")
+        return list(dict.fromkeys(re.findall(r'"videoId":"([\w-]{11})"', page)))
+
+    def _video_id(self, url: str) -> Optional[str]:
+        try:
+            return self.get_youtube_video_id(url)
+        except Exception:
+            return None
+
+    def get_youtube_video_data(self, url: str) -> str:
+        """Function to get video data from a YouTube URL.
+        Data returned includes {title, author_name, author_url, type, height, width, version, provider_name, provider_url, thumbnail_url}
+
+        Args:
+            url: The URL of the YouTube video.
+
+        Returns:
+            str: JSON data of the YouTube video.
+        """
+        if not url:
+            return "No URL provided"
+        video_id = self._video_id(url)
+        if not video_id:
+            return "Error getting video ID from URL, please provide a valid YouTube url"
+        try:
+            return json.dumps(self.get_video_metadata(video_id), indent=4)
+        except Exception as e:
+            return f"Error getting video data: {e}"
+
+    def get_youtube_video_captions(self, url: str) -> str:
+        """Use this function to get captions from a YouTube video.
+
+        Args:
+            url: The URL of the YouTube video.
+
+        Returns:
+            str: The captions of the YouTube video.
+        """
+        if not url:
+            return "No URL provided"
+        video_id = self._video_id(url)
+        if not video_id:
+            return "Error getting video ID from URL, please provide a valid YouTube url"
+        try:
+            captions = self.get_transcript(video_id)
+            if captions:
+                return " ".join(line["text"] for line in captions)
+            return "No captions found for video"
+        except Exception as e:
+            return f"Error getting captions for video: {e}"
+
+    def get_video_timestamps(self, url: str) -> str:
+        """Generate timestamps for a YouTube video based on captions.
+
+        Args:
+            url: The URL of the YouTube video.
+
+        Returns:
+            str: Timestamps and summaries for the video.
+        """
+        if not url:
+            return "No URL provided"
+        video_id = self._video_id(url)
+        if not video_id:
+            return "Error getting video ID from URL, please provide a valid YouTube url"
+        try:
+            timestamps = []
+            for line in self.get_transcript(video_id):
+                minutes, seconds = divmod(int(line["start"]), 60)
+                timestamps.append(f"{minutes}:{seconds:02d} - {line['text']}")
+            return "\n".join(timestamps)
+        except Exception as e:
+            return f"Error generating timestamps: {e}"
+
+
+def warm_up(urls_or_ids: List[str], tools: Optional[CachedYouTubeTools] = None) -> Dict[str, str]:
+    """Pre-fetch transcripts and metadata; returns a status per video."""
+    tools = tools or CachedYouTubeTools()
+    status = {}
+    for item in urls_or_ids:
+        video_id = tools._video_id(item) if "/" in item else item
+        if not video_id:
+            status[item] = "invalid url"
+            continue
+        try:
+            tools.get_video_metadata(video_id)
+            lines = tools.get_transcript(video_id)
+            status[video_id] = f"ok ({len(lines)} caption lines)"
+        except Exception as e:
+            status[video_id] = f"error: {e}"
+    return status
+
+
+if __name__ == "__main__":
+    for video, result in warm_up(sys.argv[1:] or EXAMPLE_VIDEO_URLS).items():
+        print(f"{video}: {result}")
@@ -0,0 +1,371 @@
+"""Scripted-session benchmark for both Streamlit apps.
+
+Starts `fake_ollama.FakeOllama` and replays scripted user sessions against
+the real app scripts through Streamlit's `AppTest`, with the tools' network
+calls replaced by `stub_tools`. Each app runs in its own child process, in
+a scratch directory. That keeps the apps' `agents` modules apart, gives
+every run cold on-disk caches, and makes the memory figures per app.
+
+For every step the harness records wall time, model requests, and the
+prompt and completion tokens the fake server saw. The result file holds
+p50/p95/p99 per step, throughput, token totals and peak memory; the
+fitness app's `video_batch` step also reports videos per minute. A second,
+cold child process runs only the first script run under `python -X
+importtime`, for the import cost of starting the app and the heaviest
+modules behind it. The result file is plain JSON with stable keys, so runs
+from two commits can be diffed:
+
+    python benchmarks/app_bench.py --sessions 3 --output bench-before.json
+    git checkout other-branch
+    python benchmarks/app_bench.py --sessions 3 --output bench-after.json
+    diff <(jq .apps bench-before.json) <(jq .apps bench-after.json)
+
+Run from the repository root.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "benchmarks"))
+
+VIDEO_URL = "https://www.youtube.com/watch?v=IODxDxX7oi4"
+BATCH_VIDEO_URLS = [f"https://www.youtube.com/watch?v=stubbatch{i:02d}" for i in range(10)]
+# Steps that analyze several videos, and how many
+STEP_VIDEOS = {"video_batch": len(BATCH_VIDEO_URLS)}
+# Written to stderr just before the script's first run in the import-profile child
+IMPORT_MARKER = "--- app startup ---"
+# Tool dependencies that should only be imported once their agent is used
+DEFERRED_MODULES = ("yfinance", "duckduckgo_search", "youtube_transcript_api", "pandas")
+
+
+def _chat(prompt: str) -> Callable:
+    return lambda at: at.chat_input[0].set_value(prompt).run()
+
+
+def _select_agent(name: str, prompt: str) -> Callable:
+    def step(at):
+        at.sidebar.selectbox[0].set_value(name).run()
+        at.chat_input[0].set_value(prompt).run()
+
+    return step
+
+
+def _fill_and_click(text_inputs: Dict[str, str], button_key: str) -> Callable:
+    def step(at):
+        for key, value in text_inputs.items():
+            at.text_input(key=key).set_value(value)
+        at.button(key=button_key).click().run()
+
+    return step
+
+
+def _wait_for_jobs(at, timeout: float = 300.0, interval: float = 0.1) -> None:
+    """Rerun the script until the app's background jobs are done and shown."""
+    deadline = time.monotonic() + timeout
+    while at.session_state["pending_jobs"] and time.monotonic() < deadline:
+        time.sleep(interval)
+        at.run()
+
+
+def _generate_plan(at):
+    at.number_input[0].set_value(35)
+    at.number_input[1].set_value(175.0)
+    at.number_input[2].set_value(80.0)
+    next(b for b in at.button if "Generate" in b.label).click().run()
+    _wait_for_jobs(at)
+
+
+def _analyze_video(at):
+    _fill_and_click({"video_analysis_url": VIDEO_URL}, "analyze_video_btn")(at)
+    _wait_for_jobs(at)
+
+
+def _analyze_batch(at):
+    at.toggle(key="video_batch_mode").set_value(True).run()
+    at.text_area(key="video_batch_urls").set_value("\n".join(BATCH_VIDEO_URLS))
+    at.button(key="analyze_batch_btn").click().run()
+    _wait_for_jobs(at)
+    # Back to single-video mode for the next session
+    at.toggle(key="video_batch_mode").set_value(False).run()
+
+
+# Scripted sessions, step by step. "startup" (the first script run) is
+# measured for every session.
+SCENARIOS: Dict[str, Tuple[str, List[Tuple[str, Callable]]]] = {
+    "agents": (
+        "Agno_Agents/streamlit_agent.py",
+        [
+            ("web_chat", _chat("Search for the health benefits of creatine supplements")),
+            ("web_follow_up", _chat("Which of those benefits have the strongest evidence?")),
+            ("finance_chat", _select_agent("Finance Agent", "What is the $NVDA price and analyst recommendations?")),
+            ("finance_compare", _chat("Compare $NVDA, $AMD, $INTC and $AVGO: price and analyst recommendations")),
+            ("youtube_chat", _select_agent("YouTube Agent", f"Summarize this video: {VIDEO_URL}")),
+            ("youtube_follow_up", _chat("What does it say about breathing?")),
+        ],
+    ),
+    "fitness": (
+        "Agno_fitness_Agent/fitness_coach.py",
+        [
+            ("plan_generation", _generate_plan),
+            ("plan_question", _fill_and_click({"plan_question": "How much protein should I eat after training?"}, "plan_answer_btn")),
+            ("chat", _chat("How many rest days do I need per week?")),
+            ("research", _fill_and_click({"research_query": "creatine and muscle recovery"}, "search_btn")),
+            ("video_resources", _fill_and_click({"video_topic": "core strength"}, "video_btn")),
+            ("video_analysis", _analyze_video),
+            ("video_batch", _analyze_batch),
+        ],
+    ),
+}
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def rss_mb(field: str = "VmRSS") -> float:
+    """Resident memory of this process from /proc, or the peak from getrusage elsewhere."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def server_stats(url: str) -> Dict[str, int]:
+    with urllib.request.urlopen(f"{url}/bench/stats") as response:
+        return json.loads(response.read())
+
+
+def run_app(app: str, sessions: int, use_cache: bool, tool_latency: float) -> dict:
+    """Child process: replay `sessions` sessions of `app` and return raw samples."""
+    import stub_tools
+    from streamlit.testing.v1 import AppTest
+
+    stub_tools.install(tool_latency)
+    script, steps = SCENARIOS[app]
+    url = os.environ["OLLAMA_HOST"]
+    samples: Dict[str, List[dict]] = {}
+    errors: List[str] = []
+    rss_after_startup = None
+
+    start = time.perf_counter()
+    for session in range(sessions):
+        at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=300)
+        for name, action in [("startup", lambda at: at.run())] + steps:
+            before = server_stats(url)
+            step_start = time.perf_counter()
+            try:
+                action(at)
+            except Exception as e:
+                errors.append(f"session {session} {name}: {e!r}")
+            seconds = time.perf_counter() - step_start
+            after = server_stats(url)
+            errors += [f"session {session} {name}: {e.value}" for e in list(at.exception) + list(at.error)]
+            samples.setdefault(name, []).append(
+                {"seconds": seconds, **{key: after[key] - before[key] for key in after}}
+            )
+            if name == "startup":
+                rss_after_startup = rss_after_startup or rss_mb()
+                if not use_cache:
+                    # Applied with the next step's run
+                    for box in at.sidebar.checkbox:
+                        if box.label == "Bypass response cache":
+                            box.check()
+    wall = time.perf_counter() - start
+    return {
+        "wall_seconds": wall,
+        "samples": samples,
+        "errors": errors,
+        "memory": {"rss_after_startup_mb": rss_after_startup, "peak_rss_mb": rss_mb("VmHWM")},
+    }
+
+
+def profile_startup(app: str) -> None:
+    """Child process under `-X importtime`: run the app's script once."""
+    from streamlit.testing.v1 import AppTest
+
+    script, _ = SCENARIOS[app]
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=300)
+    # Streamlit and the test harness are imported by now; what follows is the app
+    print(IMPORT_MARKER, file=sys.stderr, flush=True)
+    at.run()
+
+
+def parse_importtime(stderr: str, top: int = 15) -> dict:
+    """Import cost of the modules first imported after `IMPORT_MARKER`."""
+    modules = []
+    for line in stderr.split(IMPORT_MARKER, 1)[-1].splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nested imports are indented two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    direct = [m for m in modules if m[3] == 0]
+    names = {m[0] for m in modules}
+    return {
+        "startup_import_ms": sum(m[2] for m in direct) / 1000,
+        "modules_imported": len(modules),
+        "top_level": [
+            {"module": name, "cumulative_ms": cumulative / 1000}
+            for name, _, cumulative, _ in sorted(direct, key=lambda m: -m[2])[:top]
+        ],
+        "deferred_modules_loaded": sorted(m for m in DEFERRED_MODULES if m in names),
+    }
+
+
+def summarize(raw: dict, sessions: int) -> dict:
+    steps = {}
+    for name, samples in raw["samples"].items():
+        seconds = [s["seconds"] for s in samples]
+        steps[name] = {
+            "count": len(samples),
+            "p50_s": percentile(seconds, 50),
+            "p95_s": percentile(seconds, 95),
+            "p99_s": percentile(seconds, 99),
+            "mean_s": sum(seconds) / len(seconds),
+            "model_requests": sum(s["requests"] for s in samples) / len(samples),
+            "prompt_tokens": sum(s["prompt_tokens"] for s in samples) / len(samples),
+            "completion_tokens": sum(s["completion_tokens"] for s in samples) / len(samples),
+        }
+        if name in STEP_VIDEOS:
+            steps[name]["videos_per_minute"] = STEP_VIDEOS[name] / steps[name]["mean_s"] * 60
+    all_samples = [s for samples in raw["samples"].values() for s in samples]
+    wall = raw["wall_seconds"]
+    completion = sum(s["completion_tokens"] for s in all_samples)
+    return {
+        "steps": steps,
+        "throughput": {
+            "sessions_per_minute": sessions / wall * 60,
+            "steps_per_second": len(all_samples) / wall,
+            "completion_tokens_per_second": completion / wall,
+        },
+        "tokens": {
+            "prompt": sum(s["prompt_tokens"] for s in all_samples),
+            "completion": completion,
+            "model_requests": sum(s["requests"] for s in all_samples),
+        },
+        "memory": raw["memory"],
+        "wall_seconds": wall,
+        "errors": raw["errors"][:20],
+    }
+
+
+def _round(value):
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, dict):
+        return {key: _round(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_round(item) for item in value]
+    return value
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument("--sessions", type=int, default=3, help="scripted sessions per app")
+    parser.add_argument("--token-rate", type=float, default=50.0, help="fake completion tokens per second")
+    parser.add_argument("--latency", type=float, default=0.1, help="fake seconds before the first token")
+    parser.add_argument("--prefill-rate", type=float, default=1000.0, help="fake prompt tokens per second")
+    parser.add_argument("--reply-tokens", type=int, default=120, help="tokens in each fake answer")
+    parser.add_argument("--tool-latency", type=float, default=0.05, help="seconds per stubbed tool call")
+    parser.add_argument("--use-cache", action="store_true", help="leave the response cache on between sessions")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--child", choices=sorted(SCENARIOS), help=argparse.SUPPRESS)
+    parser.add_argument("--child-output", help=argparse.SUPPRESS)
+    parser.add_argument("--child-imports", choices=sorted(SCENARIOS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_imports:
+        profile_startup(args.child_imports)
+        return
+    if args.child:
+        raw = run_app(args.child, args.sessions, args.use_cache, args.tool_latency)
+        with open(args.child_output, "w") as f:
+            json.dump(raw, f)
+        return
+
+    from fake_ollama import FakeOllama
+
+    fake = FakeOllama(args.token_rate, args.latency, args.prefill_rate, args.reply_tokens).start()
+    results = {}
+    for app in args.apps:
+        workdir = tempfile.mkdtemp(prefix=f"bench-{app}-")
+        child_output = os.path.join(workdir, "raw.json")
+        command = [
+            sys.executable, os.path.abspath(__file__), "--child", app, "--child-output", child_output,
+            "--sessions", str(args.sessions), "--tool-latency", str(args.tool_latency),
+        ] + (["--use-cache"] if args.use_cache else [])
+        print(f"{app}: replaying {args.sessions} sessions...", flush=True)
+        subprocess.run(command, cwd=workdir, env={**os.environ, "OLLAMA_HOST": fake.url}, check=True)
+        with open(child_output) as f:
+            results[app] = summarize(json.load(f), args.sessions)
+
+        # A fresh process, so every import is cold
+        profile = subprocess.run(
+            [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child-imports", app],
+            cwd=tempfile.mkdtemp(prefix=f"bench-{app}-imports-"),
+            env={**os.environ, "OLLAMA_HOST": fake.url},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results[app]["imports"] = parse_importtime(profile.stderr)
+    fake.stop()
+
+    report = _round(
+        {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "config": {key: value for key, value in vars(args).items() if not key.startswith("child")},
+            "apps": results,
+        }
+    )
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    for app, result in results.items():
+        print(f"\n{app}: {result['throughput']['sessions_per_minute']:.1f} sessions/min, "
+              f"peak RSS {result['memory']['peak_rss_mb']:.0f} MB, {len(result['errors'])} errors")
+        for name, step in result["steps"].items():
+            print(f"  {name:<18} p50 {step['p50_s']:6.2f}s  p95 {step['p95_s']:6.2f}s  p99 {step['p99_s']:6.2f}s  "
+                  f"{step['model_requests']:4.1f} calls  {step['prompt_tokens']:7.0f} prompt tokens"
+                  + (f"  {step['videos_per_minute']:.1f} videos/min" if "videos_per_minute" in step else ""))
+        imports = result["imports"]
+        print(f"  startup imports {imports['startup_import_ms']:.0f} ms ({imports['modules_imported']} modules), "
+              f"tool dependencies loaded: {', '.join(imports['deferred_modules_loaded']) or 'none'}")
+        for entry in imports["top_level"][:5]:
+            print(f"    {entry['module']:<40} {entry['cumulative_ms']:7.0f} ms")
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""A local stand-in for the Ollama HTTP API, for benchmarks.
+
+Answers /api/chat and /api/generate with deterministic markdown at a
+configurable speed: `latency` seconds before the first token, plus prompt
+processing at `prefill_rate` tokens/s, then `reply_tokens` tokens at
+`token_rate` tokens/s. Prompt tokens are estimated at 4 characters per
+token, so larger prompts cost more here too. Like Ollama's
+`OLLAMA_NUM_PARALLEL`, `num_parallel` caps the requests served at once
+(0 means no cap); the rest wait. Structured-output requests
+(`format` set to a JSON schema) get an example object matching the schema.
+
+/api/tags and /api/ps list `MODELS`. `GET /bench/stats` returns request and
+token counters, so a benchmark can attribute tokens to the step that spent
+them.
+
+Run on its own (e.g. to point the apps at it):
+
+    python benchmarks/fake_ollama.py --port 11434 --token-rate 30
+"""
+
+import argparse
+import contextlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+# Tags the apps ask for; llama3.2 tags share weights like the Ollama library's
+MODELS = {
+    "llama3.2:3b": "sha-llama32",
+    "llama3.2:latest": "sha-llama32",
+    "qwen2.5:7b": "sha-qwen25",
+    "deepseek-r1:7b": "sha-deepseek",
+    "phi4:latest": "sha-phi4",
+    "gemma3:12b": "sha-gemma3",
+}
+EXAMPLE_VIDEO_URL = "https://www.youtube.com/watch?v=IODxDxX7oi4"
+_WORDS = (
+    "squat protein recovery sets reps tempo hydration mobility core glutes "
+    "progressive overload calories fiber sleep warm-up form breathing"
+).split()
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def reply_text(tokens: int) -> str:
+    """Markdown answer of about `tokens` words, with headings and a video link."""
+    lines, count, section = [], 0, 0
+    while count < tokens:
+        if count % 40 == 0:
+            section += 1
+            lines.append(f"\n## Section {section}\n")
+        lines.append(" ".join(_WORDS[(count + i) % len(_WORDS)] for i in range(10)) + ".")
+        count += 10
+    lines.append(f"\n- **Example video**: {EXAMPLE_VIDEO_URL}")
+    return "\n".join(lines)
+
+
+def example_for_schema(schema: dict, defs: Optional[dict] = None, name: str = ""):
+    """A small value that validates against `schema`."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return example_for_schema(defs[schema["$ref"].split("/")[-1]], defs, name)
+    if "anyOf" in schema:
+        return example_for_schema(schema["anyOf"][0], defs, name)
+    kind = schema.get("type")
+    if kind == "object":
+        return {key: example_for_schema(value, defs, key) for key, value in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [example_for_schema(schema.get("items", {}), defs, name) for _ in range(3)]
+    if kind in ("integer", "number"):
+        return 1
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return EXAMPLE_VIDEO_URL if name == "url" else f"Example {name or 'text'}"
+
+
+class FakeOllama:
+    def __init__(
+        self,
+        token_rate: float = 50.0,
+        latency: float = 0.1,
+        prefill_rate: float = 1000.0,
+        reply_tokens: int = 120,
+        port: int = 0,
+        num_parallel: int = 0,
+    ):
+        self.token_rate = token_rate
+        self.latency = latency
+        self.prefill_rate = prefill_rate
+        self.reply_tokens = reply_tokens
+        self._slots = threading.BoundedSemaphore(num_parallel) if num_parallel else None
+        self.stats: Dict[str, int] = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self.loaded: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self) -> "FakeOllama":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+
+    def _count(self, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, obj) -> None:
+                data = json.dumps(obj).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    return self._json(
+                        {"models": [{"model": m, "name": m, "digest": d, "size": 1} for m, d in MODELS.items()]}
+                    )
+                if self.path == "/api/ps":
+                    return self._json(
+                        {
+                            "models": [
+                                {"model": m, "name": m, "digest": MODELS.get(m, ""), "size": 1, "size_vram": 1,
+                                 "expires_at": "2099-01-01T00:00:00Z"}
+                                for m in fake.loaded
+                            ]
+                        }
+                    )
+                if self.path == "/bench/stats":
+                    with fake._lock:
+                        return self._json(dict(fake.stats))
+                self.send_error(404)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                model = body.get("model", "")
+                fake.loaded[model] = time.time()
+                if self.path == "/api/generate" and not body.get("prompt"):
+                    # Warm-up request: load the model, generate nothing
+                    return self._json({"model": model, "created_at": _now(), "response": "", "done": True})
+                if self.path not in ("/api/chat", "/api/generate"):
+                    return self.send_error(404)
+
+                with fake._slots or contextlib.nullcontext():
+                    prompt = body.get("prompt") or json.dumps(body.get("messages", []))
+                    prompt_tokens = estimate_tokens(prompt + json.dumps(body.get("tools") or []))
+                    schema = body.get("format")
+                    if isinstance(schema, dict):
+                        text = json.dumps(example_for_schema(schema))
+                    else:
+                        text = reply_text(fake.reply_tokens)
+                    words = text.split(" ")
+                    fake._count(prompt_tokens, len(words))
+                    time.sleep(fake.latency + prompt_tokens / fake.prefill_rate)
+
+                    key = "response" if self.path == "/api/generate" else "message"
+                    base = {"model": model, "created_at": _now()}
+                    final = {"done": True, "prompt_eval_count": prompt_tokens, "eval_count": len(words)}
+
+                    def chunk(content: str) -> dict:
+                        if key == "response":
+                            return {"response": content}
+                        return {"message": {"role": "assistant", "content": content}}
+
+                    if not body.get("stream", True):
+                        time.sleep(len(words) / fake.token_rate)
+                        return self._json({**base, **chunk(text), **final})
+
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.end_headers()
+                    for i, word in enumerate(words):
+                        time.sleep(1 / fake.token_rate)
+                        piece = word if i == len(words) - 1 else word + " "
+                        self.wfile.write((json.dumps({**base, **chunk(piece), "done": False}) + "\n").encode())
+                        self.wfile.flush()
+                    self.wfile.write((json.dumps({**base, **chunk(""), **final}) + "\n").encode())
+
+        return Handler
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--token-rate", type=float, default=50.0, help="completion tokens per second")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds before the first token")
+    parser.add_argument("--prefill-rate", type=float, default=1000.0, help="prompt tokens per second")
+    parser.add_argument("--reply-tokens", type=int, default=120)
+    parser.add_argument("--num-parallel", type=int, default=0, help="requests served at once (0: no cap)")
+    args = parser.parse_args()
+    fake = FakeOllama(
+        args.token_rate, args.latency, args.prefill_rate, args.reply_tokens, args.port, args.num_parallel
+    )
+    print(f"Fake Ollama listening on {fake.url}")
+    fake.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Latency of long-video analysis: one call against map-reduce.
+
+Runs the fitness app's YouTube agent against `fake_ollama.FakeOllama` on
+generated transcripts of several lengths and times
+
+* single pass: the whole transcript in one request, as before, and
+* map-reduce: `agno_shared.video_mapreduce.analyze_long_video()` at each
+  of the given map concurrencies.
+
+The single pass grows with the transcript (prefill is paid per token),
+while map-reduce with enough concurrency stays close to the cost of one
+window plus the reduce call. `--num-parallel` caps the requests the fake
+server serves at once, like `OLLAMA_NUM_PARALLEL`.
+
+Run from the repository root:
+
+    python benchmarks/long_video_bench.py --minutes 10 30 60 120 --concurrency 1 4 12
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_ollama import FakeOllama  # noqa: E402
+
+VIDEO_URL = "https://www.youtube.com/watch?v=stubvideo00"
+SECTIONS = ["Summary of key points", "Exercise techniques"]
+_WORDS = "keep your chest up drive through the heels brace the core and control the descent".split()
+
+
+def transcript(minutes: int, line_seconds: float = 4.0) -> list:
+    return [
+        {"text": " ".join(_WORDS[i % 8 : i % 8 + 6]), "start": i * line_seconds, "duration": line_seconds}
+        for i in range(int(minutes * 60 / line_seconds))
+    ]
+
+
+def single_pass(agent, lines: list) -> float:
+    from agno_shared.concurrency import isolated_run
+    from agno_shared.fast_path import synthesis_agent
+
+    text = " ".join(line["text"] for line in lines)
+    start = time.perf_counter()
+    isolated_run(synthesis_agent(agent), f"Analyze this video ({', '.join(SECTIONS)}):\n\n{text}")
+    return time.perf_counter() - start
+
+
+def map_reduce(agent, lines: list, max_concurrency: int) -> float:
+    from agno_shared.video_mapreduce import analyze_long_video
+
+    start = time.perf_counter()
+    analyze_long_video(agent, lines, VIDEO_URL, SECTIONS, max_concurrency=max_concurrency)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=int, nargs="+", default=[10, 30, 60, 120])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 12])
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model latency in seconds")
+    parser.add_argument("--prefill-rate", type=float, default=1000.0, help="fake prompt tokens/s")
+    parser.add_argument("--token-rate", type=float, default=100.0, help="fake generated tokens/s")
+    parser.add_argument("--num-parallel", type=int, default=0, help="requests served at once (0: no cap)")
+    args = parser.parse_args()
+
+    fake = FakeOllama(
+        args.token_rate, args.latency, args.prefill_rate, port=0, num_parallel=args.num_parallel
+    ).start()
+    os.environ["OLLAMA_HOST"] = fake.url
+
+    from Agno_fitness_Agent.agents import DEFAULT_MODEL, build_youtube_agent
+    from agno_shared.video_mapreduce import transcript_windows
+
+    agent = build_youtube_agent(DEFAULT_MODEL)
+    header = f"{'minutes':>8} {'windows':>8} {'single':>8}" + "".join(
+        f" {f'mr x{c}':>8}" for c in args.concurrency
+    )
+    print(f"model latency {args.latency}s, prefill {args.prefill_rate:.0f} tok/s, "
+          f"generation {args.token_rate:.0f} tok/s, server slots {args.num_parallel or 'unlimited'}")
+    print(header)
+    for minutes in args.minutes:
+        lines = transcript(minutes)
+        row = f"{minutes:>8} {len(transcript_windows(lines)):>8} {single_pass(agent, lines):>7.2f}s"
+        for concurrency in args.concurrency:
+            row += f" {map_reduce(agent, lines, concurrency):>7.2f}s"
+        print(row, flush=True)
+    fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Load test for the per-session agent pool.
+
+Runs N chat sessions in parallel against a local fake Ollama server, each
+with its own pooled copy of the Web Agent, and checks that
+
+* sessions run concurrently: wall time stays close to one session's time
+  rather than N times it, and
+* sessions stay isolated: every prompt the model sees in a session, including
+  the replayed history, belongs to that session, and each session's stored
+  history holds only its own runs.
+
+Run from the repository root:
+
+    python benchmarks/session_pool_load.py --sessions 16 --turns 3
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Answers /api/chat with the list of user prompts it was sent."""
+
+    latency: float = 0.2
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+        prompts = [m["content"] for m in body.get("messages", []) if m.get("role") == "user"]
+        time.sleep(self.latency)
+        message = {"role": "assistant", "content": "seen: " + " | ".join(prompts)}
+        response = {
+            "model": body.get("model"),
+            "created_at": "2024-01-01T00:00:00Z",
+            "message": message,
+            "done": True,
+            "prompt_eval_count": 10,
+            "eval_count": 5,
+        }
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(response).encode())
+
+
+def start_fake_ollama(latency: float) -> ThreadingHTTPServer:
+    FakeOllamaHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_session(pool, session_id: str, turns: int) -> dict:
+    agent = pool.get("web-agent", session_id)
+    errors = []
+    start = time.perf_counter()
+    for turn in range(turns):
+        response = agent.run(f"{session_id}-turn{turn}", stream=False)
+        seen = response.content.removeprefix("seen: ").split(" | ")
+        foreign = [prompt for prompt in seen if not prompt.startswith(f"{session_id}-")]
+        if foreign:
+            errors.append(f"turn {turn} saw prompts from other sessions: {foreign}")
+        if len(seen) != turn + 1:
+            errors.append(f"turn {turn} saw {len(seen)} prompts, expected {turn + 1}")
+
+    stored = agent.storage.read(session_id)
+    stored_runs = (stored.memory or {}).get("runs", []) if stored else []
+    if len(stored_runs) != turns:
+        errors.append(f"storage holds {len(stored_runs)} runs, expected {turns}")
+    return {"seconds": time.perf_counter() - start, "errors": errors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model latency in seconds")
+    args = parser.parse_args()
+
+    server = start_fake_ollama(args.latency)
+    os.environ["OLLAMA_HOST"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.chdir(tempfile.mkdtemp())
+
+    from Agno_Agents.agents import build_web_agent
+    from agno_shared.agent_pool import SessionAgentPool
+
+    os.makedirs("tmp", exist_ok=True)
+    pool = SessionAgentPool({"web-agent": build_web_agent()})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+        results = list(
+            executor.map(
+                lambda i: run_session(pool, f"session{i}", args.turns), range(args.sessions)
+            )
+        )
+    wall = time.perf_counter() - start
+    server.shutdown()
+
+    one_session = args.turns * args.latency
+    errors = [error for result in results for error in result["errors"]]
+    print(f"sessions: {args.sessions}, turns each: {args.turns}, model latency: {args.latency}s")
+    print(f"wall time: {wall:.2f}s (one session alone: ~{one_session:.2f}s, "
+          f"fully serialized: ~{one_session * args.sessions:.2f}s)")
+    print(f"slowest session: {max(result['seconds'] for result in results):.2f}s")
+    print(f"pool: {pool.stats()}")
+    print(f"isolation errors: {len(errors)}")
+    for error in errors[:10]:
+        print(f"  {error}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Concurrent session-write benchmark for agent storage.
+
+Writes agent sessions from many threads into three tables in one SQLite
+file, the way the Agno Agents app does, once with agno's stock
+`SqliteAgentStorage` and once with `agno_shared.storage`, and reports
+p50/p99 latency of `upsert()` plus failed writes and total time until every
+session is on disk.
+
+Run from the repository root:
+
+    python benchmarks/storage_write_bench.py --threads 16 --writes 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agno.storage.agent.sqlite import SqliteAgentStorage
+from agno.storage.session.agent import AgentSession
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agno_shared.storage import SqliteDatabase, TunedSqliteAgentStorage  # noqa: E402
+
+TABLES = ["web_agent", "finance_agent", "youtube_agent"]
+
+
+def make_session(thread: int, write: int, payload: str) -> AgentSession:
+    return AgentSession(
+        session_id=f"session-{thread}",
+        agent_id=TABLES[thread % len(TABLES)],
+        user_id=None,
+        memory={"runs": [{"message": {"role": "user", "content": payload}}] * (write % 10 + 1)},
+        agent_data={"name": TABLES[thread % len(TABLES)]},
+        session_data={},
+        extra_data={},
+    )
+
+
+def run(storages, threads: int, writes: int, payload_bytes: int, flush=None) -> dict:
+    payload = "x" * payload_bytes
+
+    def writer(thread: int):
+        storage = storages[thread % len(storages)]
+        latencies, failures = [], 0
+        for write in range(writes):
+            start = time.perf_counter()
+            if storage.upsert(make_session(thread, write, payload)) is None:
+                failures += 1
+            latencies.append(time.perf_counter() - start)
+        return latencies, failures
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(writer, range(threads)))
+    if flush is not None:
+        flush()
+    total = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "failed": sum(result[1] for result in results),
+        "total_s": total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=50, help="upserts per thread")
+    parser.add_argument("--payload", type=int, default=2000, help="bytes per stored message")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    plain_file = os.path.join(workdir, "plain.db")
+    plain = [SqliteAgentStorage(table_name=table, db_file=plain_file) for table in TABLES]
+    for storage in plain:
+        storage.create()
+
+    database = SqliteDatabase(os.path.join(workdir, "tuned.db"))
+    tuned = [TunedSqliteAgentStorage(table, database) for table in TABLES]
+    for storage in tuned:
+        storage.create()
+    # Same pooled WAL engine, but every upsert commits on its own
+    wal_database = SqliteDatabase(os.path.join(workdir, "wal.db"))
+    wal_only = [TunedSqliteAgentStorage(table, wal_database, batch_writes=False) for table in TABLES]
+    for storage in wal_only:
+        storage.create()
+
+    print(f"{args.threads} threads x {args.writes} session upserts, {args.payload} byte messages")
+    variants = [
+        ("stock", plain, None),
+        ("wal", wal_only, None),
+        ("tuned", tuned, database.flush),
+    ]
+    for name, storages, flush in variants:
+        result = run(storages, args.threads, args.writes, args.payload, flush)
+        print(
+            f"{name:>6}: p50 {result['p50_ms']:7.2f} ms   p99 {result['p99_ms']:7.2f} ms   "
+            f"failed {result['failed']:4d}   total {result['total_s']:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
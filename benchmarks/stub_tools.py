@@ -0,0 +1,136 @@
+"""Offline stand-ins for the network calls behind the agents' tools.
+
+`install()` patches DuckDuckGo (`DDGS.text/news/videos`), the YouTube
+transcript API and oEmbed lookup used by `agno_shared.youtube_cache`, and
+`yfinance.Ticker` and `yfinance.download`. Each answers with canned data after `latency` seconds.
+The tool classes and the caches in front of them are left alone, so a
+benchmark still exercises the apps' own caching.
+"""
+
+import io
+import json
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+_state = {"latency": 0.05}
+
+
+def _wait():
+    time.sleep(_state["latency"])
+
+
+def _text_results(keywords, max_results=5, **_):
+    _wait()
+    return [
+        {
+            "title": f"{keywords} - result {i + 1}",
+            "href": f"https://example.org/{i + 1}/{'-'.join(str(keywords).split()[:4])}",
+            "body": f"Evidence summary {i + 1} about {keywords}: protein, recovery and training volume.",
+        }
+        for i in range(max_results or 5)
+    ]
+
+
+def _news_results(keywords, max_results=5, **_):
+    _wait()
+    return [
+        {
+            "date": "2024-01-01T00:00:00+00:00",
+            "title": f"News about {keywords} ({i + 1})",
+            "body": f"Latest report {i + 1} on {keywords}.",
+            "url": f"https://news.example.org/{i + 1}",
+            "source": "Example News",
+        }
+        for i in range(max_results or 5)
+    ]
+
+
+def _video_results(keywords, max_results=10, **_):
+    _wait()
+    return [
+        {
+            "title": f"{keywords} workout {i + 1}",
+            "content": f"https://www.youtube.com/watch?v=stubvideo{i:02d}",
+            "description": f"A follow-along {keywords} session.",
+            "duration": f"{10 + i}:00",
+            "publisher": "YouTube",
+        }
+        for i in range(max_results or 10)
+    ]
+
+
+class StubTranscriptApi:
+    @staticmethod
+    def get_transcript(video_id, **_):
+        _wait()
+        words = "keep your chest up drive through the heels brace the core and control the descent".split()
+        return [
+            {"text": " ".join(words[i % 8 : i % 8 + 6]), "start": i * 4.0, "duration": 4.0}
+            for i in range(300)
+        ]
+
+
+@contextmanager
+def _urlopen(url, *args, **kwargs):
+    _wait()
+    yield io.BytesIO(
+        json.dumps(
+            {"title": "Stub fitness video", "author_name": "Stub Coach", "type": "video", "provider_name": "YouTube"}
+        ).encode()
+    )
+
+
+class StubTicker:
+    def __init__(self, symbol):
+        _wait()
+        self.symbol = symbol
+        self.info = {
+            "symbol": symbol,
+            "shortName": f"{symbol} Inc.",
+            "regularMarketPrice": 123.45,
+            "currentPrice": 123.45,
+            "currency": "USD",
+            "sector": "Technology",
+            "industry": "Semiconductors",
+            "marketCap": 1_000_000_000,
+            "trailingPE": 30.1,
+            "longBusinessSummary": f"{symbol} makes things.",
+        }
+        self.news = [{"title": f"{symbol} headline {i}", "link": f"https://news.example.org/{symbol}/{i}"} for i in range(5)]
+        self.recommendations = pd.DataFrame(
+            {"period": ["0m", "-1m"], "strongBuy": [10, 9], "buy": [20, 21], "hold": [5, 5], "sell": [1, 1], "strongSell": [0, 0]}
+        )
+        self.financials = pd.DataFrame({"2024": [1.0, 2.0]}, index=["Total Revenue", "Net Income"])
+
+    def history(self, period="1mo", interval="1d", **_):
+        index = pd.date_range("2024-01-01", periods=20, freq="D")
+        return pd.DataFrame({"Open": 100.0, "High": 110.0, "Low": 95.0, "Close": 105.0, "Volume": 1000}, index=index)
+
+
+def _download(tickers, period="5d", interval="1d", **_):
+    _wait()
+    symbols = tickers.split() if isinstance(tickers, str) else list(tickers)
+    index = pd.date_range("2024-01-01", periods=5, freq="D")
+    columns = pd.MultiIndex.from_product([["Open", "High", "Low", "Close", "Volume"], symbols])
+    return pd.DataFrame(
+        [[100.0 + day] * len(columns) for day in range(len(index))], index=index, columns=columns
+    )
+
+
+def install(latency: float = 0.05) -> None:
+    """Replace the network calls of every tool the apps use."""
+    from agno.tools import yfinance as agno_yfinance
+    from duckduckgo_search import DDGS
+
+    from agno_shared import youtube_cache
+
+    _state["latency"] = latency
+    DDGS.text = lambda self, keywords, *args, **kwargs: _text_results(keywords, **kwargs)
+    DDGS.news = lambda self, keywords, *args, **kwargs: _news_results(keywords, **kwargs)
+    DDGS.videos = lambda self, keywords, *args, **kwargs: _video_results(keywords, **kwargs)
+    youtube_cache.YouTubeTranscriptApi = StubTranscriptApi
+    youtube_cache.urlopen = _urlopen
+    agno_yfinance.yf.Ticker = StubTicker
+    agno_yfinance.yf.download = _download
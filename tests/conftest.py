@@ -0,0 +1,16 @@
+import os
+import sys
+
+# The shared package lives in the repository root (agno_shared/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from agno_shared import tracing  # noqa: E402
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_trace_file():
+    # Spans stay in memory instead of going to tmp/traces.jsonl, including those
+    # of background jobs that finish after their test
+    tracing.get_tracer().exporter = None
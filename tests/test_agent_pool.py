@@ -0,0 +1,66 @@
+from agno.agent import Agent
+
+from agno_shared import agent_pool as agent_pool_module
+from agno_shared.agent_pool import SessionAgentPool, bind_session
+
+
+def build_agent():
+    build_agent.calls += 1
+    return Agent(name="Web Agent", instructions=["Always include sources"])
+
+
+def test_each_session_gets_its_own_clone_of_one_template():
+    build_agent.calls = 0
+    pool = SessionAgentPool({"web-agent": build_agent})
+
+    first = pool.get("web-agent", "session-1")
+    second = pool.get("web-agent", "session-2")
+
+    assert first is not second
+    assert (first.session_id, second.session_id) == ("session-1", "session-2")
+    assert first.instructions == second.instructions == ["Always include sources"]
+    assert pool.get("web-agent", "session-1") is first
+    assert build_agent.calls == 1
+    assert pool.stats() == {"active": 2, "created": 2, "evicted": 0}
+
+
+def test_templates_are_not_built_until_used():
+    build_agent.calls = 0
+
+    SessionAgentPool({"web-agent": build_agent})
+
+    assert build_agent.calls == 0
+
+
+def test_least_recently_used_sessions_are_evicted_past_max_size():
+    pool = SessionAgentPool({"web-agent": Agent(name="Web Agent")}, max_size=2)
+    first = pool.get("web-agent", "session-1")
+    pool.get("web-agent", "session-2")
+    pool.get("web-agent", "session-1")
+
+    pool.get("web-agent", "session-3")
+
+    assert pool.get("web-agent", "session-1") is first
+    assert pool.stats() == {"active": 2, "created": 3, "evicted": 1}
+
+
+def test_idle_sessions_are_evicted_after_the_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(agent_pool_module.time, "monotonic", lambda: now)
+    pool = SessionAgentPool({"web-agent": Agent(name="Web Agent")}, idle_ttl=60)
+    idle = pool.get("web-agent", "idle-session")
+
+    now += 61
+    pool.get("web-agent", "active-session")
+
+    assert pool.stats()["evicted"] == 1
+    assert pool.get("web-agent", "idle-session") is not idle
+
+
+def test_bind_session_drops_state_from_earlier_runs():
+    agent = Agent(name="Web Agent", session_id="old", stream=True)
+    agent.run_id = "run-1"
+
+    bind_session(agent, "new")
+
+    assert (agent.session_id, agent.run_id, agent.stream) == ("new", None, None)
@@ -0,0 +1,58 @@
+import pytest
+
+from agno_shared.chat_history import ChatArchive, ChatHistory
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return ChatArchive(db_file=str(tmp_path / "chat_history.db"))
+
+
+def conversation(archive, count, **kwargs):
+    history = ChatHistory(archive, **kwargs)
+    for i in range(count):
+        history.append("user" if i % 2 == 0 else "assistant", f"message {i}")
+    return history
+
+
+def test_older_messages_move_to_the_archive(archive):
+    history = conversation(archive, 7, max_in_memory=3, page_size=2)
+
+    assert len(history) == 7
+    assert history.archived == 4
+    assert [m["content"] for m in history.recent()] == ["message 4", "message 5", "message 6"]
+    # A range across the archive and memory reads both, in order
+    assert [m["content"] for m in history.read(2, 6)] == ["message 2", "message 3", "message 4", "message 5"]
+
+
+def test_clear_starts_a_new_conversation_and_empties_the_archive(archive):
+    history = conversation(archive, 5, max_in_memory=2, page_size=2)
+    old_id = history.conversation_id
+
+    history.clear()
+
+    assert len(history) == 0
+    assert history.conversation_id != old_id
+    assert archive.read(old_id, 0, 5) == []
+
+
+def test_blocks_are_rendered_once(archive, monkeypatch):
+    history = conversation(archive, 6, max_in_memory=2, page_size=2)
+    reads = []
+    read = history.read
+    monkeypatch.setattr(history, "read", lambda start, end: reads.append(start) or read(start, end))
+
+    first = history.block(0, 2)
+    assert history.block(0, 2) == first == "**You:** message 0\n\n---\n\n**Assistant:** message 1"
+    assert reads == [0]
+
+
+def test_the_least_recently_used_block_is_evicted(archive):
+    history = conversation(archive, 8, max_in_memory=2, page_size=2, max_blocks=2)
+
+    history.block(0, 2)
+    history.block(2, 4)
+    history.block(0, 2)  # Now the most recently used
+    history.block(4, 6)
+
+    assert list(history._blocks) == [(0, 2), (4, 6)]
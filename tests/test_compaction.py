@@ -0,0 +1,132 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from agno.tools.function import FunctionCall
+from agno.tools.toolkit import Toolkit
+
+from agno_shared import compaction
+from agno_shared.compaction import (
+    CompactionStats,
+    compact,
+    compact_tool_calls,
+    compact_tool_result,
+    fit_to_budget,
+    rank_chunks,
+)
+from agno_shared.history import estimate_tokens
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    stats = CompactionStats()
+    monkeypatch.setattr(compaction, "get_default_stats", lambda: stats)
+    return stats
+
+
+def test_search_results_drop_repeated_urls_and_snippets():
+    results = [
+        {"title": "Protein guide", "href": "https://www.example.com/protein/", "body": "Eat 1.6 g/kg a day."},
+        {"title": "Same page", "href": "http://example.com/protein#top", "body": "Something else entirely."},
+        {"title": "Copy", "href": "https://copy.example", "body": "Eat 1.6 g/kg a day!"},
+        {"title": "Long", "href": "https://long.example", "body": "word " * 200},
+    ]
+
+    lines = compact("duckduckgo_search", json.dumps(results)).splitlines()
+
+    assert lines[0] == "- Protein guide <https://www.example.com/protein/>: Eat 1.6 g/kg a day."
+    assert len(lines) == 2
+    assert lines[1].startswith("- Long <https://long.example>: word") and lines[1].endswith("…")
+
+
+def test_company_info_keeps_the_fields_the_agents_use():
+    info = {"Name": "Apple", "Symbol": "AAPL", "Address": "One Apple Park Way", "EPS": 6.1, "Sector": None}
+
+    assert compact("get_company_info", json.dumps(info)) == "Name: Apple\nSymbol: AAPL\nEPS: 6.1"
+
+
+def test_transcripts_keep_the_excerpts_about_the_question_in_video_order():
+    lines = [f"{i}:00 - " + ("warm up and stretch " * 10) for i in range(30)]
+    lines[7] = "7:00 - " + "keep your knees over your toes in a deep squat " * 4
+    lines[20] = "20:00 - " + "squat depth and knees " * 10
+    transcript = "\n".join(lines)
+
+    # Three lines to a chunk, and room for two chunks
+    question = "How far should my knees go in a squat?"
+    compacted = compact("get_youtube_video_captions", transcript, question, budget=350)
+
+    assert compacted.startswith("[2 of 10 transcript excerpts]")
+    assert compacted.index("\n7:00 - ") < compacted.index("[...]") < compacted.index("\n20:00 - ")
+    assert estimate_tokens(compacted) <= 360
+
+
+def test_chunks_without_a_match_are_spread_over_the_video():
+    order = rank_chunks(["a", "b", "c", "d"], "unrelated question")
+
+    assert order == [0, 2, 1, 3]
+
+
+def test_results_in_another_shape_are_only_cut_to_the_budget():
+    error = "Error fetching company info for XYZ\n" + "details\n" * 500
+
+    compacted = compact("get_company_info", error, budget=50)
+
+    assert compacted == fit_to_budget(error, 50)
+    assert compacted.startswith("Error fetching company info for XYZ\n")
+    assert compacted.endswith("tokens omitted]")
+
+
+class SearchTools(Toolkit):
+    def __init__(self):
+        super().__init__(name="search_tools")
+        self.register(self.duckduckgo_search)
+        compact_tool_calls(self)
+
+    def duckduckgo_search(self, query: str) -> str:
+        """Search the web.
+
+        Args:
+            query (str): The query.
+        """
+        results = [{"title": query, "href": f"https://example.com/{i}", "body": f"result {i}"} for i in (0, 1)]
+        return json.dumps(results)
+
+
+def test_model_tool_calls_are_compacted_and_counted(stats):
+    function = SearchTools().functions["duckduckgo_search"]
+    function.process_entrypoint()
+    call = FunctionCall(function=function, arguments={"query": "squats"})
+
+    assert call.execute()
+
+    assert call.result.splitlines() == [
+        "- squats <https://example.com/0>: result 0",
+        "- squats <https://example.com/1>: result 1",
+    ]
+    assert stats.summary()["duckduckgo_search"]["calls"] == 1
+    assert stats.summary()["duckduckgo_search"]["after"] < stats.summary()["duckduckgo_search"]["before"]
+
+
+def test_the_question_is_the_agents_current_input(monkeypatch, stats):
+    questions = []
+
+    def fake_compact(tool, result, question):
+        questions.append(question)
+        return result
+
+    monkeypatch.setattr(compaction, "compact", fake_compact)
+    function = SearchTools().functions["duckduckgo_search"]
+    function.process_entrypoint()
+    function._agent = SimpleNamespace(run_input="best squat cues")
+
+    FunctionCall(function=function, arguments={"query": "squats"}).execute()
+
+    assert questions == ["best squat cues"]
+
+
+def test_compaction_can_be_turned_off(monkeypatch, stats):
+    monkeypatch.setattr(compaction, "COMPACTION_ENABLED", False)
+    result = json.dumps({"Name": "Apple", "Address": "One Apple Park Way"})
+
+    assert compact_tool_result("get_company_info", result) == result
+    assert stats.summary() == {}
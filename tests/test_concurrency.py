@@ -0,0 +1,68 @@
+import copy
+import threading
+import time
+
+import pytest
+
+from agno_shared import concurrency
+from agno_shared.concurrency import CappedOllama, iter_parallel, model_slot, run_parallel
+
+
+def test_run_parallel_returns_results_by_name():
+    results = run_parallel({"dietary": lambda: "meals", "fitness": lambda: "workouts"})
+
+    assert results == {"dietary": "meals", "fitness": "workouts"}
+
+
+def test_run_parallel_finishes_every_task_before_raising_the_first_failure():
+    finished = []
+
+    def fail():
+        raise ValueError("dietary failed")
+
+    def slow():
+        time.sleep(0.05)
+        finished.append("fitness")
+        return "workouts"
+
+    with pytest.raises(ValueError, match="dietary failed"):
+        run_parallel({"dietary": fail, "fitness": slow})
+    assert finished == ["fitness"]
+
+
+def test_iter_parallel_yields_in_completion_order():
+    tasks = {"slow": lambda: time.sleep(0.1), "fast": lambda: None}
+
+    assert [name for name, _ in iter_parallel(tasks, max_concurrency=2)] == ["fast", "slow"]
+
+
+def test_model_slots_cap_concurrent_requests_across_callers(monkeypatch):
+    monkeypatch.setattr(concurrency, "_model_slots", threading.BoundedSemaphore(2))
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def request():
+        with model_slot():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    # Three "sessions", each asking for more parallel calls than the cap
+    run_parallel({f"session {i}": lambda: run_parallel({j: request for j in range(3)}) for i in range(3)}, 3)
+
+    assert peak[0] == 2
+
+
+def test_copies_of_a_capped_model_share_the_client_only():
+    model = CappedOllama(id="llama3.2")
+    client = model.get_client()
+
+    clone = copy.deepcopy(model)
+
+    assert clone.get_client() is client
+    assert clone is not model
+    clone.id = "qwen2.5"
+    assert model.id == "llama3.2"
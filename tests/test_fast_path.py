@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from agno_shared.fast_path import plan_tool_calls, tickers
+
+
+def agent(*tools):
+    return SimpleNamespace(tools=list(tools))
+
+
+def test_tickers_take_cashtags_only():
+    assert tickers("Is AI in the USA worth more than $nvda or $BRK.B?") == ["NVDA", "BRK.B"]
+    assert tickers("What is the NVDA price?") == []
+
+
+def test_tickers_deduplicate_and_limit():
+    assert tickers("$AAPL $aapl $MSFT $GOOG $AMZN", limit=3) == ["AAPL", "MSFT", "GOOG"]
+
+
+def test_tickers_ignore_prices_and_embedded_dollars():
+    assert tickers("It costs $5, or US$20 in a$b") == []
+
+
+def test_plan_tool_calls_batches_finance_symbols():
+    from agno_shared.finance_cache import BatchedFinanceTools, TickerCache
+
+    finance = BatchedFinanceTools(analyst_recommendations=True, company_news=True, cache=TickerCache())
+
+    calls = plan_tool_calls(agent(finance), "Compare $NVDA and $AMD analyst ratings")
+
+    assert [(call.name, call.kwargs) for call in calls] == [
+        ("get_current_stock_price", {"symbols": "NVDA,AMD"}),
+        ("get_analyst_recommendations", {"symbols": "NVDA,AMD"}),
+    ]
+
+
+def test_plan_tool_calls_fetch_video_data_and_captions():
+    from agno_shared.youtube_cache import CachedYouTubeTools
+
+    url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+    calls = plan_tool_calls(agent(CachedYouTubeTools(cache=object())), f"Summarize {url}")
+
+    assert [(call.name, call.kwargs) for call in calls] == [
+        ("get_youtube_video_data", {"url": url}),
+        ("get_youtube_video_captions", {"url": url}),
+    ]
+
+
+def test_plan_tool_calls_search_only_when_asked():
+    from agno_shared.search_cache import CachedDuckDuckGoTools, SearchCache
+
+    search = CachedDuckDuckGoTools(cache=SearchCache(), news=True)
+
+    assert plan_tool_calls(agent(search), "What are the health benefits of creatine?") == []
+    assert plan_tool_calls(agent(search), "hello there my friend") == []
+    calls = plan_tool_calls(agent(search), "Search for the latest creatine news")
+    assert [call.name for call in calls] == ["duckduckgo_search", "duckduckgo_news"]
+
+
+def test_plan_tool_calls_leave_agents_without_matching_tools_to_the_model():
+    assert plan_tool_calls(agent(), "Search for $NVDA news") == []
@@ -0,0 +1,143 @@
+import datetime
+import threading
+
+import pytest
+
+from agno_shared import finance_cache
+from agno_shared.finance_cache import (
+    NEWS_TTL_SECONDS,
+    PRICE_TTL_SECONDS,
+    TickerCache,
+    market_is_open,
+    market_timezone,
+    market_ttl,
+    parse_symbols,
+    seconds_until_open,
+)
+
+
+def eastern(day, hour, minute=0, second=0):
+    # October 2026: the 14th is a Wednesday, the 16th a Friday
+    return datetime.datetime(2026, 10, day, hour, minute, second, tzinfo=market_timezone())
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = [eastern(14, 10).timestamp()]
+    monkeypatch.setattr(finance_cache.time, "time", lambda: clock[0])
+    return clock
+
+
+def test_parse_symbols_accepts_lists_and_cashtags():
+    assert parse_symbols("aapl, $MSFT;nvda AAPL") == ["AAPL", "MSFT", "NVDA"]
+    assert parse_symbols(["goog", " "]) == ["GOOG"]
+
+
+def test_seconds_until_open_skips_the_night_and_the_weekend():
+    assert market_is_open(eastern(14, 10))
+    assert seconds_until_open(eastern(14, 10)) == 0
+    assert seconds_until_open(eastern(14, 8)) == 90 * 60
+    assert seconds_until_open(eastern(14, 16)) == 17.5 * 60 * 60
+    # Friday evening to Monday morning
+    assert seconds_until_open(eastern(16, 17)) == (2 * 24 + 16.5) * 60 * 60
+
+
+def test_prices_are_kept_until_the_next_open_outside_trading_hours():
+    assert market_ttl("price", eastern(14, 10)) == PRICE_TTL_SECONDS
+    assert market_ttl("price", eastern(14, 16)) == 17.5 * 60 * 60
+    assert market_ttl("news", eastern(14, 16)) == NEWS_TTL_SECONDS
+
+
+def test_only_missing_and_expired_symbols_are_fetched(clock):
+    cache = TickerCache()
+    calls = []
+
+    def fetch(symbols):
+        calls.append(symbols)
+        return {s: {"price": 1.0} for s in symbols if s != "NOPE"}
+
+    cache.get_many("price", ["AAPL", "MSFT", "NOPE"], fetch)
+    records = cache.get_many("price", ["MSFT", "NVDA", "NOPE"], fetch)
+    clock[0] += PRICE_TTL_SECONDS + 1
+    cache.get_many("price", ["AAPL"], fetch)
+
+    assert calls == [["AAPL", "MSFT", "NOPE"], ["NVDA", "NOPE"], ["AAPL"]]
+    assert list(records) == ["MSFT", "NVDA"]
+    assert cache.stats() == {"hits": 1, "misses": 6, "fetches": 3, "collapsed": 0, "entries": 3}
+
+
+def test_the_ttl_is_taken_from_the_time_of_the_request(clock):
+    clock[0] = eastern(14, 15, 59, 30).timestamp()
+    cache = TickerCache()
+
+    def slow_download(symbols):
+        clock[0] += 60  # Finishes after the close
+        return {s: {"price": 1.0} for s in symbols}
+
+    cache.get_many("price", ["AAPL"], slow_download)
+    clock[0] = eastern(14, 16, 1).timestamp()
+    cache.get_many("price", ["AAPL"], slow_download)
+
+    # Prices from before the close are not kept overnight
+    assert cache.stats()["fetches"] == 2
+
+
+def test_symbols_in_flight_are_fetched_once(clock):
+    cache = TickerCache()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], {}
+
+    def slow_fetch(symbols):
+        calls.append(symbols)
+        started.set()
+        release.wait(5)
+        return {s: {"price": 1.0} for s in symbols}
+
+    def request(name, symbols):
+        results[name] = cache.get_many("price", symbols, slow_fetch)
+
+    first = threading.Thread(target=request, args=("first", ["AAPL", "MSFT"]))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=request, args=("second", ["MSFT", "NVDA"]))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert calls == [["AAPL", "MSFT"], ["NVDA"]]
+    assert list(results["second"]) == ["MSFT", "NVDA"]
+    assert cache.stats()["collapsed"] == 1
+
+
+def test_a_failed_fetch_reaches_the_waiters_and_is_not_cached(clock):
+    cache = TickerCache()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def failing_fetch(symbols):
+        started.set()
+        release.wait(5)
+        raise ConnectionError("Yahoo is down")
+
+    def request():
+        try:
+            cache.get_many("price", ["AAPL"], failing_fetch)
+        except ConnectionError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=request)]
+    threads[0].start()
+    started.wait(5)
+    threads.append(threading.Thread(target=request))
+    threads[1].start()
+    # The waiter has joined the fetch in flight
+    while cache.stats()["collapsed"] == 0:
+        threads[1].join(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == ["Yahoo is down", "Yahoo is down"]
+    retried = cache.get_many("price", ["AAPL"], lambda symbols: {"AAPL": {"price": 2.0}})
+    assert retried == {"AAPL": {"price": 2.0}}
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # The app keeps its databases under ./tmp
+    monkeypatch.chdir(tmp_path)
+
+
+def plan_page(plan_content):
+    def app(root, plan_content):
+        import os
+        import sys
+
+        sys.path[:0] = [os.path.join(root, "Agno_fitness_Agent"), root]
+        from fitness_coach import display_fitness_plan
+
+        display_fitness_plan(plan_content)
+
+    return AppTest.from_function(app, args=(ROOT, plan_content)).run(timeout=60)
+
+
+def test_recommended_videos_stay_in_the_pro_tips_column():
+    video = {"title": "Squat Form", "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "description": "Depth"}
+
+    page = plan_page({"goals": "Strength", "routine": "Squats", "tips": "Warm up", "video_resources": [video]})
+
+    routine, tips = page.expander[0].columns
+    assert [m.value for m in tips.markdown][:2] == ["### 💡 Pro Tips", "### 🎥 Recommended Videos"]
+    assert "Squat Form" in tips.markdown[2].value
+    assert all("Recommended Videos" not in m.value for m in routine.markdown)
+
+
+def test_videos_still_being_found_are_noted_in_the_same_column():
+    page = plan_page({"goals": "Strength", "routine": "Squats", "tips": "Warm up"})
+
+    routine, tips = page.expander[0].columns
+    assert [c.value for c in tips.caption] == ["🎥 Finding videos for your routine..."]
+    assert not routine.caption
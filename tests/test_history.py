@@ -0,0 +1,87 @@
+from agno.memory.agent import AgentRun
+from agno.models.message import Message
+from agno.run.response import RunResponse
+
+from agno_shared.history import (
+    TokenBudgetMemory,
+    estimate_tokens,
+    history_budget,
+    message_tokens,
+    shorten_tool_result,
+)
+
+
+def run(question, answer, tool_result=None):
+    messages = [Message(role="user", content=question)]
+    if tool_result is not None:
+        messages.append(Message(role="tool", content=tool_result))
+    messages.append(Message(role="assistant", content=answer))
+    return AgentRun(response=RunResponse(messages=messages))
+
+
+def memory(runs, **kwargs):
+    memory = TokenBudgetMemory(**kwargs)
+    memory.runs = runs
+    return memory
+
+
+def test_history_budget_by_model_family():
+    assert history_budget("qwen2.5:7b") == 3000
+    assert history_budget("llama3.2") == 1500
+    assert history_budget("unknown-model:1b") == 1500
+
+
+def test_every_run_is_replayed_while_it_fits():
+    history = memory([run("q1", "a1"), run("q2", "a2")], token_budget=1000)
+
+    messages = history.get_messages_from_last_n_runs(last_n=1)
+
+    assert [m.content for m in messages] == ["q1", "a1", "q2", "a2"]
+    assert history.history_stats["runs"] == 2
+    assert history.history_stats["saved_tokens"] == 0
+
+
+def test_long_tool_results_are_cut_oldest_first():
+    table = "\n".join(f"row {i}: " + "x" * 40 for i in range(50))
+    history = memory(
+        [run("q1", "a1", tool_result=table), run("q2", "a2", tool_result=table)],
+        token_budget=estimate_tokens(table) + 100,
+        max_tool_result_tokens=50,
+    )
+
+    messages = history.get_messages_from_last_n_runs()
+
+    first_result, second_result = [m.content for m in messages if m.role == "tool"]
+    assert first_result.startswith("row 0:")
+    assert "tokens of earlier tool output omitted" in first_result
+    assert second_result == table
+    assert history.history_stats["shortened_tool_results"] == 1
+    assert history.history_stats["dropped_runs"] == 0
+
+
+def test_oldest_runs_are_dropped_when_cutting_is_not_enough():
+    answer = "y" * 400
+    history = memory([run(f"q{i}", answer) for i in range(5)], token_budget=250)
+
+    messages = history.get_messages_from_last_n_runs()
+
+    assert [m.content for m in messages if m.role == "user"] == ["q3", "q4"]
+    assert history.history_stats["dropped_runs"] == 3
+    assert history.history_stats["history_tokens"] <= 250
+
+
+def test_max_runs_limits_the_window_and_skip_role_is_honoured():
+    history = memory([run(f"q{i}", f"a{i}") for i in range(5)], token_budget=1000, max_runs=2)
+
+    messages = history.get_messages_from_last_n_runs(skip_role="assistant")
+
+    assert [m.content for m in messages] == ["q3", "q4"]
+
+
+def test_shorten_tool_result_ends_on_a_whole_line():
+    message = Message(role="tool", content="first line\nsecond line\n" + "z" * 400)
+
+    shortened = shorten_tool_result(message, max_tokens=8)
+
+    assert shortened.content.startswith("first line\nsecond line\n[...")
+    assert message_tokens(shortened) < message_tokens(message)
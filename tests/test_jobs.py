@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from agno_shared.jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, report_progress
+
+
+def wait_for(queue, job_id, status=(DONE, FAILED)):
+    for _ in range(500):
+        job = queue.get(job_id)
+        if job.status in status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} is still {job.status}")
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / "jobs.db")
+
+
+@pytest.fixture
+def release():
+    release = threading.Event()
+    yield release
+    release.set()
+
+
+def blocking_queue(db_file, release, max_workers=2):
+    """A queue whose "plan" jobs wait for `release` and return their profile."""
+    queue = JobQueue(db_file=db_file, max_workers=max_workers)
+
+    def plan(params, session_id):
+        release.wait(5)
+        return {"profile": params["profile"], "session": session_id}
+
+    queue.register("plan", plan)
+    return queue
+
+
+def test_a_job_runs_in_the_background_and_returns_json(db_file, release):
+    queue = blocking_queue(db_file, release)
+
+    job = queue.submit("plan", {"profile": {"age": 30}}, session_id="s1")
+    assert job.status in (QUEUED, RUNNING)
+    release.set()
+
+    done = wait_for(queue, job.id)
+    assert done.status == DONE
+    assert done.result == {"profile": {"age": 30}, "session": "s1"}
+
+
+def test_resubmitting_a_profile_joins_the_running_job(db_file, release):
+    queue = blocking_queue(db_file, release)
+    profile = {"age": 30, "fitness_goals": "Strength"}
+
+    first = queue.submit("plan", {"profile": profile, "bypass_cache": False}, "s1", key_params=profile)
+    # A sidebar setting changed in between; the profile is the same
+    second = queue.submit("plan", {"profile": profile, "bypass_cache": True}, "s1", key_params=profile)
+
+    assert second.id == first.id
+    assert queue.stats()["coalesced"] == 1
+
+
+def test_different_profiles_and_sessions_get_their_own_jobs(db_file, release):
+    queue = blocking_queue(db_file, release, max_workers=4)
+
+    first = queue.submit("plan", {"profile": {"age": 30}}, "s1")
+    other_profile = queue.submit("plan", {"profile": {"age": 31}}, "s1")
+    other_session = queue.submit("plan", {"profile": {"age": 30}}, "s2")
+
+    assert len({first.id, other_profile.id, other_session.id}) == 3
+    assert queue.stats()["coalesced"] == 0
+
+
+def test_a_finished_job_is_not_joined(db_file, release):
+    queue = blocking_queue(db_file, release)
+    release.set()
+    first = queue.submit("plan", {"profile": {"age": 30}}, "s1")
+    wait_for(queue, first.id)
+
+    second = queue.submit("plan", {"profile": {"age": 30}}, "s1")
+
+    assert second.id != first.id
+
+
+def test_a_failed_job_keeps_its_partial_result(db_file):
+    queue = JobQueue(db_file=db_file)
+
+    def plan(params, session_id):
+        report_progress({"dietary_plan": "meals"})
+        raise RuntimeError("fitness plan failed")
+
+    queue.register("plan", plan)
+    job = wait_for(queue, queue.submit("plan", {}, "s1").id)
+
+    assert job.status == FAILED
+    assert job.error == "RuntimeError: fitness plan failed"
+    assert job.partial == {"dietary_plan": "meals"}
+
+
+def test_unknown_kinds_are_rejected(db_file):
+    with pytest.raises(KeyError):
+        JobQueue(db_file=db_file).submit("unknown", {})
+
+
+def test_resume_runs_jobs_an_earlier_process_left_unfinished(db_file, release):
+    stopped = blocking_queue(db_file, release, max_workers=1)
+    running = stopped.submit("plan", {"profile": {"age": 30}}, "s1")
+    queued = stopped.submit("plan", {"profile": {"age": 31}}, "s1")
+    wait_for(stopped, running.id, status=(RUNNING,))
+
+    # A new process opens the same jobs file
+    restarted = JobQueue(db_file=db_file)
+    restarted.register("plan", lambda params, session_id: {"resumed": params["profile"]})
+
+    assert restarted.resume() == [running.id, queued.id]
+    assert wait_for(restarted, running.id).result == {"resumed": {"age": 30}}
+    assert wait_for(restarted, queued.id).result == {"resumed": {"age": 31}}
@@ -0,0 +1,67 @@
+from agno_shared.plan_index import PlanIndex, split_sections
+
+DIETARY_PLAN = """## Breakfast
+Oatmeal with berries and Greek yogurt.
+
+## Lunch
+Grilled chicken salad with quinoa.
+
+## Snacks
+Almonds and an apple.
+"""
+
+FITNESS_PLAN = """**Day 1: Legs**
+Back squats 4x8, Romanian deadlifts 3x10.
+
+**Day 2: Push**
+Bench press 4x8, overhead press 3x10.
+
+**Day 3: Recovery**
+Light walking and mobility work.
+"""
+
+
+def index():
+    return PlanIndex.from_plans({"Dietary Plan": DIETARY_PLAN, "Fitness Plan": FITNESS_PLAN})
+
+
+def test_split_sections_at_markdown_and_bold_headings():
+    sections = split_sections(FITNESS_PLAN, "Fitness Plan")
+
+    assert [section.heading for section in sections] == ["Day 1: Legs", "Day 2: Push", "Day 3: Recovery"]
+    assert sections[0].text.startswith("**Day 1: Legs**\nBack squats")
+
+
+def test_long_sections_are_split_at_blank_lines():
+    text = "## Notes\n" + "\n\n".join("p" * 500 for _ in range(4))
+
+    sections = split_sections(text, "Plan", max_chars=1200)
+
+    assert len(sections) == 2
+    assert all(section.heading == "Notes" for section in sections)
+
+
+def test_search_returns_the_matching_sections():
+    (section,) = index().search("How many squats on leg day?", top_k=1)
+
+    assert section.heading == "Day 1: Legs"
+
+
+def test_search_keeps_plan_order_across_plans():
+    sections = index().search("chicken or bench press", top_k=2)
+
+    assert [(s.source, s.heading) for s in sections] == [("Dietary Plan", "Lunch"), ("Fitness Plan", "Day 2: Push")]
+
+
+def test_search_without_a_match_returns_the_opening_section_of_each_plan():
+    sections = index().search("zzz")
+
+    assert [(s.source, s.heading) for s in sections] == [("Dietary Plan", "Breakfast"), ("Fitness Plan", "Day 1: Legs")]
+
+
+def test_context_labels_sections_with_their_plan():
+    assert index().context("almonds", top_k=1) == "Dietary Plan:\n## Snacks\nAlmonds and an apple."
+
+
+def test_an_empty_index_finds_nothing():
+    assert PlanIndex.from_plans({"Dietary Plan": ""}).search("squats") == []
@@ -0,0 +1,63 @@
+from agno_shared.research import expand_query, fuse
+
+
+def result(url, title="", body=""):
+    return {"href": url, "title": title, "body": body}
+
+
+def test_fuse_ranks_sources_found_by_several_lists_first():
+    first = [result("https://a.example"), result("https://b.example"), result("https://c.example")]
+    second = [result("https://c.example"), result("https://d.example")]
+
+    sources = fuse([first, second])
+
+    # c is 3rd and 1st: 1/63 + 1/61 beats a's single 1/61
+    assert [source.url for source in sources] == [
+        "https://c.example",
+        "https://a.example",
+        "https://b.example",
+        "https://d.example",
+    ]
+    assert sources[0].score == 1 / 63 + 1 / 61
+
+
+def test_fuse_keeps_first_seen_order_for_equal_scores():
+    sources = fuse([[result("https://a.example")], [result("https://b.example")]])
+
+    assert [source.url for source in sources] == ["https://a.example", "https://b.example"]
+
+
+def test_fuse_deduplicates_urls_that_differ_only_in_form():
+    first = [result("https://www.example.com/page/", "Page")]
+    second = [result("http://example.com/page#section", "Same page"), result("https://other.example")]
+
+    sources = fuse([first, second])
+
+    assert [source.url for source in sources] == ["https://www.example.com/page/", "https://other.example"]
+    # The record is the one found first; the score adds up both lists
+    assert sources[0].title == "Page"
+    assert sources[0].score == 2 / 61
+
+
+def test_fuse_limits_and_skips_results_without_url():
+    ranked = [[result(f"https://{i}.example") for i in range(10)] + [{"title": "no url"}]]
+
+    sources = fuse(ranked, limit=3)
+
+    assert [source.url for source in sources] == ["https://0.example", "https://1.example", "https://2.example"]
+
+
+def test_fuse_reads_news_results_and_details():
+    news = [{"url": "https://news.example/a", "title": "A", "source": "Wire", "date": "2025-01-02T10:00:00"}]
+
+    (source,) = fuse([news])
+
+    assert source.url == "https://news.example/a"
+    assert source.details == "Wire, 2025-01-02"
+
+
+def test_expand_query_starts_with_the_question_and_caps_the_count():
+    queries = expand_query("Does creatine help recovery?", max_queries=3)
+
+    assert queries[0] == "Does creatine help recovery?"
+    assert len(queries) == 3
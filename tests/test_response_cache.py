@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agno_shared import response_cache as response_cache_module
+from agno_shared.response_cache import ResponseCache, cached_run
+
+
+class FakeAgent:
+    """Just the attributes the cache key reads, with a counting `run`."""
+
+    agent_id = "fake"
+    name = "Fake"
+    role = None
+    description = None
+    instructions = ["Be brief."]
+    expected_output = None
+    markdown = True
+    tools = []
+
+    def __init__(self, model_id="llama3.2"):
+        self.model = SimpleNamespace(id=model_id)
+        self.prompts = []
+
+    def run(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=f"answer to {prompt}")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(db_file=str(tmp_path / "responses.db"))
+
+
+def test_get_and_put_count_hits_and_misses(cache):
+    assert cache.get("k") is None
+    cache.put("k", "content")
+
+    assert cache.get("k") == "content"
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": len("content")}
+
+
+def test_empty_content_is_not_stored(cache):
+    cache.put("k", "")
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_expired_entries_are_dropped_on_read(cache, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(response_cache_module.time, "time", lambda: now)
+    cache.put("k", "content")
+
+    now += cache.ttl_seconds + 1
+
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(1_000_000, 2_000_000))
+    monkeypatch.setattr(response_cache_module.time, "time", lambda: float(next(clock)))
+    cache = ResponseCache(db_file=str(tmp_path / "responses.db"), max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+
+    cache.put("c", "3")
+
+    assert [cache.get(key) for key in ("a", "b", "c")] == ["1", None, "3"]
+
+
+def test_entries_are_evicted_to_fit_the_byte_budget(tmp_path):
+    cache = ResponseCache(db_file=str(tmp_path / "responses.db"), max_bytes=10)
+    cache.put("a", "x" * 6)
+    cache.put("b", "y" * 6)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 6
+
+
+def test_key_covers_model_prompt_and_context(cache):
+    agent = FakeAgent()
+    key = cache.key(agent, "prompt")
+
+    assert key == cache.key(FakeAgent(), "prompt")
+    assert key != cache.key(FakeAgent(model_id="qwen2.5"), "prompt")
+    assert key != cache.key(agent, "other prompt")
+    assert key != cache.key(agent, "prompt", context="earlier turns")
+
+
+def test_cached_run_reads_through_the_cache(cache):
+    agent = FakeAgent()
+
+    first = cached_run(agent, "plan", cache)
+    second = cached_run(agent, "plan", cache)
+
+    assert first.content == second.content == "answer to plan"
+    assert agent.prompts == ["plan"]
+
+
+def test_cached_run_bypass_asks_the_model_and_refreshes_the_entry(cache):
+    agent = FakeAgent()
+    cache.put(cache.key(agent, "plan"), "stale")
+
+    response = cached_run(agent, "plan", cache, bypass=True)
+
+    assert response.content == "answer to plan"
+    assert cache.get(cache.key(agent, "plan")) == "answer to plan"
+
+
+def test_cached_run_without_cache_runs_the_agent():
+    agent = FakeAgent()
+
+    cached_run(agent, "plan")
+    cached_run(agent, "plan")
+
+    assert agent.prompts == ["plan", "plan"]
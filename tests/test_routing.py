@@ -0,0 +1,37 @@
+from agno_shared.routing import ModelRouter, load_policies, supports_tools
+
+
+def test_short_steps_go_to_the_small_model():
+    router = ModelRouter("qwen2.5:14b", small_model="llama3.2:3b")
+
+    assert router.model_for("plan", "videos") == "llama3.2:3b"
+    assert router.model_for("plan", "dietary") == "qwen2.5:14b"
+    assert router.model_for("unknown tab", "step") == "qwen2.5:14b"
+
+
+def test_disabled_routing_always_uses_the_chosen_model():
+    router = ModelRouter("qwen2.5:14b", small_model="llama3.2:3b", enabled=False)
+
+    assert router.models() == {"qwen2.5:14b"}
+
+
+def test_tool_steps_fall_back_when_the_chosen_model_cannot_call_tools():
+    assert not supports_tools("deepseek-r1:7b")
+
+    router = ModelRouter("deepseek-r1:7b", small_model="llama3.2:3b")
+
+    assert router.model_for("video_analysis", "analysis") == "llama3.2:3b"
+    assert router.model_for("plan", "dietary") == "deepseek-r1:7b"
+
+
+def test_policies_can_be_overridden_from_the_environment(monkeypatch):
+    monkeypatch.setenv("MODEL_ROUTING_POLICY", '{"plan": {"videos": "chosen"}, "new": {"step": "small"}}')
+
+    policies = load_policies()
+
+    assert policies["plan"] == {"dietary": "chosen", "fitness": "chosen", "videos": "chosen"}
+    assert policies["new"] == {"step": "small"}
+    assert ModelRouter("qwen2.5:14b", small_model="llama3.2:3b", policies=policies).models() == {
+        "qwen2.5:14b",
+        "llama3.2:3b",
+    }
@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agno_shared import search_cache as search_cache_module
+from agno_shared.query import normalize_query
+from agno_shared.search_cache import CachedDuckDuckGoTools, SearchCache
+
+
+def test_normalize_query_drops_case_punctuation_and_stopwords():
+    assert normalize_query("What is the best protein intake?") == "best protein intake"
+    assert normalize_query("  BEST protein   intake ") == "best protein intake"
+    assert normalize_query("What is it?") == "what is it"
+
+
+def test_results_are_reused_until_they_expire(monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(search_cache_module.time, "time", lambda: now)
+    cache = SearchCache()
+    calls = []
+
+    def fetch():
+        calls.append(now)
+        return f"results at {now}"
+
+    assert cache.get_or_fetch(("search", "q"), 60, fetch) == "results at 1000000.0"
+    assert cache.get_or_fetch(("search", "q"), 60, fetch) == "results at 1000000.0"
+    now += 61
+    assert cache.get_or_fetch(("search", "q"), 60, fetch) == "results at 1000061.0"
+
+    assert len(calls) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2, "collapsed": 0, "entries": 1}
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = SearchCache(max_entries=2)
+    cache.get_or_fetch("a", 60, lambda: "a")
+    cache.get_or_fetch("b", 60, lambda: "b")
+    cache.get_or_fetch("a", 60, lambda: "a again")
+    cache.get_or_fetch("c", 60, lambda: "c")
+
+    assert cache.get_or_fetch("a", 60, lambda: "a again") == "a"
+    assert cache.get_or_fetch("b", 60, lambda: "b again") == "b again"
+
+
+def test_concurrent_identical_searches_run_once():
+    cache = SearchCache()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "results"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(cache.get_or_fetch, "q", 60, fetch) for _ in range(4)]
+        while cache.stats()["collapsed"] < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result(5) for future in futures]
+
+    assert results == ["results"] * 4
+    assert len(calls) == 1
+    assert cache.stats()["collapsed"] == 3
+
+
+def test_a_failed_fetch_reaches_every_waiter_and_is_not_cached():
+    cache = SearchCache()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError("rate limited")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(cache.get_or_fetch, "q", 60, fail) for _ in range(2)]
+        while cache.stats()["collapsed"] < 1:
+            time.sleep(0.01)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="rate limited"):
+                future.result(5)
+
+    assert cache.get_or_fetch("q", 60, lambda: "results") == "results"
+
+
+def test_tools_share_entries_for_equivalent_queries(monkeypatch):
+    queries = []
+
+    def search(self, query, max_results=5):
+        queries.append(query)
+        return f"results for {query}"
+
+    monkeypatch.setattr(search_cache_module.DuckDuckGoTools, "duckduckgo_search", search)
+    tools = CachedDuckDuckGoTools(cache=SearchCache())
+
+    first = tools.duckduckgo_search("What is the best protein intake?")
+    second = tools.duckduckgo_search("best protein intake")
+
+    assert first == second
+    assert queries == ["What is the best protein intake?"]
+
+
+def test_news_and_search_results_are_kept_apart(monkeypatch):
+    monkeypatch.setattr(search_cache_module.DuckDuckGoTools, "duckduckgo_search", lambda self, q, n=5: "search")
+    monkeypatch.setattr(search_cache_module.DuckDuckGoTools, "duckduckgo_news", lambda self, q, n=5: "news")
+    tools = CachedDuckDuckGoTools(cache=SearchCache())
+
+    assert tools.duckduckgo_search("creatine") == "search"
+    assert tools.duckduckgo_news("creatine") == "news"
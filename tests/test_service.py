@@ -0,0 +1,116 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from agno_shared.service import RunQueue, RunRequest, _stream_run
+
+
+def test_run_queue_rejects_with_retry_after_once_full():
+    async def scenario():
+        queue = RunQueue(max_concurrency=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def run():
+            async with queue.slot():
+                await release.wait()
+
+        running = asyncio.ensure_future(run())
+        queued = asyncio.ensure_future(run())
+        await asyncio.sleep(0)
+        assert queue.stats()["active"] == 1 and queue.stats()["waiting"] == 1
+
+        with pytest.raises(HTTPException) as rejected:
+            queue.check()
+        release.set()
+        await asyncio.gather(running, queued)
+        queue.check()
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+
+    assert rejected.status_code == 429
+    assert rejected.headers == {"Retry-After": "5"}
+
+
+def test_run_queue_frees_the_slot_when_a_run_fails():
+    async def scenario():
+        queue = RunQueue(max_concurrency=1, max_queue=0)
+        with pytest.raises(RuntimeError):
+            async with queue.slot():
+                raise RuntimeError("model error")
+        async with queue.slot():
+            return queue.stats()
+
+    assert asyncio.run(scenario())["active"] == 1
+
+
+class SlowStreamAgent:
+    """An agent whose streamed run takes `step_seconds` per chunk in the worker thread."""
+
+    def __init__(self, step_seconds):
+        self.step_seconds = step_seconds
+        self.running = False
+        self.closed = False
+
+    def run(self, prompt, **kwargs):
+        try:
+            for word in ("one", "two", "three"):
+                self.running = True
+                time.sleep(self.step_seconds)
+                self.running = False
+                yield SimpleNamespace(event="RunResponse", content=word)
+        finally:
+            self.closed = True
+
+
+class RecordingPool:
+    def __init__(self, agent):
+        self.agent = agent
+        self.released = []
+        self.acquire_threads = []
+
+    def acquire(self, session_id):
+        self.acquire_threads.append(threading.current_thread())
+        return self.agent
+
+    def release(self, agent):
+        # What the next request would find if it checked this agent out
+        self.released.append({"running": agent.running, "closed": agent.closed})
+
+
+def test_stream_run_acquires_off_the_event_loop_and_streams_every_chunk():
+    pool = RecordingPool(SlowStreamAgent(step_seconds=0))
+
+    async def scenario():
+        request = RunRequest(prompt="hi", session_id="s1", stream=True)
+        return [json.loads(line) async for line in _stream_run(pool, request)]
+
+    lines = asyncio.run(scenario())
+
+    assert [line["content"] for line in lines] == ["one", "two", "three"]
+    assert pool.acquire_threads[0] is not threading.main_thread()
+    assert pool.released == [{"running": False, "closed": True}]
+
+
+def test_stream_run_disconnect_releases_the_agent_only_once_idle():
+    pool = RecordingPool(SlowStreamAgent(step_seconds=0.2))
+
+    async def scenario():
+        request = RunRequest(prompt="hi", session_id="s2", stream=True)
+        stream = _stream_run(pool, request)
+        await stream.__anext__()
+        # The client goes away while the second chunk is being produced
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.05)
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+
+    asyncio.run(scenario())
+
+    assert pool.released == [{"running": False, "closed": True}]
@@ -0,0 +1,103 @@
+import pytest
+from agno.storage.session.agent import AgentSession
+from sqlalchemy import text
+
+from agno_shared import storage as storage_module
+from agno_shared.storage import SqliteDatabase, TunedSqliteAgentStorage
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    # Keep the background writer asleep, so the tests decide when to flush
+    monkeypatch.setattr(storage_module, "BATCH_MS", 60_000)
+    return SqliteDatabase(str(tmp_path / "agents.db"))
+
+
+@pytest.fixture
+def storage(database):
+    storage = TunedSqliteAgentStorage("web_agent", database, batch_writes=True)
+    storage.create()
+    return storage
+
+
+def session(session_id, turns):
+    return AgentSession(session_id=session_id, agent_id="web-agent", memory={"turns": turns})
+
+
+def stored(storage, session_id):
+    """The session as written to the database, ignoring anything still queued."""
+    return super(TunedSqliteAgentStorage, storage).read(session_id)
+
+
+def test_connections_use_wal_and_the_configured_sync_mode(database):
+    with database.engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+
+
+def test_upserts_are_queued_and_readable_before_they_are_written(storage):
+    storage.upsert(session("s1", 1))
+
+    assert stored(storage, "s1") is None
+    assert storage.read("s1").memory == {"turns": 1}
+
+
+def test_flush_writes_the_latest_upsert_of_each_session(storage, database):
+    storage.upsert(session("s1", 1))
+    storage.upsert(session("s1", 2))
+    storage.upsert(session("s2", 1))
+
+    database.flush()
+
+    assert stored(storage, "s1").memory == {"turns": 2}
+    assert stored(storage, "s2").memory == {"turns": 1}
+    assert database.pending("web_agent", "s1") is None
+
+
+def test_a_failed_batch_is_kept_for_the_next_flush(storage, database, monkeypatch):
+    storage.upsert(session("s1", 1))
+    monkeypatch.setattr(storage, "upsert_statement", lambda session: text("INSERT INTO missing VALUES (1)"))
+    database.flush()
+    monkeypatch.undo()
+    storage.upsert(session("s2", 1))
+
+    assert storage.read("s1").memory == {"turns": 1}
+    database.flush()
+
+    assert stored(storage, "s1").memory == {"turns": 1}
+    assert stored(storage, "s2").memory == {"turns": 1}
+
+
+def test_a_newer_upsert_wins_over_a_failed_batch(storage, database, monkeypatch):
+    storage.upsert(session("s1", 1))
+    monkeypatch.setattr(storage, "upsert_statement", lambda session: text("INSERT INTO missing VALUES (1)"))
+    database.flush()
+    monkeypatch.undo()
+
+    storage.upsert(session("s1", 2))
+    database.flush()
+
+    assert stored(storage, "s1").memory == {"turns": 2}
+
+
+def test_without_batching_upserts_write_through(database):
+    storage = TunedSqliteAgentStorage("finance_agent", database, batch_writes=False)
+    storage.create()
+
+    storage.upsert(session("s1", 1))
+
+    assert stored(storage, "s1").memory == {"turns": 1}
+
+
+def test_listing_sessions_flushes_the_queue_first(storage):
+    storage.upsert(session("s1", 1))
+
+    assert storage.get_all_session_ids() == ["s1"]
+
+
+def test_compact_deletes_sessions_older_than_the_cutoff(storage, database):
+    storage.upsert(session("s1", 1))
+
+    assert database.compact(max_age_days=30) == 0
+    assert database.compact(max_age_days=-1) == 1
+    assert storage.read("s1") is None
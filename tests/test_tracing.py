@@ -0,0 +1,103 @@
+import pytest
+from agno.agent import Agent
+from agno.tools.toolkit import Toolkit
+
+from agno_shared import tracing
+from agno_shared.tracing import Tracer, span, trace, trace_tool_calls
+
+
+class CountingTools(Toolkit):
+    def __init__(self):
+        super().__init__(name="counting_tools")
+        self.register(self.count_words)
+        self.register(self.fail)
+        trace_tool_calls(self)
+
+    def count_words(self, text: str, limit: int = 10) -> str:
+        """Count the words in a text.
+
+        Args:
+            text (str): The text to count.
+            limit (int): The largest count to report.
+        """
+        return str(min(len(text.split()), limit))
+
+    def fail(self) -> str:
+        """Always fails."""
+        raise RuntimeError("tool broke")
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = Tracer(exporter=None)
+    monkeypatch.setattr(tracing, "get_tracer", lambda: tracer)
+    return tracer
+
+
+def test_spans_nest_under_the_current_span_inside_a_trace(tracer):
+    with trace("chat") as root:
+        with span("agent web", "agent") as agent_span:
+            with span("tool search", "tool"):
+                pass
+
+    names = [(s.name, s.parent_id) for s in tracer.spans(root.trace_id)]
+    assert names == [("chat", None), ("agent web", root.span_id), ("tool search", agent_span.span_id)]
+    assert all(s.end_ns is not None for s in tracer.spans(root.trace_id))
+
+
+def test_spans_outside_a_trace_are_not_recorded(tracer):
+    with span("storage write", "storage") as outside:
+        pass
+
+    assert outside is None
+
+
+def test_model_tool_calls_are_traced_with_arguments_and_errors(tracer):
+    tools = CountingTools()
+
+    with trace("chat") as root:
+        # The entrypoints are what agno calls for the model's tool calls
+        assert tools.functions["count_words"].entrypoint(text="one two three") == "3"
+        with pytest.raises(RuntimeError):
+            tools.functions["fail"].entrypoint()
+
+    count, fail = tracer.spans(root.trace_id)[1:]
+    assert (count.name, count.kind, count.attributes) == (
+        "tool count_words",
+        "tool",
+        {"arguments": '{"text": "one two three"}', "result_chars": 1},
+    )
+    assert fail.error == "RuntimeError: tool broke"
+
+
+def test_traced_entrypoints_keep_the_schema_and_argument_validation(tracer):
+    function = CountingTools().functions["count_words"]
+    function.process_entrypoint()
+
+    assert set(function.parameters["properties"]) == {"text", "limit"}
+    assert function.entrypoint(text="a b c d", limit="2") == "2"
+
+
+def test_tracing_twice_does_not_wrap_twice(tracer):
+    tools = trace_tool_calls(CountingTools())
+
+    with trace("chat") as root:
+        tools.functions["count_words"].entrypoint(text="hi")
+
+    assert len(tracer.spans(root.trace_id)) == 2
+
+
+def test_agent_copies_keep_tracing_before_and_after_the_first_run(tracer):
+    agent = Agent(tools=[CountingTools()])
+    fresh_copy = agent.deep_copy()
+    # What agno does to the toolkit's functions on an agent's first run
+    for function in agent.tools[0].functions.values():
+        function.process_entrypoint()
+    later_copy = agent.deep_copy()
+
+    with trace("chat") as root:
+        fresh_copy.tools[0].functions["count_words"].entrypoint(text="hi")
+        later_copy.tools[0].functions["count_words"].entrypoint(text="hi")
+
+    assert fresh_copy.tools[0].functions["count_words"].entrypoint.__self__ is fresh_copy.tools[0]
+    assert [s.name for s in tracer.spans(root.trace_id)[1:]] == ["tool count_words", "tool count_words"]
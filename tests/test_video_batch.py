@@ -0,0 +1,51 @@
+from agno_shared.video_batch import parse_video_urls
+
+VIDEO = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def test_parse_video_urls_normalises_every_video_link_form():
+    text = """
+    https://www.youtube.com/watch?v=dQw4w9WgXcQ
+    https://youtu.be/9bZkp7q19f0?t=42
+    youtube.com/shorts/kJQP7kiw5Fk
+    https://m.youtube.com/watch?feature=share&v=OPf0YbXqDm0
+    https://www.youtube.com/embed/RgKAFK5djSk
+    """
+
+    videos, playlists = parse_video_urls(text)
+
+    assert videos == [
+        VIDEO,
+        "https://www.youtube.com/watch?v=9bZkp7q19f0",
+        "https://www.youtube.com/watch?v=kJQP7kiw5Fk",
+        "https://www.youtube.com/watch?v=OPf0YbXqDm0",
+        "https://www.youtube.com/watch?v=RgKAFK5djSk",
+    ]
+    assert playlists == []
+
+
+def test_parse_video_urls_deduplicates_in_order():
+    text = f"{VIDEO}, https://youtu.be/dQw4w9WgXcQ; {VIDEO}&t=10"
+
+    videos, _ = parse_video_urls(text)
+
+    assert videos == [VIDEO]
+
+
+def test_parse_video_urls_returns_playlists_without_a_video():
+    text = (
+        "https://www.youtube.com/playlist?list=PLabc123\n"
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLignored"
+    )
+
+    videos, playlists = parse_video_urls(text)
+
+    # A video link inside a playlist is just that video
+    assert videos == [VIDEO]
+    assert playlists == ["PLabc123"]
+
+
+def test_parse_video_urls_ignores_other_links_and_bad_ids():
+    text = "https://example.com/watch?v=dQw4w9WgXcQ https://www.youtube.com/watch?v=short https://www.youtube.com/"
+
+    assert parse_video_urls(text) == ([], [])
@@ -0,0 +1,68 @@
+import json
+from urllib.error import HTTPError
+
+from agno_shared.query import normalize_query
+from agno_shared.search_cache import SearchCache
+from agno_shared.video_discovery import VideoRecord, records_from_text, search_videos, verify_records, video_id
+
+
+def test_video_id_accepts_youtube_links_only():
+    assert video_id("https://youtu.be/dQw4w9WgXcQ?t=3") == "dQw4w9WgXcQ"
+    assert video_id("https://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ") == "dQw4w9WgXcQ"
+    assert video_id("https://www.youtube.com/watch?v=tooshort") is None
+    assert video_id("https://vimeo.com/123456789") is None
+
+
+def test_records_from_text_pair_each_link_with_the_nearest_title():
+    content = (
+        "1. **Squat Form Guide**\n"
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ\n"
+        "Description: Covers depth and bracing.\n"
+        "2. [Deadlift Basics](https://youtu.be/9bZkp7q19f0)\n"
+        "Again: https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    )
+
+    records = records_from_text(content)
+
+    assert [(r.title, r.url, r.description) for r in records] == [
+        ("Squat Form Guide", "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "Covers depth and bracing."),
+        ("Deadlift Basics", "https://www.youtube.com/watch?v=9bZkp7q19f0", ""),
+    ]
+
+
+def test_search_videos_keeps_youtube_results_from_the_cached_search():
+    cache = SearchCache()
+    results = [
+        {"title": "Vimeo video", "content": "https://vimeo.com/1"},
+        {"title": "Squat Form", "content": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "duration": "8:01"},
+        {"title": "Squat Form again", "content": "https://youtu.be/dQw4w9WgXcQ"},
+        {"title": "Deadlift", "content": "https://www.youtube.com/watch?v=9bZkp7q19f0", "description": "Hinge"},
+    ]
+    query = "best squat tutorial"
+    cache.get_or_fetch(("videos", normalize_query(query), None), 60, lambda: json.dumps(results))
+
+    records = search_videos(query, max_results=3, cache=cache)
+
+    assert [(r.title, r.duration) for r in records] == [("Squat Form", "8:01"), ("Deadlift", None)]
+    assert cache.stats()["misses"] == 1
+
+
+class FakeYouTubeTools:
+    def get_video_metadata(self, vid):
+        if vid == "dQw4w9WgXcQ":
+            return {"title": "Real title"}
+        if vid == "9bZkp7q19f0":
+            raise HTTPError("https://www.youtube.com/oembed", 404, "Not Found", None, None)
+        raise OSError("network unreachable")
+
+
+def test_verify_records_drops_unknown_videos_and_keeps_unchecked_ones():
+    records = [
+        VideoRecord(title="Made up title", url="https://www.youtube.com/watch?v=dQw4w9WgXcQ"),
+        VideoRecord(title="Does not exist", url="https://www.youtube.com/watch?v=9bZkp7q19f0"),
+        VideoRecord(title="Offline", url="https://www.youtube.com/watch?v=kJQP7kiw5Fk"),
+    ]
+
+    verified = verify_records(records, tools=FakeYouTubeTools())
+
+    assert [r.title for r in verified] == ["Real title", "Offline"]
@@ -0,0 +1,64 @@
+from agno_shared.video_mapreduce import MARKER_SECONDS, timestamp, transcript_windows
+
+
+def transcript(seconds, line_seconds=4.0):
+    return [
+        {"text": f"line {i}", "start": i * line_seconds, "duration": line_seconds}
+        for i in range(int(seconds / line_seconds))
+    ]
+
+
+def test_transcript_windows_split_by_time():
+    windows = transcript_windows(transcript(20 * 60), window_seconds=300)
+
+    assert [window.index for window in windows] == [0, 1, 2, 3]
+    assert [(window.start, window.end) for window in windows] == [
+        (0.0, 300.0),
+        (300.0, 600.0),
+        (600.0, 900.0),
+        (900.0, 1200.0),
+    ]
+    assert windows[1].label() == "5:00–10:00"
+
+
+def test_transcript_windows_widen_to_stay_under_the_maximum():
+    windows = transcript_windows(transcript(2 * 60 * 60), window_seconds=300, max_windows=12)
+
+    assert len(windows) == 12
+    assert windows[1].start == 600.0
+
+
+def test_transcript_windows_keep_every_line_with_timestamp_markers():
+    lines = transcript(120)
+
+    (window,) = transcript_windows(lines, window_seconds=300)
+
+    for line in lines:
+        assert line["text"] in window.text
+    # Markers carry the caption time of the first line at least MARKER_SECONDS on
+    assert MARKER_SECONDS == 30
+    assert window.text.startswith("[0:00] line 0 ")
+    assert "line 7 [0:32] line 8 " in window.text
+    assert "line 15 [1:04] line 16 " in window.text
+    assert window.text.count("[") == 4
+
+
+def test_transcript_windows_skip_silent_stretches():
+    lines = [
+        {"text": "intro", "start": 0.0, "duration": 5.0},
+        {"text": "outro", "start": 1000.0, "duration": 5.0},
+    ]
+
+    windows = transcript_windows(lines, window_seconds=300)
+
+    assert [window.index for window in windows] == [0, 1]
+    assert windows[1].text == "[16:40] outro"
+
+
+def test_transcript_windows_of_nothing():
+    assert transcript_windows([]) == []
+
+
+def test_timestamp_formats_hours():
+    assert timestamp(59) == "0:59"
+    assert timestamp(3725) == "1:02:05"
@@ -0,0 +1,91 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from agno_shared.warmup import ModelWarmer, full_tag, status_lines
+
+
+class FakeClient:
+    """The parts of ollama.Client the warmer uses."""
+
+    def __init__(self, installed=None, running=()):
+        self.installed = installed or {}
+        self.running = list(running)
+        self.generated = []
+
+    def list(self):
+        return SimpleNamespace(models=[SimpleNamespace(model=m, digest=d) for m, d in self.installed.items()])
+
+    def ps(self):
+        return SimpleNamespace(models=[SimpleNamespace(model=m, expires_at=None) for m in self.running])
+
+    def generate(self, model, prompt, keep_alive):
+        self.generated.append(model)
+        self.running.append(full_tag(model))
+
+
+@pytest.fixture
+def warmer():
+    warmer = ModelWarmer(host="http://ollama.invalid")
+    client = FakeClient(installed={"llama3.2:3b": "abc", "llama3.2:latest": "abc", "qwen2.5:7b": "def"})
+    warmer.client = warmer._quick_client = client
+    return warmer
+
+
+def wait_until(condition):
+    for _ in range(200):
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+def wait_until_ready(warmer, model, loads=1):
+    wait_until(lambda: len(warmer.client.generated) >= loads and warmer.status()[model]["status"] == "ready")
+
+
+def test_full_tag_adds_latest():
+    assert full_tag("llama3.2") == "llama3.2:latest"
+    assert full_tag("qwen2.5:7b") == "qwen2.5:7b"
+
+
+def test_tags_with_the_same_weights_resolve_to_one(warmer):
+    assert warmer.canonical("llama3.2") == "llama3.2:3b"
+    assert warmer.canonical("llama3.2:latest") == "llama3.2:3b"
+    assert warmer.canonical("qwen2.5:7b") == "qwen2.5:7b"
+    assert warmer.canonical("not-installed") == "not-installed"
+    assert warmer.aliases == {"llama3.2:3b": {"llama3.2", "llama3.2:latest"}}
+
+
+def test_aliases_are_loaded_once(warmer):
+    warmer.warm(["llama3.2", "llama3.2:latest", "llama3.2:3b"])
+    wait_until_ready(warmer, "llama3.2:3b")
+
+    assert warmer.client.generated == ["llama3.2:3b"]
+    assert list(warmer.status()) == ["llama3.2:3b"]
+
+
+def test_unloaded_models_are_loaded_again(warmer):
+    warmer.warm(["qwen2.5:7b"])
+    wait_until_ready(warmer, "qwen2.5:7b")
+    warmer.warm(["qwen2.5:7b"])
+    assert warmer.client.generated == ["qwen2.5:7b"]
+
+    warmer.client.running.clear()
+    warmer._loaded_at = 0.0
+    warmer.warm(["qwen2.5:7b"])
+    wait_until_ready(warmer, "qwen2.5:7b", loads=2)
+
+    assert warmer.client.generated == ["qwen2.5:7b", "qwen2.5:7b"]
+
+
+def test_status_lines_report_load_errors(warmer):
+    def fail(model, prompt, keep_alive):
+        raise ConnectionError("Ollama is not running")
+
+    warmer.client.generate = fail
+    warmer.warm(["qwen2.5:7b"])
+    wait_until(lambda: warmer.status()["qwen2.5:7b"]["status"] == "error")
+
+    assert status_lines(warmer) == ["❌ `qwen2.5:7b` error: Ollama is not running"]
@@ -0,0 +1,93 @@
+import copy
+import io
+import json
+import zlib
+
+import pytest
+
+from agno_shared import youtube_cache as youtube_cache_module
+from agno_shared.youtube_cache import CachedYouTubeTools, YouTubeCache
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return YouTubeCache(db_file=str(tmp_path / "youtube.db"))
+
+
+class FakeTranscriptApi:
+    calls = []
+
+    @staticmethod
+    def get_transcript(video_id, **kwargs):
+        FakeTranscriptApi.calls.append(video_id)
+        return [
+            {"text": "warm up", "start": 0.0, "duration": 4.0},
+            {"text": "first set", "start": 65.5, "duration": 3.0},
+        ]
+
+
+@pytest.fixture
+def tools(cache, monkeypatch):
+    FakeTranscriptApi.calls = []
+    monkeypatch.setattr(youtube_cache_module, "YouTubeTranscriptApi", FakeTranscriptApi)
+    return CachedYouTubeTools(cache=cache)
+
+
+def test_values_round_trip_compressed(cache):
+    value = [{"text": "squat " * 100, "start": 1.5}]
+    cache.put("transcript:abc", value)
+
+    assert cache.get("transcript:abc") == value
+    assert cache.stats()["bytes"] < len(json.dumps(value))
+
+
+def test_least_recently_used_videos_are_evicted_past_max_bytes(tmp_path, monkeypatch):
+    clock = iter(range(1_000_000, 2_000_000))
+    monkeypatch.setattr(youtube_cache_module.time, "time", lambda: float(next(clock)))
+    size = len(zlib.compress(json.dumps("x").encode()))
+    cache = YouTubeCache(db_file=str(tmp_path / "youtube.db"), max_bytes=2 * size)
+    cache.put("a", "x")
+    cache.put("b", "y")
+    cache.get("a")
+
+    cache.put("c", "z")
+
+    assert cache.get("a") == "x"
+    assert cache.get("b") is None
+    assert cache.get("c") == "z"
+
+
+def test_transcript_is_fetched_once_per_video(tools, cache):
+    assert tools.get_youtube_video_captions(URL) == "warm up first set"
+    assert tools.get_video_timestamps(URL) == "0:00 - warm up\n1:05 - first set"
+
+    assert FakeTranscriptApi.calls == ["dQw4w9WgXcQ"]
+    assert cache.hits == 1
+
+
+def test_video_data_is_fetched_once_per_video(tools, monkeypatch):
+    requests = []
+
+    def urlopen(url):
+        requests.append(url)
+        return io.BytesIO(json.dumps({"title": "Squat form", "author_name": "Coach"}).encode())
+
+    monkeypatch.setattr(youtube_cache_module, "urlopen", urlopen)
+
+    first = json.loads(tools.get_youtube_video_data(URL))
+    second = json.loads(tools.get_youtube_video_data("https://youtu.be/dQw4w9WgXcQ"))
+
+    assert first == second
+    assert first["title"] == "Squat form"
+    assert len(requests) == 1
+
+
+def test_invalid_urls_do_not_reach_the_cache(tools, cache):
+    assert "valid YouTube url" in tools.get_youtube_video_captions("https://example.com/video")
+    assert cache.stats() == {"hits": 0, "misses": 0, "entries": 0, "bytes": 0}
+
+
+def test_copies_of_the_tools_share_the_cache(tools, cache):
+    assert copy.deepcopy(tools).cache is cache